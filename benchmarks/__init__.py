@@ -0,0 +1,8 @@
+"""
+Benchmarks of the hot paths of the simulator.
+
+Run at the root directory of the repository with:
+    python -O -m benchmarks
+
+See `python -m benchmarks --help` for saving and comparing results.
+"""
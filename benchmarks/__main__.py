@@ -0,0 +1,147 @@
+"""
+Runs the benchmarks, see `python -m benchmarks --help`.
+
+A benchmark is a `time_*()` method of a class in a `bench_*` module of this
+package. `setup()` of the class, if defined, is called before every run, and
+isn't timed. A benchmark may return the number of items it processed as a
+`dict` (e.g. `{"states": 1000}`), from which rates are reported.
+"""
+import argparse
+import importlib
+import inspect
+import json
+import pkgutil
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from src.dgisim.helper.rng import using_rng
+
+
+def _benchmarks(pattern: None | str) -> Iterator[tuple[str, Any, Callable[[], Any]]]:
+    """ :returns: the name, owner and method of each benchmark matching `pattern`. """
+    package_path = Path(__file__).parent
+    for module_info in sorted(pkgutil.iter_modules([str(package_path)]), key=lambda m: m.name):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module(f"{__package__}.{module_info.name}")
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__ or cls_name.startswith("_"):
+                continue
+            instance = None
+            for method_name, _ in inspect.getmembers(cls, inspect.isfunction):
+                if not method_name.startswith("time_"):
+                    continue
+                name = f"{module_info.name[len('bench_'):]}.{cls_name}.{method_name}"
+                if pattern is not None and pattern not in name:
+                    continue
+                if instance is None:
+                    instance = cls()
+                yield name, instance, getattr(instance, method_name)
+
+
+def _run(instance: Any, method: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    """ :returns: the timings of `method`, and the counts it returned. """
+    times: list[float] = []
+    counts: dict[str, int] = {}
+    setup = getattr(instance, "setup", None)
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        ret_val = method()
+        times.append(time.perf_counter() - start)
+        if isinstance(ret_val, dict):
+            counts = ret_val
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "counts": counts,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g}{unit}"
+    return f"{seconds / 1e-9:.3g}ns"
+
+
+def _report(name: str, result: dict[str, Any], baseline: None | dict[str, Any]) -> str:
+    line = f"{name:<55} {_format_time(result['min']):>9} (median {_format_time(result['median'])})"
+    for item, count in result["counts"].items():
+        rate = count / result["min"]
+        line += f"  {rate:,.0f} {item}/s" if rate >= 100 else f"  {rate:.3g} {item}/s"
+    if baseline is not None:
+        line += f"  x{result['min'] / baseline['min']:.2f}"
+    return line
+
+
+def main(argv: None | list[str] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmarks of the hot paths of the simulator.",
+    )
+    parser.add_argument(
+        "-k", dest="pattern",
+        help="only run benchmarks whose names contain PATTERN",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5,
+        help="runs per benchmark, the fastest counts (default: 5)",
+    )
+    parser.add_argument(
+        "--save", metavar="FILE",
+        help="save the results as JSON to FILE",
+    )
+    parser.add_argument(
+        "--compare", metavar="FILE",
+        help="compare with the results saved in FILE",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=1.2,
+        help=(
+            "with --compare, fail if any benchmark is slower than THRESHOLD times"
+            " the baseline (default: 1.2)"
+        ),
+    )
+    args = parser.parse_args(argv)
+
+    baselines: dict[str, Any] = {}
+    if args.compare is not None:
+        baselines = json.loads(Path(args.compare).read_text())["results"]
+
+    results: dict[str, Any] = {}
+    regressions: list[str] = []
+    for name, instance, method in _benchmarks(args.pattern):
+        # benchmarks are seeded themselves, this only guards against unseeded randomness
+        with using_rng(random.Random(0)):
+            result = _run(instance, method, args.repeat)
+        results[name] = result
+        baseline = baselines.get(name)
+        print(_report(name, result, baseline), flush=True)
+        if baseline is not None and result["min"] > args.threshold * baseline["min"]:
+            regressions.append(name)
+
+    if args.save is not None:
+        Path(args.save).write_text(json.dumps({
+            "python": platform.python_version(),
+            "optimized": not __debug__,
+            "results": results,
+        }, indent=2))
+    if regressions:
+        print(
+            f"\n{len(regressions)} regression(s) over x{args.threshold}:",
+            *regressions,
+            sep="\n  ",
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+The fixed inputs of the benchmarks, so that results are comparable across
+versions of the simulator.
+"""
+import json
+import pickle
+import random
+from functools import cache
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.deck import FrozenDeck
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.helper.rng import using_rng
+from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import Pid
+from src.dgisim.state.game_state import GameState
+
+__all__ = [
+    "GAME_SEEDS",
+    "decks",
+    "fresh_copy",
+    "play_game",
+    "recorded_game_states",
+    "waiting_game_states",
+]
+
+
+#: the seeds of the games played by the benchmarks.
+GAME_SEEDS = (1, 2, 3)
+
+_DECKS = (
+    {
+        "chars": ["Qiqi", "Fischl", "Venti"],
+        "cards": {
+            "LaurelCoronet": 1,
+            "GeneralsAncientHelm": 2,
+            "ViridescentVenerersDiadem": 1,
+            "MintyMeatRolls": 1,
+            "WhenTheCraneReturned": 1,
+            "ViridescentVenerer": 1,
+            "WhereIsTheUnseenRazor": 1,
+            "InstructorsCap": 1,
+            "SendOff": 1,
+            "HeavyStrike": 1,
+            "TheBell": 1,
+            "VourukashasGlow": 1,
+            "RiteOfResurrection": 1,
+            "LotusFlowerCrisp": 1,
+            "MondstadtHashBrown": 1,
+            "SacrificialSword": 1,
+            "VortexVanquisher": 1,
+            "TenacityOfTheMillelith": 1,
+            "GuardiansOath": 1,
+            "LeaveItToMe": 1,
+            "Setaria": 1,
+            "Vanarana": 2,
+            "LithicSpear": 1,
+            "SacrificialGreatsword": 1,
+            "CalxsArts": 1,
+            "TravelersHandySword": 1,
+            "PassingOfJudgment": 1,
+            "TheBoarPrincess": 1,
+        },
+    },
+    {
+        "chars": ["FatuiCryoCicinMage", "Shenhe", "HuTao"],
+        "cards": {
+            "MasterZhang": 2,
+            "BlizzardStrayer": 1,
+            "Wagner": 1,
+            "LiuSu": 1,
+            "TandooriRoastChicken": 1,
+            "NorthernSmokedChicken": 1,
+            "CrimsonWitchOfFlames": 1,
+            "TreasureSeekingSeelie": 1,
+            "ViridescentVenerersDiadem": 1,
+            "DeepwoodMemories": 1,
+            "VourukashasGlow": 1,
+            "LeaveItToMe": 2,
+            "Mamere": 1,
+            "LithicSpear": 1,
+            "FruitOfFulfillment": 2,
+            "WhiteIronGreatsword": 1,
+            "MondstadtHashBrown": 1,
+            "WolfsGravestone": 1,
+            "LaurelCoronet": 1,
+            "Setaria": 1,
+            "GamblersEarrings": 1,
+            "MasterOfWeaponry": 1,
+            "GildedDreams": 2,
+            "ArchaicPetra": 1,
+            "AmosBow": 1,
+            "HeavyStrike": 1,
+        },
+    },
+)
+
+
+@cache
+def decks() -> tuple[FrozenDeck, FrozenDeck]:
+    """ :returns: the decks of player 1 and 2 of all benchmark games. """
+    deck1, deck2 = (FrozenDeck.from_json(json.dumps(deck)) for deck in _DECKS)
+    assert deck1 is not None and deck2 is not None
+    return deck1, deck2
+
+
+def play_game(seed: int, compact_history: bool = False) -> GameStateMachine:
+    """ :returns: the finished state machine of a random game seeded with `seed`. """
+    with using_rng(random.Random(seed)):
+        state_machine = GameStateMachine(
+            GameState.from_decks(DefaultMode(), *decks()),
+            RandomAgent(seed=seed),
+            RandomAgent(seed=seed + len(GAME_SEEDS)),
+            seed=seed,
+            compact_history=compact_history,
+        )
+        state_machine.run()
+    return state_machine
+
+
+@cache
+def _recorded_game_states() -> tuple[GameState, ...]:
+    return tuple(
+        game_state
+        for seed in GAME_SEEDS
+        for game_state in play_game(seed).get_history()
+    )
+
+
+def recorded_game_states() -> list[GameState]:
+    """
+    :returns: all game states of the benchmark games, free of any cached values
+              (e.g. hashes, encodings and legal actions).
+    """
+    return fresh_copy(_recorded_game_states())
+
+
+@cache
+def _waiting_game_states() -> tuple[tuple[GameState, Pid], ...]:
+    pairs: list[tuple[GameState, Pid]] = []
+    for game_state in _recorded_game_states():
+        pid = game_state.waiting_for()
+        if pid is not None:
+            pairs.append((game_state, pid))
+    return tuple(pairs)
+
+
+def waiting_game_states() -> list[tuple[GameState, Pid]]:
+    """
+    :returns: the game states of the benchmark games where a player is to act,
+              paired with the player, free of any cached values.
+    """
+    return fresh_copy(_waiting_game_states())
+
+
+def fresh_copy(obj):
+    """
+    :returns: a copy of `obj` without any cached values, but with the sharing of
+              substructures between game states kept.
+    """
+    return pickle.loads(pickle.dumps(obj))
@@ -0,0 +1,31 @@
+"""
+Cost of generating random decks, as done for every game of evaluation sweeps.
+"""
+import random
+
+from src.dgisim.deck import DeckSampler
+from src.dgisim.helper.rng import using_rng
+from src.dgisim.mode import DefaultMode
+from src.dgisim.state.game_state import GameState
+
+
+class RandomDecks:
+    """ Random decks, drawn after the card pools of the first 2000 decks are cached. """
+
+    def setup(self) -> None:
+        self.sampler = DeckSampler(DefaultMode())
+        self.sampler.sample(2000, random.Random(0), validate=False)
+
+    def time_sample(self) -> dict[str, int]:
+        self.sampler.sample(2000, random.Random(0), validate=False)
+        return {"decks": 2000}
+
+    def time_sample_validated(self) -> dict[str, int]:
+        self.sampler.sample(2000, random.Random(0))
+        return {"decks": 2000}
+
+    def time_game_state_from_default(self) -> dict[str, int]:
+        with using_rng(random.Random(0)):
+            for _ in range(1000):
+                GameState.from_default()
+        return {"game states": 1000}
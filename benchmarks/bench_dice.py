@@ -0,0 +1,56 @@
+"""
+Cost of choosing the dice to pay.
+"""
+from src.dgisim.character.characters import Characters
+from src.dgisim.dice import AbstractDice, ActualDice, _smart_selection
+
+from ._fixtures import waiting_game_states
+
+
+class SmartSelection:
+    """
+    `ActualDice.smart_selection()` of the base cost of each hand card of the
+    player to act, with the dice and characters of the player.
+    """
+
+    def setup(self) -> None:
+        # selections are memoized, so the cache is emptied to measure a fresh run
+        _smart_selection.cache_clear()
+        self.cases: list[tuple[ActualDice, AbstractDice, Characters]] = []
+        self.batches: list[tuple[ActualDice, list[AbstractDice], Characters]] = []
+        for game_state, pid in waiting_game_states():
+            player = game_state.get_player(pid)
+            costs = [card.base_dice_cost() for card in player.hand_cards]
+            for cost in costs:
+                self.cases.append((player.dice, cost, player.characters))
+            self.batches.append((player.dice, costs, player.characters))
+
+    def time_smart_selection(self) -> dict[str, int]:
+        for dice, cost, characters in self.cases:
+            dice.smart_selection(cost, characters)
+        return {"selections": len(self.cases)}
+
+    def time_smart_selections(self) -> dict[str, int]:
+        for dice, costs, characters in self.batches:
+            dice.smart_selections(costs, characters)
+        return {"selections": len(self.cases)}
+
+
+class Checks:
+    """
+    `ActualDice.loosely_satisfy()` of the base cost of each hand card of the
+    player to act, followed by paying the cost, as done by validity checks.
+    """
+
+    def setup(self) -> None:
+        self.cases: list[tuple[ActualDice, AbstractDice]] = []
+        for game_state, pid in waiting_game_states():
+            player = game_state.get_player(pid)
+            for card in player.hand_cards:
+                self.cases.append((player.dice, card.base_dice_cost()))
+
+    def time_checks(self) -> dict[str, int]:
+        for dice, cost in self.cases:
+            if dice.loosely_satisfy(cost):
+                (dice - dice.basic_selection(cost)).is_legal()  # type: ignore
+        return {"checks": len(self.cases)}
@@ -0,0 +1,38 @@
+"""
+Cost of operating on the effect stacks of game states.
+"""
+from src.dgisim.effect.effect import AliveMarkCheckerEffect, DeathCheckCheckerEffect
+from src.dgisim.effect.effect_stack import EffectStack
+
+from ._fixtures import recorded_game_states
+
+
+class DeepStack:
+    """ Pushing onto and popping from a stack as deep as a long damage chain. """
+
+    DEPTH = 40
+
+    def time_push_pop(self) -> dict[str, int]:
+        effect_stack = EffectStack(())
+        effects = (AliveMarkCheckerEffect(), DeathCheckCheckerEffect())
+        for _ in range(50):
+            for i in range(self.DEPTH):
+                effect_stack = effect_stack.push_one(effects[i % 2])
+            while effect_stack.is_not_empty():
+                effect_stack, _ = effect_stack.pop()
+        return {"operations": 50 * 2 * self.DEPTH}
+
+
+class HashEq:
+    """ `hash()` and `==` of the effect stacks of the benchmark games. """
+
+    def setup(self) -> None:
+        self.effect_stacks = [game_state.effect_stack for game_state in recorded_game_states()]
+
+    def time_hash_eq(self) -> dict[str, int]:
+        prev = self.effect_stacks[0]
+        for effect_stack in self.effect_stacks:
+            hash(effect_stack)
+            _ = effect_stack == prev
+            prev = effect_stack
+        return {"stacks": len(self.effect_stacks)}
@@ -0,0 +1,27 @@
+"""
+Cost of resolving elemental reactions, done on every hit of an element.
+"""
+from src.dgisim.element import AURA_ELEMENTS_ORDERED, Element, ElementalAura
+
+
+class React:
+    """ Reaction and aura update of every aura hit by every element. """
+
+    def setup(self) -> None:
+        auras = [ElementalAura.from_default()]
+        for elem in AURA_ELEMENTS_ORDERED:
+            auras += [aura.add(elem) for aura in auras]
+        self.auras = auras
+
+    def time_react(self) -> dict[str, int]:
+        hits = 0
+        for _ in range(20):
+            for aura in self.auras:
+                for elem in Element:
+                    reaction = aura.consult_reaction(elem)
+                    if reaction is not None:
+                        aura.remove(reaction.first_elem)
+                    elif aura.aurable(elem):
+                        aura.add(elem)
+                    hits += 1
+        return {"hits": hits}
@@ -0,0 +1,20 @@
+"""
+Throughput of whole random games.
+"""
+from ._fixtures import GAME_SEEDS, play_game
+
+
+class RandomGames:
+    """ Plays all benchmark games with random agents. """
+
+    def time_random_games(self) -> dict[str, int]:
+        steps = 0
+        for seed in GAME_SEEDS:
+            steps += len(play_game(seed).get_history()) - 1
+        return {"games": len(GAME_SEEDS), "steps": steps}
+
+    def time_random_games_compact_history(self) -> dict[str, int]:
+        steps = 0
+        for seed in GAME_SEEDS:
+            steps += play_game(seed, compact_history=True).latest_index()
+        return {"games": len(GAME_SEEDS), "steps": steps}
@@ -0,0 +1,166 @@
+"""
+Costs of the `GameState` methods used on (almost) every step by agents,
+environments and search.
+"""
+import random
+
+from src.dgisim.effect.effect import SpecificDamageEffect
+from src.dgisim.effect.structs import DamageType, StaticTarget
+from src.dgisim.element import Element
+from src.dgisim.encoding.encoding_plan import encoding_plan
+from src.dgisim.helper.rng import using_rng
+from src.dgisim.state.enums import Pid
+from src.dgisim.state.game_state import GameState
+
+from ._fixtures import recorded_game_states, waiting_game_states
+
+
+class Encoding:
+    """ `GameState.encoding()` and `EncodingPlan.encode_structured()` along the benchmark games. """
+
+    def setup(self) -> None:
+        self.game_states = recorded_game_states()
+
+    def time_encoding(self) -> dict[str, int]:
+        for game_state in self.game_states:
+            game_state.encoding(encoding_plan)
+        return {"states": len(self.game_states)}
+
+    def time_encode_structured(self) -> dict[str, int]:
+        out = encoding_plan.structured_buffers()
+        for game_state in self.game_states:
+            encoding_plan.encode_structured(game_state, out=out)
+        return {"states": len(self.game_states)}
+
+    def time_encode_structured_subset(self) -> dict[str, int]:
+        out = encoding_plan.structured_buffers(("basics", "dice", "hand_cards", "characters"))
+        for game_state in self.game_states:
+            encoding_plan.encode_structured(game_state, out=out)
+        return {"states": len(self.game_states)}
+
+
+class EncodeItem:
+    """ `EncodingPlan.encode_item()` of the items of the benchmark games. """
+
+    def setup(self) -> None:
+        self.items: list = []
+        for game_state in recorded_game_states()[::10]:
+            self.items.append(game_state.mode)
+            self.items.append(game_state.active_player_id)
+            for player in (game_state.player1, game_state.player2):
+                self.items.append(player.phase)
+                self.items.extend(player.hand_cards)
+                self.items.extend(player.characters)
+                self.items.extend(player.combat_statuses)
+                self.items.extend(player.summons)
+                self.items.extend(player.supports)
+                for char in player.characters:
+                    self.items.extend(char.character_statuses)
+
+    def time_encode_item(self) -> dict[str, int]:
+        for item in self.items:
+            encoding_plan.encode_item(item)
+        return {"items": len(self.items)}
+
+
+class PerspectiveView:
+    """ `GameState.perspective_view()` of both players. """
+
+    def setup(self) -> None:
+        self.game_states = recorded_game_states()[::2]
+
+    def time_perspective_view(self) -> dict[str, int]:
+        for game_state in self.game_states:
+            game_state.perspective_view(Pid.P1)
+            game_state.perspective_view(Pid.P2)
+        return {"views": 2 * len(self.game_states)}
+
+
+class Hash:
+    """ `hash()` and `==` of game states, as used by transposition tables. """
+
+    def setup(self) -> None:
+        self.game_states = recorded_game_states()
+
+    def time_hash(self) -> dict[str, int]:
+        for game_state in self.game_states:
+            hash(game_state)
+        return {"states": len(self.game_states)}
+
+    def time_eq_next(self) -> dict[str, int]:
+        for game_state1, game_state2 in zip(self.game_states, self.game_states[1:]):
+            game_state1 == game_state2
+        return {"comparisons": len(self.game_states) - 1}
+
+
+class LegalActions:
+    """
+    `GameState.legal_actions()` of the player to act, which walks the tree of
+    the action generator.
+    """
+
+    def setup(self) -> None:
+        self.pairs = waiting_game_states()
+
+    def time_legal_actions(self) -> dict[str, int]:
+        for game_state, pid in self.pairs:
+            game_state.legal_actions(pid)
+        return {"states": len(self.pairs)}
+
+
+class Step:
+    """ `GameState.step()` of the game states not waiting for players. """
+
+    def setup(self) -> None:
+        self.game_states = [
+            game_state
+            for game_state in recorded_game_states()
+            if game_state.waiting_for() is None and not game_state.game_end()
+        ]
+
+    def time_step(self) -> dict[str, int]:
+        with using_rng(random.Random(0)):
+            for game_state in self.game_states:
+                game_state.step()
+        return {"steps": len(self.game_states)}
+
+
+class FactoryBuild:
+    """
+    `GameStateFactory.build()` and `PlayerStateFactory.build()`, which run
+    several times per effect executed.
+    """
+
+    def setup(self) -> None:
+        self.game_states = recorded_game_states()
+
+    def time_factory_build(self) -> dict[str, int]:
+        for game_state in self.game_states:
+            game_state.factory().f_player1(
+                lambda player: player.factory().build()
+            ).build()
+        return {"builds": len(self.game_states)}
+
+
+class Damage:
+    """ `SpecificDamageEffect.execute()` on the active characters of the benchmark games. """
+
+    def setup(self) -> None:
+        self.damages = []
+        for game_state in recorded_game_states():
+            source = game_state.player1.characters.get_active_character()
+            target = game_state.player2.characters.get_active_character()
+            if source is None or target is None or target.is_defeated():
+                continue
+            self.damages.append((game_state, SpecificDamageEffect(
+                source=StaticTarget.from_char_id(Pid.P1, source.id),
+                target=StaticTarget.from_char_id(Pid.P2, target.id),
+                element=Element.PYRO,
+                damage=1,
+                damage_type=DamageType(elemental_skill=True),
+            )))
+
+    def time_damage(self) -> dict[str, int]:
+        for game_state, damage in self.damages:
+            damage.execute(game_state)
+        return {"damages": len(self.damages)}
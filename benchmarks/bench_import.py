@@ -0,0 +1,26 @@
+"""
+Cost of `import dgisim`, which only imports modules of the simulator on first
+access to their names.
+"""
+import subprocess
+import sys
+
+
+class ImportPackage:
+    """
+    Fresh interpreters importing the package. (it took about 450ms per import
+    when all modules were imported eagerly)
+
+    The interpreter startup is timed too, `python -X importtime -c "import
+    src.package"` shows the time spent on the import alone.
+    """
+
+    def time_import(self) -> dict[str, int]:
+        for _ in range(5):
+            subprocess.run([sys.executable, "-c", "import src.package"], check=True)
+        return {"imports": 5}
+
+    def time_startup(self) -> dict[str, int]:
+        for _ in range(5):
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+        return {"interpreters": 5}
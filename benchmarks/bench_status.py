@@ -0,0 +1,51 @@
+"""
+Costs of going through the statuses on the board, which is done for every
+card, skill and swap considered or played, and every signal triggered.
+"""
+from src.dgisim.effect.enums import TriggeringSignal
+from src.dgisim.event import CardPEvent
+from src.dgisim.status.enums import Preprocessables
+from src.dgisim.status.status_processing import StatusProcessing
+
+from ._fixtures import recorded_game_states, waiting_game_states
+
+
+class PreprocessByAllStatuses:
+    """
+    `StatusProcessing.preprocess_by_all_statuses()` of the cost of each hand
+    card of the player to act.
+    """
+
+    def setup(self) -> None:
+        self.cases = [
+            (game_state, pid, CardPEvent(pid=pid, card_type=card, dice_cost=card.base_dice_cost()))
+            for game_state, pid in waiting_game_states()
+            for card in game_state.get_player(pid).hand_cards
+        ]
+
+    def time_preprocess_card_cost(self) -> dict[str, int]:
+        for game_state, pid, card_event in self.cases:
+            StatusProcessing.preprocess_by_all_statuses(
+                game_state,
+                pid,
+                Preprocessables.CARD1,
+                card_event,
+            )
+        return {"events": len(self.cases)}
+
+
+class TriggerAllStatusesEffects:
+    """
+    `StatusProcessing.trigger_all_statuses_effects()` of every signal along the
+    benchmark games.
+    """
+
+    def setup(self) -> None:
+        self.game_states = recorded_game_states()[:1000]
+
+    def time_trigger_all_signals(self) -> dict[str, int]:
+        for game_state in self.game_states:
+            pid = game_state.active_player_id
+            for signal in TriggeringSignal:
+                StatusProcessing.trigger_all_statuses_effects(game_state, pid, signal)
+        return {"triggers": len(self.game_states) * len(TriggeringSignal)}
@@ -0,0 +1,106 @@
+"""
+Generates `src/package/_lazy_index.py`, which maps every name exported by the
+package `dgisim` to the module defining it, so that the package can import
+modules on first access to their names.
+
+The exported names are the ones imported under `if TYPE_CHECKING:` in
+`src/package/__init__.py`. They are also written as the literal `__all__` of
+`__init__.py`, which type checkers can read.
+
+usage: python scripts/py/lazy_index.py [--check]
+"""
+import ast
+import importlib
+import os
+import sys
+
+from argparse import ArgumentParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+PACKAGE_DIR = os.path.join(ROOT_DIR, "src", "package")
+INIT_FILE = os.path.join(PACKAGE_DIR, "__init__.py")
+INDEX_FILE = os.path.join(PACKAGE_DIR, "_lazy_index.py")
+
+HEADER = '''\
+# This file is generated by `python scripts/py/lazy_index.py`, do not edit.
+# Run the script again after changing the exports of `__init__.py`.
+
+#: the module (relative to this package) of each name exported by the package
+LAZY_INDEX: dict[str, str] = {
+'''
+
+
+def _type_checking_imports() -> list[ast.ImportFrom]:
+    with open(INIT_FILE, "rt") as fin:
+        tree = ast.parse(fin.read())
+    for node in tree.body:
+        if (
+                isinstance(node, ast.If)
+                and isinstance(node.test, ast.Name)
+                and node.test.id == "TYPE_CHECKING"
+        ):
+            return [stmt for stmt in node.body if isinstance(stmt, ast.ImportFrom)]
+    raise RuntimeError(f"no `if TYPE_CHECKING:` block in {INIT_FILE}")
+
+
+def generate() -> dict[str, str]:
+    """ :returns: the content of the index file and `__init__.py`. """
+    sys.path.insert(0, ROOT_DIR)
+    # the same order as the eager imports, which avoids the import cycles
+    # between effects and statuses
+    index: dict[str, str] = {}
+    for stmt in _type_checking_imports():
+        module_name = "." * stmt.level + (stmt.module or "")
+        module = importlib.import_module(module_name, "src.package")
+        if stmt.names[0].name == "*":
+            names = getattr(module, "__all__", None)
+            if names is None:
+                names = [name for name in vars(module) if not name.startswith("_")]
+        else:
+            if any(alias.asname is not None for alias in stmt.names):
+                raise RuntimeError(f"renamed imports from {module_name} cannot be indexed")
+            names = [alias.name for alias in stmt.names]
+        for name in names:
+            index[name] = module_name
+    lines = [f"    {name!r}: {index[name]!r},\n" for name in sorted(index)]
+    return {
+        INDEX_FILE: HEADER + "".join(lines).replace("'", '"') + "}\n",
+        INIT_FILE: _init_with_all(sorted(index)),
+    }
+
+
+def _init_with_all(names: list[str]) -> str:
+    """ :returns: the content of `__init__.py` with `__all__` being `names`. """
+    with open(INIT_FILE, "rt") as fin:
+        content = fin.read()
+    for node in ast.parse(content).body:
+        if (
+                isinstance(node, ast.Assign)
+                and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and node.targets[0].id == "__all__"
+        ):
+            break
+    else:
+        raise RuntimeError(f"no `__all__` in {INIT_FILE}")
+    assert node.end_lineno is not None
+    lines = content.splitlines(keepends=True)
+    all_lines = ["__all__ = [\n", *(f'    "{name}",\n' for name in names), "]\n"]
+    return "".join(lines[:node.lineno - 1] + all_lines + lines[node.end_lineno:])
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser()
+    parser.add_argument(
+        "--check", action="store_true", help="fail if the index is not up to date",
+    )
+    args = parser.parse_args()
+
+    for path, content in generate().items():
+        if args.check:
+            with open(path, "rt") as fin:
+                if fin.read() != content:
+                    sys.exit(f"{path} is outdated, run `python scripts/py/lazy_index.py`")
+        else:
+            with open(path, "wt") as fout:
+                fout.write(content)
@@ -0,0 +1,3 @@
+#!/bin/bash
+# usage: ./scripts/sh/bench.sh [--save FILE] [--compare FILE] [-k PATTERN]
+./venv/bin/python -O -m benchmarks "$@"
@@ -112,6 +112,82 @@ class ActionGenerator:
         assert not self.filled()
         return self._fill_helper(self, choice)
 
+    def canonical_actions(self) -> tuple[PlayerAction, ...]:
+        """
+        :returns: all distinct actions that can be generated from this
+                  ActionGenerator, in the order of the choices.
+
+        To keep the number of actions manageable, choices of dice and cards are
+        narrowed down to canonical ones:
+
+        - dice paid for an `AbstractDice` are picked by `smart_selection()`.
+        - from `Cards`, either none or all of the cards are chosen.
+        - from `ActualDice`, either none or all dice that are neither OMNI nor of
+          the elements of the player's characters are chosen.
+        """
+        return tuple(dict.fromkeys(self._canonical_actions([self])))
+
+    def _canonical_actions(self, roots: list[ActionGenerator]) -> list[PlayerAction]:
+        """
+        :returns: the canonical actions of `roots`, see `canonical_actions()`.
+
+        Dice costs met on the way are resolved together by `smart_selections()`
+        after the rest of the choices are expanded, and the actions paying them
+        are put back in place.
+        """
+        from ..card.cards import Cards
+        from ..dice import AbstractDice, ActualDice
+        from ..element import Element
+
+        player = self.game_state.get_player(self.pid)
+        # actions, or action generators waiting for their costs to be resolved
+        slots: list[PlayerAction | tuple[ActionGenerator, AbstractDice]] = []
+        stack = roots[::-1]
+        while stack:
+            action_generator = stack.pop()
+            if action_generator.filled():
+                slots.append(action_generator.generate_action())
+                continue
+            choices = action_generator.choices()
+            options: tuple[DecidedChoiceType, ...]
+            if isinstance(choices, tuple):
+                options = choices
+            elif isinstance(choices, AbstractDice):
+                slots.append((action_generator, choices))
+                continue
+            elif isinstance(choices, Cards):
+                options = (Cards({}),) if choices.empty() else (Cards({}), choices)
+            elif isinstance(choices, ActualDice):
+                wanted_elems = player.characters.all_elems()
+                unwanted_dice = ActualDice(dict(
+                    (elem, choices[elem])
+                    for elem in choices.elems()
+                    if not (elem is Element.OMNI or elem in wanted_elems)
+                ))
+                options = (
+                    (ActualDice({}),)
+                    if unwanted_dice.num_dice() == 0
+                    else (ActualDice({}), unwanted_dice)
+                )
+            else:  # pragma: no cover
+                raise NotImplementedError
+            # pushed in reverse so that actions come out in the order of choices
+            stack.extend(action_generator.choose(option) for option in reversed(options))
+
+        costs = [slot[1] for slot in slots if isinstance(slot, tuple)]
+        selections = iter(
+            player.dice.smart_selections(costs, player.characters) if costs else ()
+        )
+        actions: list[PlayerAction] = []
+        for slot in slots:
+            if not isinstance(slot, tuple):
+                actions.append(slot)
+                continue
+            selection = next(selections)
+            if selection is not None:
+                actions.extend(self._canonical_actions([slot[0].choose(selection)]))
+        return actions
+
     def __str__(self) -> str:
         field_pairs = [f"<{field.name}, {getattr(self, field.name)}>" for field in fields(self)]
         content = '\n'.join(field_pairs)
@@ -1,7 +1,13 @@
 """
 This file contains different implementations of PlayerAgents.
 """
+import math
 import random
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from typing import Any, Callable, Iterable, Optional, TYPE_CHECKING, TypeVar, cast
 
 from .action.action import *
@@ -14,6 +20,7 @@ from .card.cards import Cards
 from .dice import AbstractDice, ActualDice
 from .effect.effect import *
 from .element import Element
+from .helper.rng import current_rng, using_rng
 from .phase.default.action_phase import ActionPhase
 from .phase.default.card_select_phase import CardSelectPhase
 from .phase.default.end_phase import EndPhase
@@ -27,6 +34,7 @@ from .state.game_state import GameState
 __all__ = [
     "CustomChoiceAgent",
     "LazyAgent",
+    "MCTSAgent",
     "NoneAgent",
     "PuppetAgent",
     "RandomAgent",
@@ -76,7 +84,7 @@ class LazyAgent(PlayerAgent):
             assert ActionType.SWAP_CHARACTER in action_types and game_state.death_swapping()
             choices = action_types
             while True:
-                action_generator = action_generator.choose(random.choice(choices))
+                action_generator = action_generator.choose(current_rng().choice(choices))
                 assert action_generator is not None
                 if action_generator.filled():
                     break
@@ -142,6 +150,16 @@ class RandomAgent(PlayerAgent):
     A player agent that make purely random (but of course valid) acions.
     """
     _NUM_PICKED_CARDS = 3
+    _rng: None | random.Random = None
+
+    def __init__(self, seed: None | int | float = None) -> None:
+        """
+        :param seed: the seed of the agent's own random number generator.
+                     If it is `None`, the generator of the current context is used.
+                     (see `current_rng()`)
+        """
+        if seed is not None:
+            self._rng = random.Random(seed)
 
     def _card_select_phase(self, history: list[GameState], pid: Pid) -> PlayerAction:
         game_state = history[-1]
@@ -169,15 +187,16 @@ class RandomAgent(PlayerAgent):
         return player_action
 
     def _random_action_generator_chooser(self, action_generator: ActionGenerator) -> PlayerAction:
+        rng = current_rng()
         try:
             while not action_generator.filled():
                 choices = action_generator.choices()
                 choice: DecidedChoiceType  # type: ignore
                 if isinstance(choices, tuple):
                     game_state = action_generator.game_state
-                    if game_state.phase == game_state.mode.roll_phase() and random.random() < 0.8:
+                    if game_state.phase == game_state.mode.roll_phase() and rng.random() < 0.8:
                         choices = tuple(c for c in choices if c is not ActionType.END_ROUND)
-                    choice = random.choice(choices)
+                    choice = rng.choice(choices)
                     action_generator = action_generator.choose(choice)
                 elif isinstance(choices, AbstractDice):
                     optional_choice = action_generator.dice_available().smart_selection(
@@ -191,7 +210,7 @@ class RandomAgent(PlayerAgent):
                     choice = optional_choice
                     action_generator = action_generator.choose(choice)
                 elif isinstance(choices, Cards):
-                    _, choice = choices.pick_random(random.randint(0, choices.num_cards()))
+                    _, choice = choices.pick_random(rng.randint(0, choices.num_cards()))
                     action_generator = action_generator.choose(choice)
                 elif isinstance(choices, ActualDice):
                     game_state = action_generator.game_state
@@ -205,7 +224,7 @@ class RandomAgent(PlayerAgent):
                             if not (elem is Element.OMNI or elem in wanted_elems)
                         ))
                     else:
-                        _, choice = choices.pick_random_dice(random.randint(0, choices.num_dice()))
+                        _, choice = choices.pick_random_dice(rng.randint(0, choices.num_dice()))
                     action_generator = action_generator.choose(choice)
                 else:
                     raise NotImplementedError
@@ -229,6 +248,12 @@ class RandomAgent(PlayerAgent):
         return player_action
 
     def choose_action(self, history: list[GameState], pid: Pid) -> PlayerAction:
+        if self._rng is None:
+            return self._choose_action(history, pid)
+        with using_rng(self._rng):
+            return self._choose_action(history, pid)
+
+    def _choose_action(self, history: list[GameState], pid: Pid) -> PlayerAction:
         game_state = history[-1]
         mode = game_state.mode
         curr_phase = game_state.phase
@@ -349,3 +374,286 @@ class CustomChoiceAgent(RandomAgent):  # pragma: no cover
             else:
                 raise NotImplementedError
         return action_generator.generate_action()
+
+
+def _evaluate(game_state: GameState) -> float:
+    """
+    :returns: the value of `game_state` for player 1 in [-1, 1]. The result of
+              the game if it has ended, the difference of the remaining hp
+              ratios of both players otherwise.
+    """
+    if game_state.game_end():
+        winner = game_state.get_winner()
+        if winner is None:
+            return 0.0
+        return 1.0 if winner is Pid.P1 else -1.0
+
+    def hp_ratio(pid: Pid) -> float:
+        chars = game_state.get_player(pid).characters.get_characters()
+        max_hp = sum(char.max_hp for char in chars)
+        return sum(char.hp for char in chars if char.alive) / max(1, max_hp)
+
+    return hp_ratio(Pid.P1) - hp_ratio(Pid.P2)
+
+
+def _rollout(game_state: GameState, seed: int, max_actions: int) -> float:
+    """
+    :returns: the value (see `_evaluate()`) of `game_state` after at most
+              `max_actions` random actions.
+    """
+    agent = RandomAgent()
+    with using_rng(random.Random(seed)):
+        for _ in range(max_actions):
+            if game_state.game_end():
+                break
+            pid = game_state.waiting_for()
+            if pid is None:
+                game_state = game_state.auto_step()
+                continue
+            next_game_state = game_state.action_step(pid, agent.choose_action([game_state], pid))
+            if next_game_state is None:  # pragma: no cover
+                break
+            game_state = next_game_state.auto_step()
+    return _evaluate(game_state)
+
+
+class _MCTSNode:
+    """
+    The search statistics of a game state, values are from the perspective of
+    the player to act.
+    """
+    __slots__ = ("actions", "visits", "action_visits", "action_values")
+
+    def __init__(self, actions: tuple[PlayerAction, ...]) -> None:
+        self.actions = actions
+        self.visits = 0
+        self.action_visits = [0] * len(actions)
+        self.action_values = [0.0] * len(actions)
+
+    def select(self, exploration: float, rng: random.Random) -> int:
+        """ :returns: the index of the action to explore by UCT. """
+        unvisited = [i for i, n in enumerate(self.action_visits) if n == 0]
+        if unvisited:
+            return rng.choice(unvisited)
+        log_visits = math.log(self.visits)
+        return max(
+            range(len(self.actions)),
+            key=lambda i: (
+                self.action_values[i] / self.action_visits[i]
+                + exploration * math.sqrt(log_visits / self.action_visits[i])
+            ),
+        )
+
+    def add_virtual_loss(self, index: int) -> None:
+        """ Counts a visit as a loss until the real value is backpropagated. """
+        self.visits += 1
+        self.action_visits[index] += 1
+        self.action_values[index] -= 1.0
+
+    def backpropagate(self, index: int, value: float) -> None:
+        self.action_values[index] += value + 1.0
+
+
+_SearchPath = list[tuple[_MCTSNode, int, Pid]]
+
+
+class MCTSAgent(PlayerAgent):
+    """
+    A player agent choosing actions by Monte Carlo tree search.
+
+    Hidden information is determinized: each iteration starts from the
+    `perspective_view()` of the current game state, with the opponent's hidden
+    cards drawn from their deck and their dice rolled at random.
+
+    Search statistics of game states are kept in a transposition table keyed by
+    the game states themselves, bounded by `max_table_size` with least recently
+    used ones evicted. The table is kept between decisions.
+
+    Leaves are evaluated by random rollouts of at most `rollout_depth` actions,
+    after which the game state is scored by the remaining hp of both players.
+    If `workers` is greater than 1, batches of `workers` rollouts run in
+    parallel in a process pool, which is shut down by `close()`, on leaving a
+    `with` block of the agent, or when the agent is garbage collected.
+    """
+
+    def __init__(
+            self,
+            iterations: None | int = 200,
+            time_limit: None | float = None,
+            exploration: float = 1.4,
+            rollout_depth: int = 40,
+            max_table_size: int = 100_000,
+            workers: int = 1,
+            seed: None | int = None,
+    ) -> None:
+        """
+        :param iterations: the number of iterations per decision.
+        :param time_limit: the seconds that can be spent per decision.
+        :param exploration: the exploration constant of UCT.
+        :param rollout_depth: the maximum number of actions of a rollout.
+        :param max_table_size: the maximum number of game states in the
+                               transposition table.
+        :param workers: the number of processes running rollouts.
+        :param seed: the seed of the agent's own random number generator.
+
+        The search stops as soon as either of `iterations` and `time_limit` is
+        reached, at least one of them must be provided. The agent is only
+        reproducible (with a `seed`) if `time_limit` is `None`.
+        """
+        assert iterations is not None or time_limit is not None
+        assert max_table_size > 0 and workers > 0
+        self._iterations = iterations
+        self._time_limit = time_limit
+        self._exploration = exploration
+        self._rollout_depth = rollout_depth
+        self._max_table_size = max_table_size
+        self._workers = workers
+        self._rng = random.Random(seed)
+        self._table: OrderedDict[GameState, _MCTSNode] = OrderedDict()
+        self._executor: None | ProcessPoolExecutor = None
+        self._executor_finalizer: None | weakref.finalize = None
+
+    @property
+    def table_size(self) -> int:
+        """ :returns: the number of game states in the transposition table. """
+        return len(self._table)
+
+    def close(self) -> None:
+        """ Shuts down the rollout processes if there are any. """
+        if self._executor is not None:
+            assert self._executor_finalizer is not None
+            self._executor_finalizer.detach()
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_finalizer = None
+
+    def __enter__(self) -> "MCTSAgent":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def choose_action(self, history: list[GameState], pid: Pid) -> PlayerAction:
+        with using_rng(self._rng):
+            return self._search(history[-1].perspective_view(pid), pid)
+
+    def _search(self, root_state: GameState, pid: Pid) -> PlayerAction:
+        root = _MCTSNode(root_state.legal_actions(pid))
+        if len(root.actions) == 0:  # pragma: no cover
+            raise Exception(f"{pid} has no action to choose from in:\n{root_state}")
+        if len(root.actions) == 1:
+            return root.actions[0]
+
+        deadline = None if self._time_limit is None else time.perf_counter() + self._time_limit
+        iterations = 0
+        while (
+                (self._iterations is None or iterations < self._iterations)
+                and (deadline is None or time.perf_counter() < deadline)
+        ):
+            batch_size = self._workers
+            if self._iterations is not None:
+                batch_size = min(batch_size, self._iterations - iterations)
+            leaves = [self._select(root, root_state, pid) for _ in range(batch_size)]
+            values = self._rollouts([leaf_state for _, leaf_state in leaves])
+            for (path, _), value in zip(leaves, values):
+                for node, index, actor in path:
+                    node.backpropagate(index, value if actor is Pid.P1 else -value)
+            iterations += batch_size
+
+        best_index = max(range(len(root.actions)), key=lambda i: root.action_visits[i])
+        return root.actions[best_index]
+
+    def _determinize(self, game_state: GameState, pid: Pid) -> GameState:
+        """
+        :returns: `game_state` with the hidden cards and dice of the opponent
+                  replaced by a random guess.
+        """
+        opponent = game_state.get_player(pid.other)
+        unknown_cards = Cards(opponent.initial_deck.cards) - opponent.publicly_used_cards
+        unknown_cards = Cards(dict(
+            (card, num)
+            for card, num in unknown_cards.to_dict().items()
+            if num > 0
+        ))
+        num_hand_cards = opponent.hand_cards.num_cards()
+        num_deck_cards = opponent.deck_cards.num_cards()
+        unknown_cards, hand_cards = unknown_cards.pick_random(num_hand_cards)
+        _, deck_cards = unknown_cards.pick_random(num_deck_cards)
+        hand_cards += {OmniCard: num_hand_cards - hand_cards.num_cards()}
+        deck_cards += {OmniCard: num_deck_cards - deck_cards.num_cards()}
+        return game_state.factory().f_player(
+            pid.other,
+            lambda p: p.factory().hand_cards(
+                Cards(dict((card, num) for card, num in hand_cards.to_dict().items() if num > 0))
+            ).deck_cards(
+                Cards(dict((card, num) for card, num in deck_cards.to_dict().items() if num > 0))
+            ).dice(
+                ActualDice.from_random(p.dice.num_dice())
+            ).build()
+        ).build()
+
+    def _store(self, key: GameState, node: _MCTSNode) -> None:
+        self._table[key] = node
+        if len(self._table) > self._max_table_size:
+            self._table.popitem(last=False)
+
+    def _select(
+            self,
+            root: _MCTSNode,
+            root_state: GameState,
+            pid: Pid,
+    ) -> tuple[_SearchPath, GameState]:
+        """
+        :returns: the path from the root to a leaf chosen by UCT, and the game
+                  state of the leaf.
+
+        Visits along the path count as losses until the value of the leaf is
+        backpropagated, so that leaves of the same batch spread out.
+        """
+        game_state = self._determinize(root_state, pid)
+        node = root
+        actor = pid
+        path: _SearchPath = []
+        while True:
+            index = node.select(self._exploration, self._rng)
+            node.add_virtual_loss(index)
+            path.append((node, index, actor))
+            next_game_state = game_state.action_step(actor, node.actions[index])
+            if next_game_state is None:  # pragma: no cover
+                return path, game_state
+            game_state = next_game_state.auto_step()
+            if game_state.game_end():
+                return path, game_state
+            optional_actor = game_state.waiting_for()
+            assert optional_actor is not None
+            actor = optional_actor
+            child = self._table.get(game_state)
+            if child is None:
+                child = _MCTSNode(game_state.legal_actions(actor))
+                self._store(game_state, child)
+                return path, game_state
+            self._table.move_to_end(game_state)
+            if len(child.actions) == 0:  # pragma: no cover
+                return path, game_state
+            node = child
+
+    def _rollouts(self, game_states: list[GameState]) -> list[float]:
+        seeds = [self._rng.getrandbits(32) for _ in game_states]
+        if self._workers <= 1 or len(game_states) <= 1:
+            return [
+                _rollout(game_state, seed, self._rollout_depth)
+                for game_state, seed in zip(game_states, seeds)
+            ]
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+            # agents dropped without `close()`, e.g. by `run_games()`, don't keep
+            # their processes alive
+            self._executor_finalizer = weakref.finalize(
+                self, self._executor.shutdown, wait=False,
+            )
+        return list(self._executor.map(
+            _rollout,
+            game_states,
+            seeds,
+            repeat(self._rollout_depth),
+        ))
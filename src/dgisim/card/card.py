@@ -16,8 +16,6 @@ from typing import TYPE_CHECKING, cast
 from dataclasses import replace
 from typing_extensions import override
 
-import random
-
 from ..action import action as act
 from ..action import action_generator as acg
 from ..character import character as chr
@@ -30,9 +28,10 @@ from ..character.enums import CharacterSkill, Faction, WeaponType
 from ..dice import AbstractDice, ActualDice
 from ..effect.enums import Zone, DynamicCharacterTarget
 from ..effect.structs import StaticTarget, DamageType
-from ..element import AURA_ELEMENTS, Element, PURE_ELEMENTS
+from ..element import AURA_ELEMENTS, Element, PURE_ELEMENTS, PURE_ELEMENTS_ORDERED
 from ..event import CardPEvent
 from ..helper.quality_of_life import BIG_INT
+from ..helper.rng import current_rng
 from ..state.enums import Pid
 from ..status.enums import Preprocessables
 from ..status.status_processing import StatusProcessing
@@ -2391,8 +2390,7 @@ class CovenantOfRock(EventCard, _DiceOnlyChoiceProvider, ArcaneLegendCard):
             pid: Pid,
             instruction: act.Instruction,
     ) -> tuple[eft.Effect, ...]:
-        import random
-        elem1, elem2 = random.sample(tuple(PURE_ELEMENTS), 2)
+        elem1, elem2 = current_rng().sample(PURE_ELEMENTS_ORDERED, 2)
         return super().effects(
             game_state,
             pid,
@@ -2559,7 +2557,7 @@ class AbyssalSummons(EventCard, _DiceOnlyChoiceProvider):
         return (
             eft.AddSummonEffect(
                 target_pid=pid,
-                summon=random.choice(tuple(backup_summons)),
+                summon=current_rng().choice(sorted(backup_summons, key=lambda s: s.__name__)),
             ),
         )
 
@@ -3361,11 +3359,12 @@ class SunyataFlower(EventCard, _SupportTargetChoiceProvider):
         assert instruction.target.zone is Zone.SUPPORTS
         assert instruction.target.pid is pid
         assert isinstance(instruction.target.id, int)
-        card_pool = [
+        card_pool = sorted((
             card
             for card in game_state.mode.all_cards()
             if issubclass(card, SupportCard)
-        ]
+        ), key=lambda c: c.__name__)
+        rng = current_rng()
         return (
             eft.RemoveSupportEffect(
                 target_pid=instruction.target.pid,
@@ -3373,11 +3372,11 @@ class SunyataFlower(EventCard, _SupportTargetChoiceProvider):
             ),
             eft.PrivateAddCardEffect(
                 pid=pid,
-                card=random.choice(card_pool),
+                card=rng.choice(card_pool),
             ),
             eft.PrivateAddCardEffect(
                 pid=pid,
-                card=random.choice(card_pool),
+                card=rng.choice(card_pool),
             ),
             eft.AddCombatStatusEffect(
                 target_pid=pid,
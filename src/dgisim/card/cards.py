@@ -1,11 +1,13 @@
 from __future__ import annotations
-import random
 from collections import Counter, defaultdict
 from functools import cached_property
 from itertools import chain
 from typing import Iterator, TYPE_CHECKING
 
+from ..encoding.encoding_cache import cached_encoding
 from ..helper.hashable_dict import HashableDict
+from ..helper.instance_cache import cached_hash, known_hashes_differ
+from ..helper.rng import current_rng
 
 if TYPE_CHECKING:
     from .card import Card
@@ -53,8 +55,10 @@ class Cards:
         num = min(self.num_cards(), num)
         if num == 0:
             return (self, Cards.from_empty())
+        # sorted so that the same generator state always picks the same cards
+        cards = sorted(self._cards.keys(), key=lambda card: card.__name__)
         picked_cards: dict[type[Card], int] = dict(Counter(
-            random.sample(list(self._cards.keys()), counts=self._cards.values(), k=num)
+            current_rng().sample(cards, counts=[self._cards[card] for card in cards], k=num)
         ))
         return Cards(self._cards - picked_cards), Cards(picked_cards)
 
@@ -70,8 +74,9 @@ class Cards:
         num = min(sum(qualified_cards.values()), num)
         if num == 0:
             return (self, Cards.from_empty())
+        cards = sorted(qualified_cards.keys(), key=lambda card: card.__name__)
         picked_cards: dict[type[Card], int] = dict(Counter(
-            random.sample(list(qualified_cards.keys()), counts=qualified_cards.values(), k=num)
+            current_rng().sample(cards, counts=[qualified_cards[card] for card in cards], k=num)
         ))
         return Cards(self._cards - picked_cards), Cards(picked_cards)
 
@@ -177,6 +182,7 @@ class Cards:
     def ordered_cards(self) -> tuple[type[Card], ...]:
         return tuple(Counter(self._cards).elements())  # type: ignore
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this `Cards` object.
@@ -209,13 +215,18 @@ class Cards:
         return self._cards.get(card, 0)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Cards):
             return False
-        return self is other or self._cards == other._cards
+        if known_hashes_differ(self, other):
+            return False
+        return self._cards == other._cards
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._cards)
 
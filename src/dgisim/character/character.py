@@ -20,13 +20,17 @@ from ..effect.effects_template import *
 from ..effect.enums import Zone, DynamicCharacterTarget, TriggeringSignal
 from ..effect.structs import StaticTarget, DamageType
 from ..element import *
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
 from ..helper.quality_of_life import case_val, classproperty
+from ..helper.rng import current_rng
 from ..state.enums import Pid
 from .enums import CharacterSkill, CharacterSkillType, Faction, WeaponType
 
 if TYPE_CHECKING:
     from ..encoding.encoding_plan import EncodingPlan
     from ..state.game_state import GameState
+    from ..status.enums import Preprocessables
 
 __all__ = [
     # base
@@ -220,6 +224,22 @@ class Character:
         """
         return sum([statuses.statuses for statuses in self.get_all_statuses_ordered()], ())
 
+    @cached_method
+    def statuses_reacting_to(self, signal: TriggeringSignal) -> tuple[stt.Status, ...]:
+        """
+        :returns: the statuses (hidden ones first) that react to `signal`, in
+                  the same order as `get_all_statuses_ordered_flattened()`.
+        """
+        return self._hiddens.reacting_to(signal) + self._statuses.reacting_to(signal)
+
+    @cached_method
+    def statuses_preprocessing(self, pp_type: Preprocessables) -> tuple[stt.Status, ...]:
+        """
+        :returns: the statuses (hidden ones first) that preprocess `pp_type`, in
+                  the same order as `get_all_statuses_ordered_flattened()`.
+        """
+        return self._hiddens.preprocessing(pp_type) + self._statuses.preprocessing(pp_type)
+
     def factory(self) -> CharacterFactory:
         """ :returns: a factory for the current character. """
         return CharacterFactory(self, type(self))
@@ -524,10 +544,15 @@ class Character:
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
+        if known_hashes_differ(self, other):
+            return False
         return self._all_unique_data() == other._all_unique_data()
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._all_unique_data())
 
@@ -537,6 +562,7 @@ class Character:
     def __deepcopy__(self, _) -> Self:
         return self
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this character.
@@ -3555,10 +3581,8 @@ class RhodeiaOfLoch(Character):
         )
 
     def _make_summon_choice(self, self_summons: Sequence[type[sm.Summon]]) -> type[sm.Summon]:
-        from random import choice
-
         choose_existing = len(self_summons) < 2
-        summon = choice([
+        summon = current_rng().choice([
             s_type
             for s_type in self._SUMMONS
             if (s_type in self_summons) is not choose_existing
@@ -3566,8 +3590,6 @@ class RhodeiaOfLoch(Character):
         return summon
 
     def _skill2(self, game_state: GameState, source: StaticTarget) -> tuple[eft.Effect, ...]:
-        from random import choice
-
         existing_summons = game_state.get_player(source.pid).summons
         if existing_summons.full():
             return ()
@@ -3590,8 +3612,6 @@ class RhodeiaOfLoch(Character):
         )
 
     def _skill3(self, game_state: GameState, source: StaticTarget) -> tuple[eft.Effect, ...]:
-        from random import choice
-
         existing_summons = game_state.get_player(source.pid).summons
         if existing_summons.full():
             return ()
@@ -2,6 +2,9 @@ from __future__ import annotations
 from itertools import chain
 from typing import Callable, Iterator, TYPE_CHECKING, Union, Iterable
 
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
+
 if TYPE_CHECKING:
     from .character import Character
     from ..element import Element
@@ -253,6 +256,23 @@ class Characters:
             for char in self._characters
         )
 
+    @cached_method
+    def dice_precedence(self) -> tuple[frozenset[Element], ...]:
+        """
+        :returns: the elements of dice to be kept when paying, from the most
+                  to the least valuable: the element of the active character,
+                  the elements of the other characters and the rest of the pure
+                  elements. (see `ActualDice.smart_selection()`)
+        """
+        from ..element import PURE_ELEMENTS_ORDERED
+        pure_elems = frozenset(PURE_ELEMENTS_ORDERED)
+        active_char = self.get_active_character()
+        char_elems = frozenset(char.ELEMENT for char in self._characters)
+        if active_char is None:
+            return (char_elems, pure_elems - char_elems)
+        active_elem = frozenset((active_char.ELEMENT,))
+        return (active_elem, char_elems - active_elem, pure_elems - char_elems)
+
     def factory(self) -> CharactersFactory:
         """ :returns: a factory for the current game state. """
         return CharactersFactory(self)
@@ -261,13 +281,18 @@ class Characters:
         return (self._characters, self._active_character_id)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Characters):
             return False
-        return self is other or self._all_unique_data() == other._all_unique_data()
+        if known_hashes_differ(self, other):
+            return False
+        return self._all_unique_data() == other._all_unique_data()
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._all_unique_data())
 
@@ -291,6 +316,7 @@ class Characters:
     def __contains__(self, char: Character | type[Character]) -> bool:
         return self.contains(char)
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         characters_encoding: list[list[int]] = [
             character.encoding(encoding_plan)
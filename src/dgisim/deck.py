@@ -1,8 +1,11 @@
 from __future__ import annotations
 from abc import abstractmethod, ABC
+from collections import Counter
 from dataclasses import dataclass
+from functools import lru_cache
 from itertools import chain
-from typing import TYPE_CHECKING, Sequence
+from random import Random
+from typing import TYPE_CHECKING, Iterable, Sequence
 
 from typing_extensions import override, Self
 
@@ -12,11 +15,14 @@ if TYPE_CHECKING:
     from .character.character import Character
     from .card.card import Card
     from .encoding.encoding_plan import EncodingPlan
+    from .mode import Mode
 
 __all__ = [
     "Deck",
+    "DeckSampler",
     "MutableDeck",
     "FrozenDeck",
+    "card_pool",
 ]
 
 
@@ -207,3 +213,135 @@ class FrozenDeck(Deck):
 
     def __hash__(self) -> int:
         return hash((self.chars, self.cards))
+
+
+@lru_cache(maxsize=None)
+def _sorted_chars(mode: Mode) -> tuple[type[Character], ...]:
+    # sorted so that the same random generator state always gives the same deck
+    return tuple(sorted(mode.all_chars(), key=lambda c: c.__name__))
+
+
+@lru_cache(maxsize=None)
+def _pool_entries(mode: Mode) -> tuple[tuple[type[Card], int, bool], ...]:
+    """
+    :returns: (card, max copies in a deck, if its eligibility depends on the
+              deck) of all cards of `mode`, ordered by card name.
+    """
+    from .card.card import ArcaneLegendCard, Card
+    return tuple(
+        (
+            card,
+            1 if issubclass(card, ArcaneLegendCard) else mode.deck_card_limit_per_kind(),
+            card.valid_in_deck.__func__ is not Card.valid_in_deck.__func__,  # type: ignore
+        )
+        for card in sorted(mode.all_cards(), key=lambda c: c.__name__)
+    )
+
+
+@lru_cache(maxsize=1 << 14)
+def _card_pool(mode: Mode, chars: tuple[type[Character], ...]) -> tuple[type[Card], ...]:
+    deck = MutableDeck(chars=list(chars), cards={})
+    pool: list[type[Card]] = []
+    for card, copies, depends_on_deck in _pool_entries(mode):
+        if depends_on_deck and not card.valid_in_deck(deck):
+            continue
+        pool.extend([card] * copies)
+    return tuple(pool)
+
+
+def card_pool(mode: Mode, chars: Iterable[type[Character]]) -> tuple[type[Card], ...]:
+    """
+    :returns: the cards of `mode` that can be in a deck of `chars`, each repeated
+              as many times as it can be in the deck, ordered by card name.
+
+    The pool is cached per mode and set of characters.
+    """
+    return _card_pool(mode, tuple(sorted(chars, key=lambda c: c.__name__)))
+
+
+class DeckSampler:
+    """
+    Draws random valid decks of a mode, optionally containing some required
+    characters and none of some banned cards.
+
+    Decks are drawn the same way as `PlayerState.example_player()` does, so
+    an unconstrained sampler gives the same decks for the same random generator
+    state.
+    """
+
+    def __init__(
+            self,
+            mode: Mode,
+            required_chars: Iterable[type[Character]] = (),
+            banned_cards: Iterable[type[Card]] = (),
+    ) -> None:
+        """
+        :param mode: the mode the decks are valid in.
+        :param required_chars: the characters every deck has, in this order
+                               before the randomly drawn ones.
+        :param banned_cards: the cards no deck has.
+        """
+        self._mode = mode
+        self._required_chars = tuple(required_chars)
+        self._banned_cards = frozenset(banned_cards)
+        num_chars = mode.deck_chars_requirement()
+        if len(self._required_chars) > num_chars:
+            raise ValueError(
+                f"{len(self._required_chars)} characters required, but a deck only has {num_chars}"
+            )
+        self._chars_pool = tuple(
+            char
+            for char in _sorted_chars(mode)
+            if char not in self._required_chars
+        )
+        self._num_random_chars = num_chars - len(self._required_chars)
+        self._num_cards = mode.deck_cards_requirement()
+        self._pools: dict[frozenset[type[Character]], tuple[type[Card], ...]] = {}
+
+    def _pool(self, chars: list[type[Character]]) -> tuple[type[Card], ...]:
+        key = frozenset(chars)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = card_pool(self._mode, chars)
+            if self._banned_cards:
+                pool = tuple(card for card in pool if card not in self._banned_cards)
+            if len(pool) < self._num_cards:
+                raise ValueError(
+                    f"only {len(pool)} cards can be in a deck of {[c.__name__ for c in chars]}"
+                    f" without the banned cards, but {self._num_cards} are required"
+                )
+            self._pools[key] = pool
+        return pool
+
+    def sample_deck(self, rng: None | Random = None) -> FrozenDeck:
+        """
+        :param rng: the random generator to draw from, `current_rng()` if None.
+        :returns: a random deck, which is not validated.
+        """
+        if rng is None:
+            from .helper.rng import current_rng
+            rng = current_rng()
+        chars = [*self._required_chars, *rng.sample(self._chars_pool, k=self._num_random_chars)]
+        cards = rng.sample(self._pool(chars), k=self._num_cards)
+        return FrozenDeck(chars=tuple(chars), cards=HashableDict(Counter(cards)))
+
+    def sample(self, n: int, rng: None | Random = None, validate: bool = True) -> list[FrozenDeck]:
+        """
+        :param n: the number of decks.
+        :param rng: the random generator to draw from, `current_rng()` if None.
+        :param validate: set to `False` to skip checking the decks with
+                         `Mode.valid_deck()`, which costs about as much as
+                         drawing them.
+        :returns: `n` random decks.
+        :raises ValueError: if any deck drawn is invalid in the mode.
+        """
+        if rng is None:
+            from .helper.rng import current_rng
+            rng = current_rng()
+        decks = [self.sample_deck(rng) for _ in range(n)]
+        if validate:
+            valid_deck = self._mode.valid_deck
+            for deck in decks:
+                if not valid_deck(deck):
+                    raise ValueError(f"invalid deck drawn: {deck}")
+        return decks
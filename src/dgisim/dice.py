@@ -1,14 +1,17 @@
 from __future__ import annotations
 
-import random
-from collections import Counter, defaultdict
-from functools import cached_property
-from typing import Any, Iterator, Iterable
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import add, sub
+from typing import Any, Hashable, Iterator, Iterable, cast
 from typing_extensions import override, Self, TYPE_CHECKING
 
-from .element import Element
+from .element import Element, PURE_ELEMENTS_ORDERED
+from .encoding.encoding_cache import cached_encoding
 from .helper.hashable_dict import HashableDict
+from .helper.instance_cache import cached_hash, known_hashes_differ
 from .helper.quality_of_life import BIG_INT, case_val
+from .helper.rng import current_rng
 
 if TYPE_CHECKING:
     from .character.characters import Characters
@@ -22,53 +25,78 @@ __all__ = [
 ]
 
 
+_ELEMS: tuple[Element, ...] = tuple(Element)
+assert all(elem.value == i for i, elem in enumerate(_ELEMS))
+_NUM_ELEMS = len(_ELEMS)
+_ZEROS: tuple[int, ...] = (0,) * _NUM_ELEMS
+_OMNI = Element.OMNI.value
+_ANY = Element.ANY.value
+
+
+def _to_counts(dice: dict[Element, int]) -> tuple[int, ...]:
+    counts = list(_ZEROS)
+    for elem, num in dice.items():
+        counts[elem.value] += num
+    return tuple(counts)
+
+
 class Dice:
     """
     Base class for dice
+
+    The dice are stored as a tuple of the number of each element, indexed by
+    `Element.value`, so arithmetic and checks on dice never build dictionaries.
     """
+    __slots__ = ("_counts", "_instance_cache")
+
     _LEGAL_ELEMS = frozenset(elem for elem in Element)
+    _ILLEGAL_INDICES: tuple[int, ...] = ()
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._ILLEGAL_INDICES = tuple(
+            elem.value
+            for elem in _ELEMS
+            if elem not in cls._LEGAL_ELEMS
+        )
 
     def __init__(self, dice: dict[Element, int]) -> None:
         """
         :param dice: the initial dice of this object.
 
-        Once `dice` is passed in, it'll be stored in an internal frozen dictionary,
+        Once `dice` is passed in, its numbers are copied into an internal tuple,
         ensuring immutability.
-
-        For performance, you may want to directly pass in a HashableDict object
-        instead of an ordinary dict.
         """
-        self._dice = HashableDict.from_dict(dice)
+        self._counts = _to_counts(dice)
+
+    @classmethod
+    def _from_counts(cls, counts: tuple[int, ...]) -> Self:
+        """ :returns: the dice of `counts` indexed by `Element.value`, without copying. """
+        self = cls.__new__(cls)
+        self._counts = counts
+        return self
 
     def __add__(self, other: Dice | dict[Element, int]) -> Self:
-        dice: dict[Element, int]
-        if isinstance(other, Dice):
-            dice = other._dice
-        else:
-            dice = other
-        return type(self)(self._dice + dice)
+        other_counts = other._counts if isinstance(other, Dice) else _to_counts(other)
+        return self._from_counts(tuple(map(add, self._counts, other_counts)))
 
     def __sub__(self, other: Dice | dict[Element, int]) -> Self:
-        dice: dict[Element, int]
-        if isinstance(other, Dice):
-            dice = other._dice
-        else:
-            dice = other
-        return type(self)(self._dice - dice)
+        other_counts = other._counts if isinstance(other, Dice) else _to_counts(other)
+        return self._from_counts(tuple(map(sub, self._counts, other_counts)))
 
     def num_dice(self) -> int:
         """
         :returns: total number of dice.
 
-        Time complexity = O(k), k is kinds of dice held by this object.
+        Time complexity = O(1).
         """
-        return sum(self._dice.values())
+        return sum(self._counts)
 
     def is_even(self) -> bool:
         """
         :returns: if total number of dice is even.
 
-        Time complexity = O(k), k is kinds of dice held by this object.
+        Time complexity = O(1).
         """
         return self.num_dice() % 2 == 0
 
@@ -76,19 +104,19 @@ class Dice:
         """
         :returns: if total number of dice is even.
 
-        Worst time complexity = O(k), k is kinds of dice held by this object.
+        Time complexity = O(1).
         """
-        return not any(val > 0 for val in self._dice.values())
+        return max(self._counts) <= 0
 
     def is_legal(self) -> bool:
         """
         :returns: `True` if number of each kind of die is non-negative and all
                   are one of the legal elements of this class.
 
-        Worst time complexity = O(k), k is kinds of dice held by this object.
+        Time complexity = O(1).
         """
-        return all(map(lambda x: x >= 0, self._dice.values())) \
-            and all(elem in self._LEGAL_ELEMS for elem in self)
+        counts = self._counts
+        return min(counts) >= 0 and not any(counts[i] for i in self._ILLEGAL_INDICES)
 
     def validify(self) -> Self:
         """
@@ -97,17 +125,16 @@ class Dice:
         """
         if self.is_legal():
             return self
-        return type(self)(dict(
-            (elem, n)
-            for elem, n in self._dice.items()
-            if elem in self._LEGAL_ELEMS and n > 0
-        ))
+        counts = [max(n, 0) for n in self._counts]
+        for i in self._ILLEGAL_INDICES:
+            counts[i] = 0
+        return self._from_counts(tuple(counts))
 
     def elems(self) -> Iterable[Element]:
         """
         :returns: all elements that have a number.
         """
-        return self._dice.keys()
+        return tuple(_ELEMS[i] for i, n in enumerate(self._counts) if n != 0)
 
     def pick_random_dice(self, num: int) -> tuple[Self, Self]:
         """
@@ -118,62 +145,79 @@ class Dice:
         num = min(self.num_dice(), num)
         if num == 0:
             return (self, type(self).from_empty())
-        picked_dice: dict[Element, int] = HashableDict(Counter(
-            random.sample(list(self._dice.keys()), counts=self._dice.values(), k=num)
-        ))
-        return type(self)(self._dice - picked_dice), type(self)(picked_dice)
+        # ordered by element so that the same generator state always picks the same dice
+        indices = [i for i, n in enumerate(self._counts) if n > 0]
+        picked = list(_ZEROS)
+        for i in current_rng().sample(
+                indices, counts=[self._counts[i] for i in indices], k=num
+        ):
+            picked[i] += 1
+        picked_dice = self._from_counts(tuple(picked))
+        return self - picked_dice, picked_dice
 
     def __contains__(self, elem: Element) -> bool:
         return (
             elem in self._LEGAL_ELEMS
-            and self[elem] > 0
+            and self._counts[elem.value] > 0
         )
 
     def __iter__(self) -> Iterator[Element]:
         return (
-            elem
-            for elem in self._dice
-            if self[elem] > 0
+            _ELEMS[i]
+            for i, n in enumerate(self._counts)
+            if n > 0
         )
 
     def __getitem__(self, index: Element) -> int:
-        return self._dice.get(index, 0)
+        return self._counts[index.value]
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Dice):
             return False
-        return self is other or self._dice == other._dice
+        if known_hashes_differ(self, other):
+            return False
+        return self._counts == other._counts
 
+    @cached_hash
     def __hash__(self) -> int:
-        return hash(self._dice)
+        return hash(self._counts)
 
     def __repr__(self) -> str:
-        existing_dice = dict([
-            (dice.name, str(num))
-            for dice, num in self._dice.items()
-            if num != 0
-        ])
         return (
             '{'
             + ", ".join(
                 f"{key}: {val}"
-                for key, val in existing_dice.items()
+                for key, val in self.dict_str().items()
             )
             + '}'
         )
 
+    def __reduce__(self):
+        return (type(self)._from_counts, (self._counts,))
+
     def to_dict(self) -> dict[Element, int]:
         """ :returns: a dicrionary that contains the dice info. """
-        return self._dice.to_dict()
+        return {
+            _ELEMS[i]: n
+            for i, n in enumerate(self._counts)
+            if n != 0
+        }
 
     def get_dices(self) -> HashableDict[Element, int]:
-        """ :returns: the internal frozen dictionary of dice. """
-        return self._dice
+        """ :returns: a frozen dictionary of dice. """
+        return HashableDict(self.to_dict())
 
-    @cached_property
+    @property
     def ordered_dice(self) -> tuple[Element, ...]:
-        return Counter(self._dice).elements()  # type: ignore
+        return tuple(chain.from_iterable(
+            repeat(_ELEMS[i], n)
+            for i, n in enumerate(self._counts)
+            if n > 0
+        ))
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this Dice.
@@ -193,24 +237,22 @@ class Dice:
         """
         :returns: the Dice object decoded from `encoding`.
         """
-        dice: dict[Element, int] = defaultdict(int)
+        counts = list(_ZEROS)
         for elem_code in encoding:
             if elem_code == 0:
                 continue
             elem_code -= encoding_plan.encode_item(Element(0))
             if elem_code > len(Element):
                 return None
-            elem = Element(elem_code)
-            dice[elem] += 1
-        return cls(dice)
+            counts[Element(elem_code).value] += 1
+        return cls._from_counts(tuple(counts))
 
     def dict_str(self) -> dict[str, Any]:
-        existing_dice = dict([
-            (dice.name, str(num))
-            for dice, num in self._dice.items()
-            if num != 0
-        ])
-        return existing_dice
+        return {
+            _ELEMS[i].name: str(n)
+            for i, n in enumerate(self._counts)
+            if n != 0
+        }
 
     def __copy__(self) -> Self:  # pragma: no cover
         return self
@@ -220,10 +262,7 @@ class Dice:
 
     @classmethod
     def from_empty(cls) -> Self:
-        return cls(HashableDict((
-            (elem, 0)
-            for elem in cls._LEGAL_ELEMS
-        )))
+        return cls._from_counts(_ZEROS)
 
 
 _PURE_ELEMS = frozenset({
@@ -237,6 +276,9 @@ _PURE_ELEMS = frozenset({
 })
 
 
+_PURE_INDICES: tuple[int, ...] = tuple(elem.value for elem in PURE_ELEMENTS_ORDERED)
+
+
 class ActualDice(Dice):
     """
     Used for the actual dice a player can have.
@@ -275,26 +317,26 @@ class ActualDice(Dice):
 
     def _satisfy(self, requirement: AbstractDice) -> bool:
         assert self.is_legal() and requirement.is_legal()
+        counts = self._counts
+        required = requirement._counts
 
         # satisfy all pure elements first
-        pure_deducted: HashableDict[Element, int] = HashableDict((
-            (elem, self[elem] - requirement[elem])
-            for elem in _PURE_ELEMS
-        ), frozen=False)
-        omni_needed = sum(
-            -num
-            for num in pure_deducted.values()
-            if num < 0
-        )
+        omni_needed = 0
+        most_pure = -BIG_INT
+        for i in _PURE_INDICES:
+            deducted = counts[i] - required[i]
+            if deducted < 0:
+                omni_needed -= deducted
+            if deducted > most_pure:
+                most_pure = deducted
 
         # if OMNI given cannot cover pure misses, fail
-        if self[Element.OMNI] < omni_needed:
+        if counts[_OMNI] < omni_needed:
             return False
 
         # test OMNI requirement
-        omni_remained = self[Element.OMNI] - omni_needed
-        most_pure: int = max(pure_deducted.values())
-        if omni_remained + most_pure < requirement[Element.OMNI]:
+        omni_remained = counts[_OMNI] - omni_needed
+        if omni_remained + most_pure < required[_OMNI]:
             return False
 
         # We have enough dice to satisfy Element.ANY, so success
@@ -335,70 +377,58 @@ class ActualDice(Dice):
         """
         if requirement.num_dice() > self.num_dice():
             return None
-        from collections import defaultdict
-        remaining: dict[Element, int] = self._dice.copy()
-        answer: dict[Element, int] = defaultdict(int)
-        pures: dict[Element, int] = HashableDict(frozen=False)
-        omni = 0
-        any = 0
+        remaining = list(self._counts)
+        answer = list(_ZEROS)
+        required = requirement._counts
+        omni = required[_OMNI]
+        any = required[_ANY]
         omni_required = 0
-        for elem in requirement:
-            if elem in _PURE_ELEMS:
-                pures[elem] = requirement[elem]
-            elif elem is Element.OMNI:
-                omni = requirement[elem]
-            elif elem is Element.ANY:
-                any = requirement[elem]
-            else:  # pragma: no cover
-                raise Exception("Unknown element")
-        if len(pures) > 0:
-            for elem in pures:
-                if remaining.get(elem, 0) < pures[elem]:
-                    answer[elem] += remaining.get(elem, 0)
-                    omni_required += pures[elem] - remaining.get(elem, 0)
-                    remaining[elem] = 0
-                else:
-                    answer[elem] += pures[elem]
-                    remaining[elem] -= pures[elem]
+        for i in _PURE_INDICES:
+            if required[i] <= 0:
+                continue
+            if remaining[i] < required[i]:
+                answer[i] += remaining[i]
+                omni_required += required[i] - remaining[i]
+                remaining[i] = 0
+            else:
+                answer[i] += required[i]
+                remaining[i] -= required[i]
         if omni > 0:
-            best_elem: None | Element = None
+            best_i: None | int = None
             best_count = 0
-            for elem in list(_PURE_ELEMS):
-                this_count = remaining.get(elem, 0)
+            for i in _PURE_INDICES:
+                this_count = remaining[i]
                 if best_count > omni and this_count >= omni and this_count < best_count:
-                    best_elem = elem
+                    best_i = i
                     best_count = this_count
                 elif best_count < omni and this_count > best_count:
-                    best_elem = elem
+                    best_i = i
                     best_count = this_count
                 elif best_count == omni:
                     break
-            if best_elem is not None:
+            if best_i is not None:
                 best_count = min(best_count, omni)
-                answer[best_elem] += best_count
-                remaining[best_elem] -= best_count
+                answer[best_i] += best_count
+                remaining[best_i] -= best_count
                 omni_required += omni - best_count
             else:
                 omni_required += omni
         if any > 0:
-            from operator import itemgetter
-            sorted_elems = sorted(remaining.items(), key=itemgetter(1))
-            for elem, num in sorted_elems:
-                if elem in _PURE_ELEMS:
-                    num = min(num, any)
-                    answer[elem] += num
-                    remaining[elem] -= num
-                    any -= num
-                    if any == 0:
-                        break
+            for i in sorted(_PURE_INDICES, key=remaining.__getitem__):
+                num = min(remaining[i], any)
+                answer[i] += num
+                remaining[i] -= num
+                any -= num
+                if any == 0:
+                    break
             if any > 0:
-                answer[Element.OMNI] += any
-                remaining[Element.OMNI] -= any
+                answer[_OMNI] += any
+                remaining[_OMNI] -= any
         if omni_required > 0:
-            if remaining.get(Element.OMNI, 0) < omni_required:
+            if remaining[_OMNI] < omni_required:
                 return None
-            answer[Element.OMNI] += omni_required
-        return ActualDice(answer)
+            answer[_OMNI] += omni_required
+        return ActualDice._from_counts(tuple(answer))
 
     def smart_selection(
             self,
@@ -418,134 +448,49 @@ class ActualDice(Dice):
                   useful dice as possible. If it is impossible to fulfill, then
                   `None` is returned.
 
-        This method is approximately 2 times slower than `basic_selection()`.
+        Selections are memoized (LRU) on the dice, the requirement and the
+        precedence, as the same payments are resolved over and over in a game.
         """
+        # made by the class of `self`, the selection is of the same type
+        return cast("None | Self", _smart_selection(
+            cast(Hashable, type(self)),
+            self._counts,
+            requirement._counts,
+            self._precedence(characters, local_precedence),
+        ))
 
-        if requirement.num_dice() > self.num_dice():
-            return None
-
-        # result in dict format
-        result_dict: dict[Element, int] = defaultdict(int)
-
-        supply: dict[Element, int] = defaultdict(int)
-        supply.update(self._dice)
-
-        need: dict[Element, int] = defaultdict(int)
-        need.update(requirement._dice)
+    def smart_selections(
+            self,
+            requirements: Iterable[AbstractDice],
+            characters: None | Characters = None,
+            local_precedence: None | list[set[Element]] = None,
+    ) -> tuple[None | Self, ...]:
+        """
+        :returns: the `smart_selection()` of each of the `requirements`, e.g. the
+                  costs of all skills and cards a player can use, with the
+                  precedence worked out only once.
+        """
+        precedence = self._precedence(characters, local_precedence)
+        cls = cast(Hashable, type(self))
+        counts = self._counts
+        return tuple(
+            cast("None | Self", _smart_selection(cls, counts, requirement._counts, precedence))
+            for requirement in requirements
+        )
 
-        # local precedence initialization / correction
+    @staticmethod
+    def _precedence(
+            characters: None | Characters,
+            local_precedence: None | list[set[Element]],
+    ) -> tuple[frozenset[Element], ...]:
+        """ :returns: the hashable local precedence of `smart_selection()`. """
         if local_precedence is None:
             if characters is None:
-                local_precedence = [set(_PURE_ELEMS)]
-            else:
-                chars = characters.get_characters()
-                active_char = characters.get_active_character()
-                char_elems = {char.ELEMENT for char in chars}
-                if active_char is None:
-                    local_precedence = [char_elems]
-                else:
-                    local_precedence = [
-                        active_elem := {active_char.ELEMENT},
-                        char_elems - active_elem,
-                    ]
-                local_precedence.append(set(_PURE_ELEMS) - char_elems)
+                return (_PURE_ELEMS,)
+            return characters.dice_precedence()
         elif len(local_precedence) == 0:
-            local_precedence = [set(_PURE_ELEMS)]
-        first_priority_elements: set[Element] = local_precedence[0]
-
-        if __debug__:
-            # check local precedence validity
-            appeared_elems: set[Element] = set()
-            for elem_set in local_precedence:
-                assert Element.OMNI not in elem_set, "OMNI should not be in precedence"
-                assert Element.ANY not in elem_set, "ANY should not be in precedence"
-                for elem in elem_set:
-                    assert elem in _PURE_ELEMS, "Unknown element in precedence"
-                    assert elem not in appeared_elems, "Duplicated element in precedence"
-                    appeared_elems.add(elem)
-
-        ## 1st step - fill elemental requirement ##
-        for elem in _PURE_ELEMS:
-            if need[elem] <= supply[elem]:
-                supply[elem] -= need[elem]
-                result_dict[elem] += need[elem]
-            else:
-                omni_required = need[elem] - supply[elem]
-                if supply[Element.OMNI] < omni_required:
-                    return None
-                result_dict[elem] += supply[elem]
-                result_dict[Element.OMNI] += omni_required
-                supply[elem] = 0
-                supply[Element.OMNI] -= omni_required
-
-        ## 2nd step - fill OMNI requirement ##
-        # Rank elements by priority [is first priority, supply, user priority, implicit priority, element]
-        if need[Element.OMNI] > 0:
-            elems_with_omni_priority: list[tuple[int, int, int, int, Element]] = []
-            for priority, elem_set in enumerate(local_precedence):
-                for elem in elem_set:
-                    if supply[elem] <= 0:
-                        continue
-                    elems_with_omni_priority.append((
-                        int(elem in first_priority_elements),
-                        -supply[elem],
-                        -priority,
-                        -self._LEGAL_ELEMS_ORDERED_DICT[elem],
-                        elem,
-                    ))
-            elems_with_omni_priority.sort()
-            # get elems in order of priority (from least valuable to most valuable)
-            elems_ordered = [elem for _, _, _, _, elem in elems_with_omni_priority]
-
-            # fill OMNI requirement
-            optional_elem = next((
-                elem
-                for elem in elems_ordered
-                if need[Element.OMNI] <= supply[elem] + supply[Element.OMNI]
-            ), None)
-            if optional_elem is None:
-                if need[Element.OMNI] > supply[Element.OMNI]:
-                    return None
-                else:
-                    result_dict[Element.OMNI] += need[Element.OMNI]
-                    supply[Element.OMNI] -= need[Element.OMNI]
-            else:
-                elem = optional_elem
-                elem_deduction = min(need[Element.OMNI], supply[elem])
-                omni_deduction = need[Element.OMNI] - elem_deduction
-                result_dict[elem] += elem_deduction
-                result_dict[Element.OMNI] += omni_deduction
-                supply[elem] -= elem_deduction
-                supply[Element.OMNI] -= omni_deduction
-
-        ## 3rd step - fill ANY requirement ##
-        # Rank elements by priority [user priority, supply, implicit priority, element]
-        if need[Element.ANY] > 0:
-            elems_with_any_priority: list[tuple[int, int, int, Element]] = [(1, 0, 0, Element.OMNI)]
-            for priority, elem_set in enumerate(local_precedence):
-                for elem in elem_set:
-                    if supply[elem] <= 0:
-                        continue
-                    elems_with_any_priority.append((
-                        -priority,
-                        supply[elem],
-                        -self._LEGAL_ELEMS_ORDERED_DICT[elem],
-                        elem,
-                    ))
-            elems_with_any_priority.sort()
-            # get elems in order of priority (from least valuable to most valuable)
-            elems_ordered = [elem for _, _, _, elem in elems_with_any_priority]
-
-            # fill ANY requirement
-            for elem in elems_ordered:
-                elem_deduction = min(need[Element.ANY], supply[elem])
-                result_dict[elem] += elem_deduction
-                supply[elem] -= elem_deduction
-                need[Element.ANY] -= elem_deduction
-                if need[Element.ANY] == 0:
-                    break
-
-        return type(self)(result_dict)
+            return (_PURE_ELEMS,)
+        return tuple(frozenset(elem_set) for elem_set in local_precedence)
 
     def _init_ordered_dice(
             self,
@@ -636,21 +581,22 @@ class ActualDice(Dice):
         """
         :returns: a random `ActualDice` object with `size` of dice that are not `excepted_elems`.
         """
-        dice = ActualDice.from_empty()
-        dice._dice._unfreeze()
+        rng = current_rng()
+        candidates = tuple(
+            elem.value
+            for elem in ActualDice._LEGAL_ELEMS_ORDERED
+            if elem not in excepted_elems
+        )
+        counts = list(_ZEROS)
         for i in range(size):
-            elem = random.choice(tuple(ActualDice._LEGAL_ELEMS - excepted_elems))
-            dice._dice[elem] += 1
-        dice._dice.freeze()
-        return dice
+            counts[rng.choice(candidates)] += 1
+        return ActualDice._from_counts(tuple(counts))
 
     @classmethod
     def from_all(cls, size: int, elem: Element) -> ActualDice:
-        dice = ActualDice.from_empty()
-        dice._dice._unfreeze()
-        dice._dice[Element.OMNI] = size
-        dice._dice.freeze()
-        return dice
+        counts = list(_ZEROS)
+        counts[_OMNI] = size
+        return ActualDice._from_counts(tuple(counts))
 
     @classmethod
     def from_dice(cls, dice: Dice) -> None | ActualDice:
@@ -658,13 +604,123 @@ class ActualDice(Dice):
         :returns: a new object of `ActualDice` if the `dice` provided is legal
                   in the context of `ActualDice`.
         """
-        new_dice = ActualDice(dice._dice)
+        new_dice = ActualDice._from_counts(dice._counts)
         if not new_dice.is_legal():
             return None
         else:
             return new_dice
 
 
+@lru_cache(maxsize=1 << 14)
+def _smart_selection(
+        cls: type[ActualDice],
+        supply_counts: tuple[int, ...],
+        need: tuple[int, ...],
+        local_precedence: tuple[frozenset[Element], ...],
+) -> None | ActualDice:
+    """ The uncached `ActualDice.smart_selection()`, on counts of dice. """
+    if sum(need) > sum(supply_counts):
+        return None
+
+    result = list(_ZEROS)
+    supply = list(supply_counts)
+    first_priority_elements = local_precedence[0]
+    priorities = ActualDice._LEGAL_ELEMS_ORDERED_DICT
+
+    if __debug__:
+        # check local precedence validity
+        appeared_elems: set[Element] = set()
+        for elem_set in local_precedence:
+            assert Element.OMNI not in elem_set, "OMNI should not be in precedence"
+            assert Element.ANY not in elem_set, "ANY should not be in precedence"
+            for elem in elem_set:
+                assert elem in _PURE_ELEMS, "Unknown element in precedence"
+                assert elem not in appeared_elems, "Duplicated element in precedence"
+                appeared_elems.add(elem)
+
+    ## 1st step - fill elemental requirement ##
+    for i in _PURE_INDICES:
+        if need[i] <= supply[i]:
+            supply[i] -= need[i]
+            result[i] += need[i]
+        else:
+            omni_required = need[i] - supply[i]
+            if supply[_OMNI] < omni_required:
+                return None
+            result[i] += supply[i]
+            result[_OMNI] += omni_required
+            supply[i] = 0
+            supply[_OMNI] -= omni_required
+
+    ## 2nd step - fill OMNI requirement ##
+    # Rank elements by priority [is first priority, supply, user priority, implicit priority, element]
+    need_omni = need[_OMNI]
+    if need_omni > 0:
+        elems_with_omni_priority: list[tuple[int, int, int, int, int]] = []
+        for priority, elem_set in enumerate(local_precedence):
+            for elem in elem_set:
+                i = elem.value
+                if supply[i] <= 0:
+                    continue
+                elems_with_omni_priority.append((
+                    int(elem in first_priority_elements),
+                    -supply[i],
+                    -priority,
+                    -priorities[elem],
+                    i,
+                ))
+        elems_with_omni_priority.sort()
+
+        # fill OMNI requirement with the least valuable element that can
+        optional_i = next((
+            i
+            for _, _, _, _, i in elems_with_omni_priority
+            if need_omni <= supply[i] + supply[_OMNI]
+        ), None)
+        if optional_i is None:
+            if need_omni > supply[_OMNI]:
+                return None
+            else:
+                result[_OMNI] += need_omni
+                supply[_OMNI] -= need_omni
+        else:
+            elem_deduction = min(need_omni, supply[optional_i])
+            omni_deduction = need_omni - elem_deduction
+            result[optional_i] += elem_deduction
+            result[_OMNI] += omni_deduction
+            supply[optional_i] -= elem_deduction
+            supply[_OMNI] -= omni_deduction
+
+    ## 3rd step - fill ANY requirement ##
+    # Rank elements by priority [user priority, supply, implicit priority, element]
+    need_any = need[_ANY]
+    if need_any > 0:
+        elems_with_any_priority: list[tuple[int, int, int, int]] = [(1, 0, 0, _OMNI)]
+        for priority, elem_set in enumerate(local_precedence):
+            for elem in elem_set:
+                i = elem.value
+                if supply[i] <= 0:
+                    continue
+                elems_with_any_priority.append((
+                    -priority,
+                    supply[i],
+                    -priorities[elem],
+                    i,
+                ))
+        elems_with_any_priority.sort()
+
+        # fill ANY requirement, from the least valuable to the most valuable
+        for _, _, _, i in elems_with_any_priority:
+            elem_deduction = min(need_any, supply[i])
+            result[i] += elem_deduction
+            supply[i] -= elem_deduction
+            need_any -= elem_deduction
+            if need_any == 0:
+                break
+
+    return cls._from_counts(tuple(result))
+
+
 class AbstractDice(Dice):
     """
     Used for the dice cost of cards and other actions
@@ -739,7 +795,7 @@ class AbstractDice(Dice):
         :returns: a new object of `ActualDice` if the `dice` provided is legal
                   in the context of `ActualDice`.
         """
-        new_dice = AbstractDice(dice._dice)
+        new_dice = AbstractDice._from_counts(dice._counts)
         if not new_dice.is_legal():
             return None
         else:
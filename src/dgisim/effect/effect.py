@@ -29,6 +29,7 @@ from ..character.enums import CharacterSkill
 from ..dice import ActualDice
 from ..effect.effect_stack import EffectStack
 from ..element import Element, ElementalAura, Reaction, ReactionDetail
+from ..encoding.encoding_cache import cached_encoding
 from ..event import *
 from ..helper.quality_of_life import just, case_val, BIG_INT
 from ..state.enums import Pid, Act
@@ -160,6 +161,7 @@ class Effect:
     def dict_str(self) -> Union[dict, str]:
         return asdict(self)
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this effect.
@@ -1022,14 +1024,9 @@ class ApplyElementalAuraEffect(DirectEffect):
         all_aura = target_char.elemental_aura
         if target_char.is_defeated() or (all_aura.aurable(self.element) and self.element in all_aura):
             return game_state
-        reaction_detail = all_aura.consult_reaction(self.element)
-        new_aura = all_aura
+        reaction_detail, new_aura = all_aura.react(self.element)
         effects: list[Effect] = []
-        if reaction_detail is None:
-            if new_aura.aurable(self.element):
-                new_aura = new_aura.add(self.element)
-        else:
-            new_aura = new_aura.remove(reaction_detail.first_elem)
+        if reaction_detail is not None:
             if reaction_detail.reaction_type is Reaction.BLOOM:
                 effects.append(
                     AddCombatStatusEffect(
@@ -1084,14 +1081,10 @@ class ApplyElementalAuraEffect(DirectEffect):
                     Reaction.SWIRL,
                 }, f"{reaction_detail.reaction_type} is not covered"
 
-        game_state = game_state.factory().f_player(
+        game_state = game_state.factory().f_character(
             self.target.pid,
-            lambda p: p.factory().f_characters(
-                lambda cs: cs.factory().f_character(
-                    cast(int, self.target.id),
-                    lambda c: c.factory().elemental_aura(new_aura).build()
-                ).build()
-            ).build()
+            cast(int, self.target.id),
+            lambda c: c.factory().elemental_aura(new_aura).build()
         ).f_effect_stack(
             lambda efs: efs.push_many_fl(effects)
         ).build()
@@ -1151,18 +1144,10 @@ class SpecificDamageEffect(DirectEffect):
         target_char = game_state.get_character_target(damage.target)
         assert target_char is not None
 
-        # try to identify the reaction
-        second_elem = damage.element
-        all_aura = target_char.elemental_aura
-        reaction_detail = all_aura.consult_reaction(second_elem)
-
-        # generate & update new aura
-        new_aura = all_aura
+        # identify the reaction and the new aura
+        reaction_detail, new_aura = target_char.elemental_aura.react(damage.element)
         if reaction_detail is not None:
-            new_aura = new_aura.remove(reaction_detail.first_elem)
             damage = replace(damage, reaction=reaction_detail)
-        elif new_aura.aurable(second_elem):
-            new_aura = new_aura.add(second_elem)
 
         game_state, damage = cls._damage_preprocess(
             game_state, damage, Preprocessables.DMG_REACTION
@@ -1199,14 +1184,10 @@ class SpecificDamageEffect(DirectEffect):
             )
         game_state, actual_damage = self._damage_confirmation(game_state, reactioned_damage)
         if new_aura != old_aura:
-            game_state = game_state.factory().f_player(
+            game_state = game_state.factory().f_character(
                 self.target.pid,
-                lambda p: p.factory().f_characters(
-                    lambda cs: cs.factory().f_character(
-                        cast(int, self.target.id),
-                        lambda c: c.factory().elemental_aura(new_aura).build()
-                    ).build()
-                ).build()
+                cast(int, self.target.id),
+                lambda c: c.factory().elemental_aura(new_aura).build()
             ).build()
         # Update all statuses with this damage
         game_state = StatusProcessing.inform_all_statuses(
@@ -1224,24 +1205,27 @@ class SpecificDamageEffect(DirectEffect):
         hp = target.hp
         hp = max(0, hp - actual_damage.damage)
 
+        # the broadcast, the hp and the effects of the reaction are all written
+        # by this single factory
+        factory = game_state.factory()
         if hp != 0 or target.will_revive(game_state, actual_damage.target):
-            game_state = game_state.factory().f_dmg_effect_stack(
+            factory.f_dmg_effect_stack(
                 lambda es: es.push_left(BroadcastDamageEffect(
                     home_pid=self.source.pid, dmg=actual_damage, lethal=False,
                 ))
-            ).build()
+            )
         else:
-            game_state = game_state.factory().f_lethal_dmg_effect_stack(
+            factory.f_lethal_dmg_effect_stack(
                 lambda es: es.push_left(BroadcastDamageEffect(
                     home_pid=self.source.pid, dmg=actual_damage, lethal=True,
                 ))
-            ).build()
+            )
 
         target_pid = self.target.pid
         effects: list[Effect] = []
 
         if hp != target.hp:
-            target = target.factory().hp(hp).build()
+            factory.character(target_pid, target.factory().hp(hp).build())
 
         if reaction is None:
             pass
@@ -1331,12 +1315,7 @@ class SpecificDamageEffect(DirectEffect):
             raise Exception(f"Reaction {reaction.reaction_type} not handled")
 
         # damaged game state
-        game_state = game_state.factory().f_player(
-            target_pid,
-            lambda p: p.factory().f_characters(
-                lambda cs: cs.factory().character(target).build()  # type: ignore
-            ).build()
-        ).f_effect_stack(
+        game_state = factory.f_effect_stack(
             lambda es: es.push_many_fl(effects)
         ).build()
 
@@ -1469,14 +1448,10 @@ class RecoverHPEffect(DirectEffect):
         hp = min(character.hp + self.recovery, character.max_hp)
         if hp == character.hp:
             return game_state
-        return game_state.factory().f_player(
+        return game_state.factory().f_character(
             self.target.pid,
-            lambda p: p.factory().f_characters(
-                lambda cs: cs.factory().f_character(
-                    character.id,  # type: ignore
-                    lambda c: c.factory().hp(hp).build()
-                ).build()
-            ).build()
+            character.id,  # type: ignore
+            lambda c: c.factory().hp(hp).build()
         ).f_common_effect_stack(
             lambda es: es.push_left(BroadcastHealingEffect(
                 home_pid=self.source.pid,
@@ -1499,14 +1474,10 @@ class ReviveRecoverHPEffect(RecoverHPEffect):
         hp = min(self.recovery, character.max_hp)
         if hp == 0:
             return game_state
-        return game_state.factory().f_player(
+        return game_state.factory().f_character(
             self.target.pid,
-            lambda p: p.factory().f_characters(
-                lambda cs: cs.factory().f_character(
-                    character.id,  # type: ignore
-                    lambda c: c.factory().alive(True).hp(hp).build()
-                ).build()
-            ).build()
+            character.id,  # type: ignore
+            lambda c: c.factory().alive(True).hp(hp).build()
         ).f_effect_stack(
             lambda es: es.push_one(PersonalStatusTriggererEffect(
                 target=self.target,
@@ -1,6 +1,9 @@
 from __future__ import annotations
 from itertools import chain
-from typing import Iterable, Sequence, TYPE_CHECKING
+from typing import Iterator, Sequence, TYPE_CHECKING
+
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, known_hashes_differ
 
 if TYPE_CHECKING:
     from .effect import Effect
@@ -11,33 +14,107 @@ __all__ = [
 ]
 
 
+class _EffectNode:
+    """
+    A node of the persistent linked list backing `EffectStack`, linking from the
+    top of the stack down, so that stacks pushed onto or popped from the same
+    stack share all the nodes below.
+    """
+    __slots__ = ("effect", "below", "size", "hash")
+
+    def __init__(self, effect: Effect, below: None | _EffectNode) -> None:
+        self.effect = effect
+        self.below = below
+        self.size: int = 1 if below is None else below.size + 1
+        # hash of the effects from the bottom up to this node, computed lazily
+        self.hash: None | int = None
+
+    def __reduce__(self):
+        # the hash is left out, as it may not be valid in another process
+        return (_EffectNode, (self.effect, self.below))
+
+
+_EMPTY_HASH = hash(())
+
+
+def _hash_of(top: None | _EffectNode) -> int:
+    """ :returns: the hash of the stack with `top`, computed for each node once. """
+    if top is None:
+        return _EMPTY_HASH
+    pending: list[_EffectNode] = []
+    node: None | _EffectNode = top
+    while node is not None and node.hash is None:
+        pending.append(node)
+        node = node.below
+    hash_val = _EMPTY_HASH if node is None else node.hash
+    for node in reversed(pending):
+        hash_val = hash((hash_val, node.effect))
+        node.hash = hash_val
+    return hash_val  # type: ignore
+
+
 class EffectStack:
     """
     A class responsible for holding pending effects to be executed as a stack.
+
+    The effects are kept in a persistent linked list, so pushing onto and
+    popping from the top are O(1) no matter how deep the stack is.
     """
+    __slots__ = ("_top", "_effects_tuple", "_instance_cache")
+
     def __init__(self, effects: tuple[Effect, ...]) -> None:
         """
         :param effects: effects to be executed, ordered from last to first (to be executed).
         """
-        self._effects = effects
+        top: None | _EffectNode = None
+        for effect in effects:
+            top = _EffectNode(effect, top)
+        self._top = top
+        self._effects_tuple: None | tuple[Effect, ...] = tuple(effects)
+
+    @classmethod
+    def _from_top(cls, top: None | _EffectNode) -> EffectStack:
+        self = cls.__new__(cls)
+        self._top = top
+        self._effects_tuple = None
+        return self
+
+    @property
+    def _effects(self) -> tuple[Effect, ...]:
+        """ :returns: all effects, ordered from last to first (to be executed). """
+        effects = self._effects_tuple
+        if effects is None:
+            effects = tuple(reversed(tuple(self._iter_from_top())))
+            self._effects_tuple = effects
+        return effects
+
+    def _iter_from_top(self) -> Iterator[Effect]:
+        node = self._top
+        while node is not None:
+            yield node.effect
+            node = node.below
 
     def is_not_empty(self) -> bool:
         """ :returns: `True` if there's at least one effect. """
-        return not self.is_empty()
+        return self._top is not None
 
     def is_empty(self) -> bool:
         """ :returns: `True` if there no effects. """
-        return len(self._effects) == 0
+        return self._top is None
+
+    def __len__(self) -> int:
+        return 0 if self._top is None else self._top.size
 
     def pop(self) -> tuple[EffectStack, Effect]:
         """ :returns: a tuple of left effects in the stack and popped effect. """
-        assert not self.is_empty()
-        return (EffectStack(tuple(self._effects[:-1])), self._effects[-1])
+        top = self._top
+        assert top is not None
+        return (EffectStack._from_top(top.below), top.effect)
 
     def peek(self) -> Effect:
         """ :returns: the top effect. """
-        assert not self.is_empty()
-        return self._effects[-1]
+        assert self._top is not None
+        return self._top.effect
 
     def _first_barrier_idx(self) -> int:
         from .effect import GroupEffectBarrierEffect
@@ -66,7 +143,8 @@ class EffectStack:
 
     def pop_all_left(self) -> tuple[EffectStack, tuple[Effect, ...]]:
         """ :returns: EffectStack with remaining effects and all popped effects. """
-        from .effect import GroupEffectBarrierEffect
+        if self._top is None:
+            return (self, ())
         first_barrier_idx = self._first_barrier_idx()
         if first_barrier_idx == -1:
             return (EffectStack(()), self._effects[::-1])
@@ -74,7 +152,8 @@ class EffectStack:
 
     def pop_all_rev_left(self) -> tuple[EffectStack, tuple[Effect, ...]]:
         """ :returns: EffectStack with remaining effects and all popped effects. """
-        from .effect import GroupEffectBarrierEffect
+        if self._top is None:
+            return (self, ())
         first_barrier_idx = self._first_barrier_idx()
         if first_barrier_idx == -1:
             return (EffectStack(()), self._effects)
@@ -82,7 +161,7 @@ class EffectStack:
 
     def push_one(self, effect: Effect) -> EffectStack:
         """ :returns: the new EffectStack with `effect` pushed onto it. """
-        return EffectStack(self._effects + (effect, ))
+        return EffectStack._from_top(_EffectNode(effect, self._top))
 
     def push_many_lf(self, effects: Sequence[Effect]) -> EffectStack:
         """
@@ -93,7 +172,10 @@ class EffectStack:
         effects = tuple(effects)
         if not effects:
             return self
-        return EffectStack(self._effects + effects)
+        top = self._top
+        for effect in effects:
+            top = _EffectNode(effect, top)
+        return EffectStack._from_top(top)
 
     def push_many_fl(self, effects: Sequence[Effect]) -> EffectStack:
         """
@@ -104,7 +186,10 @@ class EffectStack:
         effects = tuple(effects)
         if not effects:
             return self
-        return EffectStack(self._effects + effects[::-1])
+        top = self._top
+        for effect in reversed(effects):
+            top = _EffectNode(effect, top)
+        return EffectStack._from_top(top)
 
     def push_left(self, effects: Effect | Sequence[Effect]) -> EffectStack:
         """
@@ -129,11 +214,12 @@ class EffectStack:
         """
         :returns: `True` if there's an effect of the exact type of`effect_type`.
         """
-        for effect in self._effects:
+        for effect in self._iter_from_top():
             if type(effect) == effect_type:
                 return True
         return False
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this EffectStack.
@@ -150,12 +236,29 @@ class EffectStack:
         return list(chain.from_iterable(ret_val))
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, EffectStack):
             return False
-        return self is other or self._effects == other._effects
+        if len(self) != len(other):
+            return False
+        if known_hashes_differ(self, other):
+            return False
+        # stops at the first node shared by both stacks
+        node, other_node = self._top, other._top
+        while node is not other_node:
+            assert node is not None and other_node is not None
+            if node.effect != other_node.effect:
+                return False
+            node, other_node = node.below, other_node.below
+        return True
 
+    @cached_hash
     def __hash__(self) -> int:
-        return hash(self._effects)
+        return _hash_of(self._top)
+
+    def __reduce__(self):
+        return (EffectStack._from_top, (self._top,))
 
     def __str__(self) -> str:
         return str(self._effects)
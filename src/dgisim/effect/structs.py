@@ -37,7 +37,7 @@ class StaticTarget:
         # TODO: check validity of this method
         pid_code = encoding[0]
         zone_code = encoding[1]
-        if pid_code >= len(Pid) or zone_code >= len(Zone):
+        if pid_code not in (Pid.P1.value, Pid.P2.value) or not 0 <= zone_code < len(Zone):
             return None
         zone = Zone(zone_code)
         id: int | type["Summon"]
@@ -7,7 +7,6 @@ from enum import Enum
 from itertools import chain
 from typing import Any, FrozenSet, Iterator, TYPE_CHECKING
 
-from .helper.hashable_dict import HashableDict
 
 if TYPE_CHECKING:
     from .encoding.encoding_plan import EncodingPlan
@@ -17,6 +16,7 @@ __all__ = [
     "AURA_ELEMENTS_ORDERED",
     "Element",
     "ElementalAura",
+    "PURE_ELEMENTS_ORDERED",
     "Reaction",
     "ReactionDetail",
 ]
@@ -47,8 +47,8 @@ class Element(Enum):
         return self in AURA_ELEMENTS
 
 
-#: Elements of the seven.
-PURE_ELEMENTS: set[Element] = {
+#: Elements of the seven, in a fixed order. (useful for reproducible random choices)
+PURE_ELEMENTS_ORDERED: tuple[Element, ...] = (
     Element.PYRO,
     Element.HYDRO,
     Element.ANEMO,
@@ -56,7 +56,10 @@ PURE_ELEMENTS: set[Element] = {
     Element.DENDRO,
     Element.CRYO,
     Element.GEO,
-}
+)
+
+#: Elements of the seven.
+PURE_ELEMENTS: set[Element] = set(PURE_ELEMENTS_ORDERED)
 
 
 #: Aurable elements ordered by reaction priority.
@@ -158,11 +161,7 @@ class Reaction(Enum):
         """
         :returns: a Reaction if the `first` element can react with the `second` element.
         """
-        for reaction in cls:
-            e1, e2 = reaction.value.reaction_elems
-            if (first in e1 and second in e2) or (first in e2 and second in e1):
-                return reaction
-        return None
+        return _REACTION_OF_PAIR[first.value][second.value]
 
     @classmethod
     def consult_reaction_with_aura(
@@ -172,11 +171,7 @@ class Reaction(Enum):
         :returns: the ReactionDetail if the incoming element has a reaction
                   with any aura elements.
         """
-        for elem in aura:
-            reaction = cls.consult_reaction(elem, second)
-            if reaction is not None:
-                return ReactionDetail(reaction, elem, second)
-        return None
+        return _REACTION_TABLE[aura._mask][second.value][0]
 
     def damage_boost(self) -> int:
         """
@@ -218,12 +213,19 @@ class ElementalAura:
     """
     Stores the aura elements (element applications) of a character.
 
-    This class must initialized by calling `.from_default()` for correct
-    aura element ordering.
+    The applied elements are stored as a bitmask over `AURA_ELEMENTS_ORDERED`,
+    so there are only 32 distinct auras, which are all shared instances when
+    created through `from_default()`, `add()`, `remove()` and `react()`.
     """
+    __slots__ = ("_mask",)
+
     def __init__(self, aura: dict[Element, bool] = {}) -> None:
         assert aura.keys() <= AURA_ELEMENTS
-        self._aura = HashableDict.from_dict(aura)
+        mask = 0
+        for elem, applied in aura.items():
+            if applied:
+                mask |= _AURA_BITS[elem.value]
+        self._mask = mask
 
     @classmethod
     def from_default(cls) -> ElementalAura:
@@ -231,10 +233,11 @@ class ElementalAura:
         :returns: an ElementalAura object that respects aura orders.
                   (namely, Cryo reacts prior to Dendro)
         """
-        return cls(HashableDict(
-            (elem, False)
-            for elem in AURA_ELEMENTS_ORDERED
-        ))
+        return _AURAS[0]
+
+    @staticmethod
+    def _from_mask(mask: int) -> ElementalAura:
+        return _AURAS[mask]
 
     @staticmethod
     def aurable(elem: Element) -> bool:
@@ -243,10 +246,11 @@ class ElementalAura:
 
     def peek(self) -> None | Element:
         """ :returns: the element that has the highest priority to be reacted. """
-        for elem, aura in self._aura.items():
-            if aura:
-                return elem
-        return None
+        mask = self._mask
+        if not mask:
+            return None
+        # the lowest bit is of the highest priority
+        return AURA_ELEMENTS_ORDERED[(mask & -mask).bit_length() - 1]
 
     def remove(self, elem: Element) -> ElementalAura:
         """
@@ -255,10 +259,7 @@ class ElementalAura:
         This should only be called if `elem` is contained.
         """
         assert elem in AURA_ELEMENTS
-        return ElementalAura(HashableDict(
-            (e, aura if e != elem else False)
-            for e, aura in self._aura.items()
-        ))
+        return _AURAS[self._mask & ~_AURA_BITS[elem.value]]
 
     def add(self, elem: Element) -> ElementalAura:
         """
@@ -267,58 +268,125 @@ class ElementalAura:
         This should only be called if `elem` is aurable.
         """
         assert elem in AURA_ELEMENTS
-        if elem in self._aura and self._aura[elem]:
-            return self
-        return ElementalAura(HashableDict(
-            (e, aura if e != elem else True)
-            for e, aura in self._aura.items()
-        ))
+        return _AURAS[self._mask | _AURA_BITS[elem.value]]
 
     def contains(self, elem: Element) -> bool:
         """ :returns: `True` if `elem` is applied to the character. """
         assert elem in AURA_ELEMENTS
-        return self._aura[elem]
+        return bool(self._mask & _AURA_BITS[elem.value])
 
     def __contains__(self, elem: Element) -> bool:
         return self.contains(elem)
 
     def has_aura(self) -> bool:
         """ :returns: `True` if any element is applied. """
-        return any(self._aura.values())
+        return self._mask != 0
 
     def elem_auras(self) -> tuple[Element, ...]:
         """ :returns: a tuple of applied elements from highest priority to the lowest. """
-        return tuple(iter(self))
+        return _ELEMS_OF_MASK[self._mask]
 
     def consult_reaction(self, incoming_elem: Element) -> None | ReactionDetail:
         """
         :returns: ReactionDetail if `incoming_elem` triggers a reaction with
                   the current elements.
         """
-        return Reaction.consult_reaction_with_aura(self, incoming_elem)
+        return _REACTION_TABLE[self._mask][incoming_elem.value][0]
+
+    def react(self, incoming_elem: Element) -> tuple[None | ReactionDetail, ElementalAura]:
+        """
+        :returns: the ReactionDetail if `incoming_elem` triggers a reaction with
+                  the current elements, and the aura after being hit by
+                  `incoming_elem`. (the reacted element removed, or
+                  `incoming_elem` applied if no reaction and it is aurable)
+        """
+        return _REACTION_TABLE[self._mask][incoming_elem.value]
 
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         return list(chain.from_iterable([
-            (encoding_plan.encode_item(elem), 1 if self._aura[elem] else 0)
+            (encoding_plan.encode_item(elem), 1 if self.contains(elem) else 0)
             for elem in AURA_ELEMENTS
         ]))
 
     def __iter__(self) -> Iterator[Element]:
-        return (
-            elem
-            for elem, aura in self._aura.items()
-            if aura
-        )
+        return iter(_ELEMS_OF_MASK[self._mask])
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, ElementalAura):
             return False
-        return self._aura == other._aura
+        return self._mask == other._mask
 
     def __hash__(self) -> int:
-        return hash(self._aura)
+        return hash(self._mask)
+
+    def __reduce__(self):
+        return (ElementalAura._from_mask, (self._mask,))
 
     def __str__(self) -> str:
         return '[' + ','.join(map(
             lambda elem: elem.name, self.elem_auras()
         )) + ']'
+
+
+#: the bit of each aura element in the masks of ElementalAura, indexed by `Element.value`
+_AURA_BITS: tuple[int, ...] = tuple(
+    1 << AURA_ELEMENTS_ORDERED.index(elem) if elem in AURA_ELEMENTS else 0
+    for elem in Element
+)
+
+_NUM_AURA_MASKS = 1 << len(AURA_ELEMENTS_ORDERED)
+
+_ELEMS_OF_MASK: tuple[tuple[Element, ...], ...] = tuple(
+    tuple(elem for i, elem in enumerate(AURA_ELEMENTS_ORDERED) if mask & (1 << i))
+    for mask in range(_NUM_AURA_MASKS)
+)
+
+
+def _all_auras() -> tuple[ElementalAura, ...]:
+    auras = []
+    for mask in range(_NUM_AURA_MASKS):
+        aura = object.__new__(ElementalAura)
+        aura._mask = mask
+        auras.append(aura)
+    return tuple(auras)
+
+
+_AURAS: tuple[ElementalAura, ...] = _all_auras()
+
+
+def _reaction_of(first: Element, second: Element) -> None | Reaction:
+    for reaction in Reaction:
+        e1, e2 = reaction.value.reaction_elems
+        if (first in e1 and second in e2) or (first in e2 and second in e1):
+            return reaction
+    return None
+
+
+#: the reaction of (first element, second element), indexed by their `Element.value`
+_REACTION_OF_PAIR: tuple[tuple[None | Reaction, ...], ...] = tuple(
+    tuple(_reaction_of(first, second) for second in Element)
+    for first in Element
+)
+
+
+def _hit(
+        mask: int, incoming_elem: Element
+) -> tuple[None | ReactionDetail, ElementalAura]:
+    for elem in _ELEMS_OF_MASK[mask]:
+        reaction = _REACTION_OF_PAIR[elem.value][incoming_elem.value]
+        if reaction is not None:
+            return (
+                ReactionDetail(reaction, elem, incoming_elem),
+                _AURAS[mask & ~_AURA_BITS[elem.value]],
+            )
+    return None, _AURAS[mask | _AURA_BITS[incoming_elem.value]]
+
+
+#: the reaction and resulting aura of (aura mask, incoming element), indexed by
+#: the mask and `Element.value`
+_REACTION_TABLE: tuple[tuple[tuple[None | ReactionDetail, ElementalAura], ...], ...] = tuple(
+    tuple(_hit(mask, elem) for elem in Element)
+    for mask in range(_NUM_AURA_MASKS)
+)
@@ -0,0 +1,40 @@
+"""
+This file contains the memoization of encodings of immutable game objects.
+"""
+from functools import wraps
+from typing import Callable, TypeVar
+
+from ..helper.instance_cache import instance_cache
+
+__all__ = [
+    "cached_encoding",
+]
+
+
+_EncodingMethod = TypeVar("_EncodingMethod", bound=Callable[..., list[int]])
+
+
+def cached_encoding(encoding_method: _EncodingMethod) -> _EncodingMethod:
+    """
+    Decorates the `encoding()` method of an immutable class, so that each
+    instance is encoded only once per encoding plan and arguments.
+
+    As game states are rebuilt through factories that reuse every unchanged
+    substructure, encoding a new game state only encodes the parts that changed
+    since the last one. (`GameState` itself is not cached, as almost every
+    transition creates a new one)
+    """
+    @wraps(encoding_method)
+    def encoding(self, encoding_plan, *args, **kwargs) -> list[int]:
+        if kwargs:
+            return encoding_method(self, encoding_plan, *args, **kwargs)
+        # keyed by the plan, which differs per perspective, and the other arguments
+        cache = instance_cache(self)
+        key = (encoding_plan, *args)
+        ret_val = cache.get(key)
+        if ret_val is None:
+            ret_val = encoding_method(self, encoding_plan, *args)
+            cache[key] = ret_val
+        # callers are free to modify the list returned
+        return ret_val.copy()
+    return encoding  # type: ignore
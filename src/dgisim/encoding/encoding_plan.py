@@ -1,14 +1,19 @@
 import copy
 import itertools
+import random
 from enum import Enum
-from typing import cast, no_type_check, TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Any, Iterable, Union
 
 from typing_extensions import Self
 
+from ..helper.rng import using_rng
 from ..state.enums import Pid
 from .mappings import *
 
 if TYPE_CHECKING:
+    import numpy as np
+
+    from ..action.action import PlayerAction
     from ..card.card import Card
     from ..character.character import Character
     from ..effect.effect import Effect
@@ -31,8 +36,19 @@ GameItem = Union["Card", "Character", "Effect", "Mode", "Status", "Summon", "Sup
 GameItemType = type["Card"] | type["Character"] | type["Effect"] | type["Mode"] | type["Status"] | type["Summon"] | type["Support"]
 
 
+def _probe_game_state() -> "GameState":
+    """
+    :returns: a default game state to measure encodings with, made without
+              drawing from the caller's random number generator.
+    """
+    from ..state.game_state import GameState
+    with using_rng(random.Random(0)):
+        return GameState.from_default()
+
+
 class EncodingPlan:
     _flip_cache: None | Self = None
+    _split_cache: None | Self = None
 
     """
     This is the class for GameState encoding planning.
@@ -61,6 +77,8 @@ class EncodingPlan:
             supports_fixed_len: int = 4,
             effect_fixed_len: int = 25,
             effects_fixed_len: int = 40,
+            chars_fixed_len: int = 3,
+            split_static: bool = False,
             perspective: Pid = Pid.P1,
     ) -> None:
         """
@@ -82,6 +100,11 @@ class EncodingPlan:
         :param supports_fixed_len: the default fixed length of encoded supports vector.
         :param effect_fixed_len: the default fixed length of encoded effect vector.
         :param effects_fixed_len: the default fixed length of encoded effects vector.
+        :param chars_fixed_len: the maximum number of characters of a player.
+        :param split_static: if True, the parts of game states that never change
+                             in a game (the mode and the initial decks) are left
+                             out of the encoded game states, and are encoded
+                             separately by `encode_static()`.
         """
         self._enum_mapping = enum_mapping
         self._card_mapping = card_mapping
@@ -105,6 +128,8 @@ class EncodingPlan:
         self.SUPPORTS_FIXED_LEN = supports_fixed_len
         self.EFFECT_FIXED_LEN = effect_fixed_len
         self.EFFECTS_FIXED_LEN = effects_fixed_len
+        self.CHARS_FIXED_LEN = chars_fixed_len
+        self.SPLIT_STATIC = split_static
 
         from ..element import Element
         self.ACTION_LOCAL_SIZE = 5 + self.CARDS_FIXED_LEN
@@ -122,7 +147,8 @@ class EncodingPlan:
         from ..status.status import Status
         from ..summon.summon import Summon
         from ..support.support import Support
-        self._TYPED_MAPPING = {
+        # the mapping of each category, keyed by the base class of the category
+        self._TYPED_MAPPING: dict[type, dict[Any, int]] = {
             Enum: self._enum_mapping,
             Card: self._card_mapping,
             Character: self._char_mapping,
@@ -137,6 +163,69 @@ class EncodingPlan:
             assert isinstance(d, dict)
             for item, code in d.items():
                 self._id_item_mapping[code] = item  # type: ignore
+        self._code_table = self._build_code_table()
+        self._build_action_slots()
+
+    def _build_action_slots(self) -> None:
+        """
+        Lays out the slots of the action mask:
+
+        - 0: `EndRoundAction`
+        - 1, 2: `CardsSelectAction` selecting no cards / some cards
+        - 3, 4: `DiceSelectAction` selecting no dice / some dice
+        - then one slot per character of `CharacterSelectAction`, `SwapAction` and
+          `DeathSwapAction` each, one slot per `CharacterSkill` of `SkillAction`,
+          and one slot per card of `ElementalTuningAction` and `CardAction` each.
+        """
+        from ..action.action import (
+            CardAction, CharacterSelectAction, DeathSwapAction, ElementalTuningAction,
+            SkillAction, SwapAction,
+        )
+        from ..character.enums import CharacterSkill
+        self._card_slots: dict[type["Card"], int] = dict(
+            (card, i)
+            for i, card in enumerate(sorted(self._card_mapping, key=self._card_mapping.__getitem__))
+        )
+        self._action_slot_bases: dict[type["PlayerAction"], int] = {}
+        slot = 5
+        for action_type, num_slots in (
+                (CharacterSelectAction, self.CHARS_FIXED_LEN),
+                (SwapAction, self.CHARS_FIXED_LEN),
+                (DeathSwapAction, self.CHARS_FIXED_LEN),
+                (SkillAction, len(CharacterSkill)),
+                (ElementalTuningAction, len(self._card_slots)),
+                (CardAction, len(self._card_slots)),
+        ):
+            self._action_slot_bases[action_type] = slot
+            slot += num_slots
+        self._action_mask_size = slot
+
+    def _build_code_table(self) -> dict[GameItemType | Enum, int]:
+        """
+        :returns: a flat mapping from every enum member and item class to its
+                  code under the perspective of this plan.
+
+        A class is only included under the first category (in the order below)
+        it is a subclass of, the same category `encode_item()` always used.
+        """
+        from ..card.card import Card
+        from ..character.character import Character
+        from ..effect.effect import Effect
+        from ..mode import Mode
+        from ..status.status import Status
+        from ..summon.summon import Summon
+        from ..support.support import Support
+        categories: tuple[type, ...] = (Card, Summon, Support, Status, Effect, Character, Mode)
+        table: dict[GameItemType | Enum, int] = {}
+        for category in categories:
+            for item_type, code in self._TYPED_MAPPING[category].items():
+                if next(c for c in categories if issubclass(item_type, c)) is category:
+                    table[item_type] = code
+        for enum_item, code in self._enum_mapping.items():
+            if self._perspective is Pid.P2 and isinstance(enum_item, Pid):
+                enum_item = enum_item.other
+            table[enum_item] = code
+        return table
 
     def is_valid(self) -> bool:
         """
@@ -154,7 +243,6 @@ class EncodingPlan:
         all_vals_set = set(all_vals)
         return len(all_vals) == len(all_vals_set) and 0 not in all_vals_set
 
-    @no_type_check
     def encode_item(
             self,
             item: GameItem | GameItemType | Enum,
@@ -162,60 +250,14 @@ class EncodingPlan:
         """
         :returns: the code for the given item.
         """
-        from ..card.card import Card
-        from ..character.character import Character
-        from ..effect.effect import Effect
-        from ..mode import Mode
-        from ..status.status import Status
-        from ..summon.summon import Summon
-        from ..support.support import Support
-        _og_item = item
-        if isinstance(item, Enum):
-            item_category = Enum
-            if self._perspective is Pid.P2 and isinstance(item, Pid):
-                item = item.other
-        else:
-            if isinstance(item, Card):
-                item = type(item)
-            elif isinstance(item, Summon):
-                item = type(item)
-            elif isinstance(item, Support):
-                item = type(item)
-            elif isinstance(item, Status):
-                item = type(item)
-            elif isinstance(item, Effect):
-                item = type(item)
-            elif isinstance(item, Character):
-                item = type(item)
-            elif isinstance(item, Mode):
-                item = type(item)
-            assert issubclass(item, Card | Character | Effect | Mode | Status | Summon | Support)
-            if issubclass(item, Card):
-                item_category = Card
-            elif issubclass(item, Summon):
-                item_category = Summon
-            elif issubclass(item, Support):
-                item_category = Support
-            elif issubclass(item, Status):
-                item_category = Status
-            elif issubclass(item, Effect):
-                item_category = Effect
-            elif issubclass(item, Character):
-                item_category = Character
-            else:
-                assert issubclass(item, Mode), f"Unknown item type: {item}"
-                item_category = Mode
-        mapping = cast(
-            dict[GameItemType, int],
-            self._TYPED_MAPPING[item_category],
-        )
-        if item not in mapping:
-            # return -1
-            raise Exception(
-                f"Item has no code for {item} under category {item_category}; item was {_og_item}."
-            )
-        else:
-            return mapping[item]
+        # instances are looked up by their type, classes and enum members by
+        # themselves (their types, metaclasses or enum classes, never have codes)
+        code = self._code_table.get(type(item))  # type: ignore
+        if code is None:
+            code = self._code_table.get(item)  # type: ignore
+            if code is None:
+                raise Exception(f"Item has no code for {item}.")
+        return code
 
     def type_for(self, code: int) -> None | GameItemType:
         """
@@ -238,13 +280,103 @@ class EncodingPlan:
     def encode(self, game_state: "GameState", perspective: Pid) -> list[int]:
         return game_state.encoding(self, perspective)
 
+    def encode_static(self, game_state: "GameState", perspective: Pid) -> list[int]:
+        """
+        :returns: the encoding of the parts of `game_state` that never change in
+                  a game, see `GameState.static_encoding()`.
+        """
+        return game_state.static_encoding(self, perspective)
+
+    def encode_structured(
+            self,
+            game_state: "GameState",
+            perspective: Pid = Pid.P1,
+            fields: None | Iterable[str] = None,
+            out: None | dict[str, "np.ndarray"] = None,
+    ) -> dict[str, "np.ndarray"]:
+        """
+        :param fields: the fields to encode (see `structured_shapes()`), all
+                       fields of `out` if `out` is given, all fields otherwise.
+                       Fields not asked for are not encoded at all.
+        :param out: the buffers to fill in place, made by `structured_buffers()`.
+        :returns: the encoding of `game_state` as an int32 array per field,
+                  `out` itself if given.
+
+        Unlike `encode()`, each section of the game state is kept in its own
+        array with its own shape. e.g. `"characters"` is of the shape
+        `(2, CHARS_FIXED_LEN, size of a character)`, where the player of the
+        `perspective` comes first.
+
+        (requires the optional `numpy` dependency)
+        """
+        from .structured_encoding import encode_structured
+        return encode_structured(self, game_state, perspective, fields, out)
+
+    def structured_shapes(
+            self,
+            fields: None | Iterable[str] = None,
+    ) -> dict[str, tuple[int, ...]]:
+        """
+        :param fields: the fields wanted, all fields if None.
+        :returns: the shape of each field of `encode_structured()`.
+
+        The game fields are `"mode"`, `"basics"` and `"effect_stack"`. The player
+        fields, each with a leading dimension of 2, are `"player_basics"`,
+        `"dice"`, `"hand_cards"`, `"deck_cards"`, `"publicly_used_cards"`,
+        `"publicly_gained_cards"`, `"initial_deck"`, `"characters"`,
+        `"hidden_statuses"`, `"combat_statuses"`, `"summons"` and `"supports"`.
+        """
+        from .structured_encoding import structured_shapes
+        return structured_shapes(self, fields)
+
+    def structured_buffers(
+            self,
+            fields: None | Iterable[str] = None,
+            batch_shape: tuple[int, ...] = (),
+    ) -> dict[str, "np.ndarray"]:
+        """
+        :param fields: the fields wanted, all fields if None.
+        :param batch_shape: the leading dimensions of the buffers, e.g. `(num_envs,)`.
+        :returns: zeroed int32 arrays to be filled by `encode_structured()`.
+        """
+        from .structured_encoding import structured_buffers
+        return structured_buffers(self, fields, batch_shape)
+
+    def _derived_copy(self) -> Self:
+        """
+        :returns: a shallow copy of this plan without the plans derived from
+                  this one, which don't apply to the copy.
+        """
+        new_self = copy.copy(self)
+        new_self._flip_cache = None
+        new_self._split_cache = None
+        return new_self
+
+    def split_static_version(self) -> Self:
+        """
+        :returns: the same plan but with `split_static` enabled.
+        """
+        if self.SPLIT_STATIC:
+            return self
+        if self._split_cache is None:
+            new_self = self._derived_copy()
+            new_self.SPLIT_STATIC = True
+            self._split_cache = new_self
+        return self._split_cache
+
     @property
     def game_encoding_size(self) -> int:
         """
         :returns: the size of the vector of any encoded game state.
         """
-        from ..state.game_state import GameState
-        return len(GameState.from_default().encoding(self))
+        return len(_probe_game_state().encoding(self))
+
+    @property
+    def static_encoding_size(self) -> int:
+        """
+        :returns: the size of the vector of the static part of any game state.
+        """
+        return len(_probe_game_state().static_encoding(self))
 
     @property
     def action_encoding_size(self) -> int:
@@ -253,12 +385,50 @@ class EncodingPlan:
         """
         return self.ACTION_FULL_SIZE
 
+    @property
+    def action_mask_size(self) -> int:
+        """
+        :returns: the size of any action mask, see `GameState.action_mask()`.
+        """
+        return self._action_mask_size
+
+    def action_slot(self, action: "PlayerAction") -> int:
+        """
+        :returns: the slot of `action` in action masks.
+
+        Slots only tell actions apart by their type, character, skill and card.
+        Actions only differing in the dice paid or the targets chosen share the
+        same slot.
+        """
+        from ..action.action import (
+            CardAction, CardsSelectAction, CharacterSelectAction, DeathSwapAction,
+            DiceSelectAction, ElementalTuningAction, EndRoundAction, SkillAction,
+            SwapAction,
+        )
+        if isinstance(action, EndRoundAction):
+            return 0
+        elif isinstance(action, CardsSelectAction):
+            return 1 if action.selected_cards.empty() else 2
+        elif isinstance(action, DiceSelectAction):
+            return 3 if action.selected_dice.num_dice() == 0 else 4
+        base = self._action_slot_bases[type(action)]
+        if isinstance(action, (CharacterSelectAction, SwapAction, DeathSwapAction)):
+            assert 1 <= action.char_id <= self.CHARS_FIXED_LEN
+            return base + action.char_id - 1
+        elif isinstance(action, SkillAction):
+            return base + action.skill.value
+        elif isinstance(action, (ElementalTuningAction, CardAction)):
+            return base + self._card_slots[action.card]
+        raise NotImplementedError  # pragma: no cover
+
     def perspective_version(self, pid: Pid) -> Self:
         if self._perspective is pid:
             return self
         if self._flip_cache is None:
-            new_self = copy.copy(self)
+            new_self = self._derived_copy()
             new_self._perspective = pid
+            new_self._code_table = new_self._build_code_table()
+            new_self._flip_cache = self
             self._flip_cache = new_self
         return self._flip_cache
 
@@ -0,0 +1,223 @@
+"""
+This file contains the structured encoding of game states, which encodes each
+section of a game state into its own NumPy array, see
+`EncodingPlan.encode_structured()`.
+"""
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "Structured encoding requires numpy, which can be installed with `pip install dgisim[rl]`"
+    ) from e
+
+from ..helper.instance_cache import instance_cache
+from ..state.enums import Pid
+
+if TYPE_CHECKING:
+    from ..state.game_state import GameState
+    from ..state.player_state import PlayerState
+    from .encoding_plan import EncodingPlan
+
+__all__ = [
+    "GAME_FIELDS",
+    "PLAYER_FIELDS",
+    "STRUCTURED_FIELDS",
+    "encode_structured",
+    "structured_buffers",
+    "structured_shapes",
+]
+
+
+def _game_basics(game_state: "GameState", plan: "EncodingPlan") -> list[int]:
+    return [
+        plan.PHASE_BASE + game_state.mode.phase_code(game_state.phase),
+        game_state.round,
+        plan.encode_item(game_state.active_player_id),
+    ]
+
+
+def _player_basics(player: "PlayerState", plan: "EncodingPlan") -> list[int]:
+    return [
+        plan.encode_item(player.phase),
+        int(player.get_consec_action()),
+        player.card_redraw_chances,
+        player.dice_reroll_chances,
+    ]
+
+
+def _hidden_statuses(player: "PlayerState", plan: "EncodingPlan") -> list[int]:
+    return player.hidden_statuses.encoding(plan, plan.PLAYER_HIDDEN_FIXED_LEN)
+
+
+def _combat_statuses(player: "PlayerState", plan: "EncodingPlan") -> list[int]:
+    return player.combat_statuses.encoding(plan, plan.PLAYER_COMBAT_FIXED_LEN)
+
+
+#: the fields of the game, each an array of the shape given by `structured_shapes()`
+GAME_FIELDS: dict[str, Callable[["GameState", "EncodingPlan"], list[int]]] = {
+    "mode": lambda game_state, plan: [plan.encode_item(game_state.mode)],
+    "basics": _game_basics,
+    "effect_stack": lambda game_state, plan: game_state.effect_stack.encoding(plan),
+}
+
+#: the fields of the players, each an array of the shape `(2, ...)`, where the
+#: player of the perspective comes first
+PLAYER_FIELDS: dict[str, Callable[["PlayerState", "EncodingPlan"], list[int]]] = {
+    "player_basics": _player_basics,
+    "dice": lambda player, plan: player.dice.encoding(plan),
+    "hand_cards": lambda player, plan: player.hand_cards.encoding(plan),
+    "deck_cards": lambda player, plan: player.deck_cards.encoding(plan),
+    "publicly_used_cards": lambda player, plan: player.publicly_used_cards.encoding(plan),
+    "publicly_gained_cards": lambda player, plan: player.publicly_gained_cards.encoding(plan),
+    "initial_deck": lambda player, plan: player.initial_deck.encoding(plan),
+    "characters": lambda player, plan: player.characters.encoding(plan),
+    "hidden_statuses": _hidden_statuses,
+    "combat_statuses": _combat_statuses,
+    "summons": lambda player, plan: player.summons.encoding(plan),
+    "supports": lambda player, plan: player.supports.encoding(plan),
+}
+
+STRUCTURED_FIELDS: tuple[str, ...] = (*GAME_FIELDS, *PLAYER_FIELDS)
+
+
+def _field_shape(field: str, size: int, plan: "EncodingPlan") -> tuple[int, ...]:
+    """ :returns: the shape of one encoded `field` of `size` ints. """
+    num_items = {
+        "effect_stack": plan.EFFECTS_FIXED_LEN,
+        "characters": plan.CHARS_FIXED_LEN,
+        "hidden_statuses": plan.PLAYER_HIDDEN_FIXED_LEN,
+        "combat_statuses": plan.PLAYER_COMBAT_FIXED_LEN,
+        "summons": plan.SUMMONS_FIXED_LEN,
+        "supports": plan.SUPPORTS_FIXED_LEN,
+    }.get(field)
+    if num_items is None:
+        return (size,)
+    assert size % num_items == 0
+    return (num_items, size // num_items)
+
+
+def _check_fields(fields: Iterable[str]) -> tuple[str, ...]:
+    fields = tuple(fields)
+    for field in fields:
+        if field not in GAME_FIELDS and field not in PLAYER_FIELDS:
+            raise ValueError(f"unknown field {field!r}, valid fields are {STRUCTURED_FIELDS}")
+    return fields
+
+
+@lru_cache(maxsize=None)
+def _all_shapes(encoding_plan: "EncodingPlan") -> dict[str, tuple[int, ...]]:
+    from .encoding_plan import _probe_game_state
+    game_state = _probe_game_state()
+    shapes: dict[str, tuple[int, ...]] = {}
+    for field, encode_game_field in GAME_FIELDS.items():
+        size = len(encode_game_field(game_state, encoding_plan))
+        shapes[field] = _field_shape(field, size, encoding_plan)
+    for field, encode_player_field in PLAYER_FIELDS.items():
+        size = len(encode_player_field(game_state.player1, encoding_plan))
+        shapes[field] = (2, *_field_shape(field, size, encoding_plan))
+    return shapes
+
+
+def structured_shapes(
+        encoding_plan: "EncodingPlan",
+        fields: None | Iterable[str] = None,
+) -> dict[str, tuple[int, ...]]:
+    """
+    :param fields: the fields wanted, all fields if None.
+    :returns: the shape of the array of each field.
+    """
+    shapes = _all_shapes(encoding_plan)
+    if fields is None:
+        return dict(shapes)
+    return {field: shapes[field] for field in _check_fields(fields)}
+
+
+def structured_buffers(
+        encoding_plan: "EncodingPlan",
+        fields: None | Iterable[str] = None,
+        batch_shape: tuple[int, ...] = (),
+) -> dict[str, np.ndarray]:
+    """
+    :param fields: the fields wanted, all fields if None.
+    :param batch_shape: the leading dimensions of the buffers, e.g. `(num_envs,)`.
+    :returns: zeroed int32 arrays to be filled by `encode_structured()`.
+    """
+    return {
+        field: np.zeros((*batch_shape, *shape), dtype=np.int32)
+        for field, shape in structured_shapes(encoding_plan, fields).items()
+    }
+
+
+def encode_structured(
+        encoding_plan: "EncodingPlan",
+        game_state: "GameState",
+        perspective: Pid = Pid.P1,
+        fields: None | Iterable[str] = None,
+        out: None | dict[str, np.ndarray] = None,
+) -> dict[str, np.ndarray]:
+    """
+    :param fields: the fields to encode, all fields of `out` if `out` is given,
+                   all fields otherwise. Fields not asked for are not encoded at
+                   all.
+    :param out: the buffers to fill in place, made by `structured_buffers()`.
+    :returns: the encoded fields, `out` itself if given.
+    """
+    if fields is None:
+        fields = STRUCTURED_FIELDS if out is None else tuple(out)
+    else:
+        fields = _check_fields(fields)
+    if out is None:
+        out = structured_buffers(encoding_plan, fields)
+    plan = encoding_plan.perspective_version(perspective)
+    players = (game_state.get_player(perspective), game_state.get_player(perspective.other))
+    for field in fields:
+        buffer = out[field]
+        if field == "effect_stack":
+            _fill(buffer, _cached_array(game_state.effect_stack, plan, field, _encoding))
+        elif field in GAME_FIELDS:
+            _fill(buffer, GAME_FIELDS[field](game_state, plan))
+        else:
+            encode_field = PLAYER_FIELDS[field]
+            _fill(buffer[0], _cached_array(players[0], plan, field, encode_field))
+            _fill(buffer[1], _cached_array(players[1], plan, field, encode_field))
+    return out
+
+
+def _encoding(owner: Any, plan: "EncodingPlan") -> list[int]:
+    return owner.encoding(plan)
+
+
+def _cached_array(
+        owner: Any,
+        plan: "EncodingPlan",
+        field: str,
+        encode_field: Callable[[Any, "EncodingPlan"], list[int]],
+) -> np.ndarray:
+    """
+    :returns: the encoded `field` of the immutable `owner`, which is only
+              converted to an array once per plan, as unchanged player states
+              and effect stacks are shared by consecutive game states.
+    """
+    cache = instance_cache(owner)
+    key = (plan, field)
+    array = cache.get(key)
+    if array is None:
+        array = np.array(encode_field(owner, plan), dtype=np.int32)
+        array.flags.writeable = False
+        cache[key] = array
+    return array
+
+
+def _fill(buffer: np.ndarray, encoding: list[int] | np.ndarray) -> None:
+    if not buffer.flags.c_contiguous:
+        raise ValueError("buffers of structured encoding must be C-contiguous")
+    flat = buffer.reshape(-1)
+    if len(encoding) == flat.size:
+        flat[:] = encoding
+    else:
+        # e.g. a player with fewer characters than `CHARS_FIXED_LEN`
+        flat[:len(encoding)] = encoding
+        flat[len(encoding):] = 0
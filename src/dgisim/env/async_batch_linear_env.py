@@ -0,0 +1,408 @@
+import multiprocessing as mp
+import os
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.context import ForkContext, ForkServerContext, SpawnContext
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Sequence, cast
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "AsyncBatchLinearEnv requires numpy, which can be installed with `pip install dgisim[rl]`"
+    ) from e
+
+from ..action.action import PlayerAction
+from ..deck import Deck
+from ..encoding.encoding_plan import EncodingPlan, encoding_plan
+from ..mode import DefaultMode, Mode
+from ..state.enums import Pid
+from ..state.game_state import GameState
+from .batch_linear_env import BatchLinearEnv, env_seeds
+from .linear_env import real_reward
+
+__all__ = [
+    "AsyncBatchLinearEnv",
+]
+
+
+def _buffer_specs(num_envs: int, encoding_plan: EncodingPlan) -> dict[str, tuple[tuple[int, ...], Any]]:
+    """ :returns: the shape and dtype of each shared buffer. """
+    return {
+        "encoded_states": ((num_envs, encoding_plan.game_encoding_size), np.int32),
+        "rewards": ((num_envs,), np.float32),
+        "turns": ((num_envs,), np.int32),
+        "dones": ((num_envs,), np.bool_),
+        "actions": ((num_envs, encoding_plan.action_encoding_size), np.int32),
+    }
+
+
+def _worker(
+        conn: Connection,
+        shm_names: dict[str, str],
+        num_envs: int,
+        lo: int,
+        hi: int,
+        env_kwargs: dict[str, Any],
+        seeds: None | list[int],
+        return_states: bool,
+) -> None:
+    """
+    Runs the games `lo` to `hi` (exclusive) of the batch in a `BatchLinearEnv`
+    writing into the shared buffers, and executes commands from `conn` until
+    "close" is received.
+    """
+    shms: dict[str, SharedMemory] = {}
+    try:
+        specs = _buffer_specs(num_envs, env_kwargs["encoding_plan"])
+        shms = {
+            name: SharedMemory(name=shm_name)
+            for name, shm_name in shm_names.items()
+        }
+        views = {
+            name: np.ndarray(shape, dtype=dtype, buffer=shms[name].buf)[lo:hi]
+            for name, (shape, dtype) in specs.items()
+        }
+        env = BatchLinearEnv(hi - lo, seed=seeds, **env_kwargs)
+        env._use_buffers(
+            views["encoded_states"],
+            views["rewards"],
+            views["turns"],
+            views["dones"],
+        )
+        conn.send((True, env.view()[0] if return_states else None))
+    except BaseException:
+        conn.send((False, traceback.format_exc()))
+        conn.close()
+        return
+
+    try:
+        while True:
+            cmd, data = conn.recv()
+            try:
+                if cmd == "step":
+                    states = env.step(views["actions"] if data is None else data)[0]
+                elif cmd == "reset":
+                    states = env.reset()[0]
+                elif cmd == "reset_with_decks":
+                    states = env.reset_with_decks(*data)[0]
+                elif cmd == "final_states":
+                    conn.send((True, env.final_states()))
+                    continue
+                elif cmd == "static_encodings":
+                    conn.send((True, env.static_encodings(data)))
+                    continue
+                elif cmd == "close":
+                    conn.send((True, None))
+                    break
+                else:  # pragma: no cover
+                    raise ValueError(f"unknown command {cmd!r}")
+                conn.send((True, states if return_states else None))
+            except Exception:
+                conn.send((False, traceback.format_exc()))
+    except (EOFError, KeyboardInterrupt):  # pragma: no cover
+        pass
+    finally:
+        # the numpy views must be released before the blocks can be closed
+        del views, env
+        for shm in shms.values():
+            try:
+                shm.close()
+            except BufferError:  # pragma: no cover
+                pass
+        conn.close()
+
+
+class AsyncBatchLinearEnv:
+    """
+    A `BatchLinearEnv` whose games are sharded across worker processes, so that
+    simulation isn't bound to a single core by the GIL.
+
+    Workers write the encoded states, rewards, turns and dones straight into
+    shared memory, the arrays returned are views of the shared blocks, so
+    reading them involves no copying. Encoded actions are passed the same way.
+    Commands are sent to the workers over pipes, `step_async()` returns
+    immediately, so computation of the learner can overlap with the simulation
+    until `step_wait()` is called.
+
+    Game states are Python objects that must be pickled to leave a worker, so
+    they are only sent back if `return_states` is `True`, otherwise `None` is
+    returned in their place.
+
+    Call `close()` (or use the env as a context manager) to stop the workers and
+    free the shared memory.
+    """
+
+    def __init__(
+            self,
+            num_envs: int,
+            num_workers: None | int = None,
+            mode: Mode = DefaultMode(),
+            encoding_plan: EncodingPlan = encoding_plan,
+            reward_method: Callable[[GameState], int | float] = real_reward,
+            invalid_action_penalty: int | float = -0.1,
+            fix_perspective: bool = False,
+            seed: None | int = None,
+            return_states: bool = False,
+            start_method: None | str = None,
+    ):
+        """
+        :param num_envs: the number of games stepped per call.
+        :param num_workers: the number of worker processes, defaults to the number
+                            of cores. (capped at `num_envs`)
+        :param mode: the mode of the games.
+        :param encoding_plan: the encoding plan of the games.
+        :param reward_method: the reward method of the games.
+        :param invalid_action_penalty: the penalty for invalid action.
+        :param fix_perspective: see `LinearEnv`.
+        :param seed: if provided, the batch is reproducible and identical to a
+                     `BatchLinearEnv` of the same seed, regardless of `num_workers`.
+        :param return_states: set to `True` to get the game states from the workers.
+        :param start_method: the multiprocessing start method of the workers,
+                             defaults to the one of the platform.
+
+        `mode`, `encoding_plan` and `reward_method` are sent to the workers, so
+        they must be picklable. (e.g. a module level function as `reward_method`)
+        """
+        assert num_envs > 0
+        if num_workers is None:
+            num_workers = os.cpu_count() or 1
+        num_workers = max(1, min(num_workers, num_envs))
+        self._num_envs = num_envs
+        self._encoding_plan = encoding_plan
+        self._return_states = return_states
+        self._waiting = False
+        self._closed = False
+        self._states: None | list[GameState] = None
+        self._conns: list[Connection] = []
+        self._processes: list[Any] = []
+
+        self._shms: dict[str, SharedMemory] = {}
+        self._buffers: dict[str, np.ndarray] = {}
+        for name, (shape, dtype) in _buffer_specs(num_envs, encoding_plan).items():
+            shm = SharedMemory(
+                create=True,
+                size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize),
+            )
+            self._shms[name] = shm
+            self._buffers[name] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        shm_names = {name: shm.name for name, shm in self._shms.items()}
+
+        # contiguous shards of (almost) equal sizes
+        bounds = [num_envs * i // num_workers for i in range(num_workers + 1)]
+        self._shards = list(zip(bounds[:-1], bounds[1:]))
+        seeds = None if seed is None else env_seeds(num_envs, seed)
+        env_kwargs = {
+            "mode": mode,
+            "encoding_plan": encoding_plan,
+            "reward_method": reward_method,
+            "invalid_action_penalty": invalid_action_penalty,
+            "fix_perspective": fix_perspective,
+        }
+        ctx = cast(
+            SpawnContext | ForkServerContext | ForkContext, mp.get_context(start_method)
+        )
+        for lo, hi in self._shards:
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(
+                    child_conn,
+                    shm_names,
+                    num_envs,
+                    lo,
+                    hi,
+                    env_kwargs,
+                    None if seeds is None else seeds[lo:hi],
+                    return_states,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+        try:
+            self._receive_states()
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._processes)
+
+    def _receive(self) -> list[Any]:
+        results = []
+        errors = []
+        for conn in self._conns:
+            ok, payload = conn.recv()
+            if ok:
+                results.append(payload)
+            else:
+                errors.append(payload)
+        if errors:
+            raise RuntimeError("worker failed:\n" + "\n".join(errors))
+        return results
+
+    def _receive_states(self) -> None:
+        results = self._receive()
+        if self._return_states:
+            self._states = [state for states in results for state in states]
+
+    def _check_idle(self) -> None:
+        assert not self._closed, "env is closed"
+        assert not self._waiting, "step_wait() must be called after step_async()"
+
+    def _send_all(self, cmd: str, data: Any = None) -> None:
+        self._check_idle()
+        for conn in self._conns:
+            conn.send((cmd, data))
+
+    def view(self) -> tuple[None | list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :returns: game states (`None` unless `return_states`), encoded states,
+                  rewards, turns, dones
+
+        The arrays are views of the shared memory, see `BatchLinearEnv.view()`
+        for their shapes.
+        """
+        assert not self._waiting, "the shared buffers are being written by the workers"
+        return (
+            None if self._states is None else list(self._states),
+            self._buffers["encoded_states"],
+            self._buffers["rewards"],
+            self._buffers["turns"],
+            self._buffers["dones"],
+        )
+
+    def final_states(self) -> list[None | GameState]:
+        """
+        :returns: see `BatchLinearEnv.final_states()`. (always fetched from the
+                  workers, regardless of `return_states`)
+        """
+        self._send_all("final_states")
+        return [state for states in self._receive() for state in states]
+
+    def static_encodings(self, perspective: Pid = Pid.P1) -> np.ndarray:
+        """
+        :returns: see `BatchLinearEnv.static_encodings()`. (fetched from the
+                  workers)
+        """
+        self._send_all("static_encodings", perspective)
+        return np.concatenate(self._receive())
+
+    def reset(self) -> tuple[None | list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Repeats the last reset method of each game.
+
+        :returns: the same as `view()`.
+        """
+        self._send_all("reset")
+        self._receive_states()
+        return self.view()
+
+    def reset_with_decks(
+            self,
+            deck1: Deck,
+            deck2: Deck,
+    ) -> tuple[None | list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resets all games with the given decks. (also used by later auto-resets)
+
+        :returns: the same as `view()`.
+        """
+        self._send_all("reset_with_decks", (deck1, deck2))
+        self._receive_states()
+        return self.view()
+
+    def step_async(self, actions: np.ndarray | Sequence[list[int] | PlayerAction]) -> None:
+        """
+        Sends the actions to the workers and returns without waiting for them.
+
+        :param actions: see `BatchLinearEnv.step()`. An array of encoded actions is
+                        passed through shared memory, so it is the cheapest option.
+
+        The buffers returned by `view()` must not be read until `step_wait()`
+        returns.
+        """
+        if isinstance(actions, np.ndarray):
+            assert actions.shape == self._buffers["actions"].shape
+            self._check_idle()
+            self._buffers["actions"][:] = actions
+            for conn in self._conns:
+                conn.send(("step", None))
+        else:
+            assert len(actions) == self._num_envs
+            self._check_idle()
+            for conn, (lo, hi) in zip(self._conns, self._shards):
+                conn.send(("step", list(actions[lo:hi])))
+        self._waiting = True
+
+    def step_wait(self) -> tuple[None | list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Waits for the steps sent by `step_async()` to finish.
+
+        :returns: the same as `BatchLinearEnv.step()`, but the game states are
+                  `None` unless `return_states`.
+        """
+        assert self._waiting, "step_async() must be called before step_wait()"
+        self._waiting = False
+        self._receive_states()
+        return self.view()
+
+    def step(
+            self,
+            actions: np.ndarray | Sequence[list[int] | PlayerAction],
+    ) -> tuple[None | list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Equivalent to `step_async()` followed by `step_wait()`.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def close(self) -> None:
+        """
+        Stops the workers and frees the shared memory, the env cannot be used
+        afterwards.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        for conn in self._conns:
+            try:
+                if self._waiting:
+                    conn.recv()
+                conn.send(("close", None))
+                conn.recv()
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+            conn.close()
+        self._waiting = False
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():  # pragma: no cover
+                process.terminate()
+        self._buffers.clear()
+        for shm in self._shms.values():
+            try:
+                shm.close()
+            except BufferError:  # pragma: no cover
+                # arrays returned by view() are still referenced by the caller
+                pass
+            shm.unlink()
+
+    def __enter__(self) -> "AsyncBatchLinearEnv":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if hasattr(self, "_closed"):
+            self.close()
@@ -0,0 +1,262 @@
+from contextlib import nullcontext
+from random import Random
+from typing import Callable, ContextManager, Sequence
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover
+    raise ImportError(
+        "BatchLinearEnv requires numpy, which can be installed with `pip install dgisim[rl]`"
+    ) from e
+
+from ..action.action import PlayerAction
+from ..deck import Deck
+from ..encoding.encoding_plan import EncodingPlan, encoding_plan
+from ..helper.rng import using_rng
+from ..mode import DefaultMode, Mode
+from ..state.enums import Pid
+from ..state.game_state import GameState
+from .linear_env import LinearEnv, real_reward
+
+__all__ = [
+    "BatchLinearEnv",
+    "env_seeds",
+]
+
+
+def env_seeds(num_envs: int, seed: int) -> list[int]:
+    """
+    :returns: the seed of each game in a batch of `num_envs` games seeded with `seed`.
+    """
+    seed_stream = Random(seed)
+    return [seed_stream.getrandbits(32) for _ in range(num_envs)]
+
+
+class BatchLinearEnv:
+    """
+    A vectorized version of `LinearEnv` that steps `num_envs` games per call.
+
+    Encoded states, rewards, turns and dones are written into preallocated NumPy
+    buffers. `view()` and `step()` return these buffers directly (not copies),
+    so they are overwritten by the next call to `step()` or `reset()`.
+
+    A game that ends is reset automatically. In that case, the reward and done
+    of the finished game are reported, while the game state, encoded state and
+    turn are of the new game. The final state of the finished game can be got
+    from `final_states()`.
+    """
+
+    def __init__(
+            self,
+            num_envs: int,
+            mode: Mode = DefaultMode(),
+            encoding_plan: EncodingPlan = encoding_plan,
+            reward_method: Callable[[GameState], int | float] = real_reward,
+            invalid_action_penalty: int | float = -0.1,
+            fix_perspective: bool = False,
+            seed: None | int | Sequence[int] = None,
+    ):
+        """
+        :param num_envs: the number of games stepped per call.
+        :param mode: the mode of the games.
+        :param encoding_plan: the encoding plan of the games.
+        :param reward_method: the reward method of the games.
+        :param invalid_action_penalty: the penalty for invalid action.
+        :param fix_perspective: see `LinearEnv`.
+        :param seed: if provided, each game draws from its own generator, making
+                     the whole batch reproducible. It is either the seed of the
+                     batch, or one seed for each game. (see `env_seeds()`)
+        """
+        assert num_envs > 0
+        self._num_envs = num_envs
+        self._encoding_plan = encoding_plan
+        self._rngs: None | list[Random] = None
+        if seed is not None:
+            seeds = env_seeds(num_envs, seed) if isinstance(seed, int) else list(seed)
+            assert len(seeds) == num_envs
+            self._rngs = [Random(env_seed) for env_seed in seeds]
+        self._envs: list[LinearEnv] = []
+        for i in range(num_envs):
+            with self._rng_context(i):
+                self._envs.append(LinearEnv(
+                    mode=mode,
+                    encoding_plan=encoding_plan,
+                    reward_method=reward_method,
+                    invalid_action_penalty=invalid_action_penalty,
+                    fix_perspective=fix_perspective,
+                ))
+
+        self._states: list[GameState] = [env.full_view() for env in self._envs]
+        self._final_states: list[None | GameState] = [None] * num_envs
+        self._encoded_states = np.zeros(
+            (num_envs, encoding_plan.game_encoding_size),
+            dtype=np.int32,
+        )
+        self._rewards = np.zeros(num_envs, dtype=np.float32)
+        self._turns = np.zeros(num_envs, dtype=np.int32)
+        self._dones = np.zeros(num_envs, dtype=np.bool_)
+        for i in range(num_envs):
+            self._view(i)
+
+    @property
+    def num_envs(self) -> int:
+        return self._num_envs
+
+    @property
+    def envs(self) -> tuple[LinearEnv, ...]:
+        """ :returns: the underlying environments. """
+        return tuple(self._envs)
+
+    def _rng_context(self, i: int) -> ContextManager:
+        if self._rngs is None:
+            return nullcontext()
+        return using_rng(self._rngs[i])
+
+    def _use_buffers(
+            self,
+            encoded_states: np.ndarray,
+            rewards: np.ndarray,
+            turns: np.ndarray,
+            dones: np.ndarray,
+    ) -> None:
+        """
+        Makes this env write into the given arrays (e.g. views of shared memory)
+        from now on, the current content is copied over.
+        """
+        encoded_states[:] = self._encoded_states
+        rewards[:] = self._rewards
+        turns[:] = self._turns
+        dones[:] = self._dones
+        self._encoded_states = encoded_states
+        self._rewards = rewards
+        self._turns = turns
+        self._dones = dones
+
+    def _write(self, i: int, state: GameState, encoded_state: list[int], turn: int) -> None:
+        self._states[i] = state
+        if encoded_state:  # a LazyEncodingPlan doesn't encode anything
+            self._encoded_states[i] = encoded_state
+        self._turns[i] = turn
+
+    def _view(self, i: int) -> None:
+        state, encoded_state, _, turn, done = self._envs[i].view()
+        self._write(i, state, encoded_state, turn)
+        self._rewards[i] = 0
+        self._dones[i] = done
+
+    def view(self) -> tuple[list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :returns: game states, encoded states, rewards, turns, dones
+
+        The encoded states is an int32 array of shape (num_envs, game_encoding_size),
+        the others are arrays of shape (num_envs,).
+        """
+        return (
+            list(self._states),
+            self._encoded_states,
+            self._rewards,
+            self._turns,
+            self._dones,
+        )
+
+    def static_encodings(self, perspective: Pid = Pid.P1) -> np.ndarray:
+        """
+        :returns: the encoded mode and decks of the current game of each env, see
+                  `LinearEnv.static_encoding()`, as an int32 array of shape
+                  (num_envs, static_encoding_size).
+
+        With an encoding plan that has `split_static`, these only change when a
+        game is reset, so they are only needed at the start and when games are
+        done.
+        """
+        return np.array(
+            [env.static_encoding(perspective) for env in self._envs],
+            dtype=np.int32,
+        )
+
+    def final_states(self) -> list[None | GameState]:
+        """
+        :returns: for each game, the final state of the game that was ended and
+                  reset in the last `step()`, `None` if it wasn't.
+        """
+        return list(self._final_states)
+
+    def reset(self) -> tuple[list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Repeats the last reset method of each game.
+
+        :returns: the same as `view()`.
+        """
+        for i, env in enumerate(self._envs):
+            with self._rng_context(i):
+                env.reset()
+            self._final_states[i] = None
+            self._view(i)
+        return self.view()
+
+    def reset_with_decks(
+            self,
+            deck1: Deck,
+            deck2: Deck,
+    ) -> tuple[list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Resets all games with the given decks. (also used by later auto-resets)
+
+        :returns: the same as `view()`.
+        """
+        for i, env in enumerate(self._envs):
+            with self._rng_context(i):
+                env.reset_with_decks(deck1, deck2)
+            self._final_states[i] = None
+            self._view(i)
+        return self.view()
+
+    def decode_actions(self, encoded_actions: np.ndarray) -> list[None | PlayerAction]:
+        """
+        :param encoded_actions: an array of shape (num_envs, action_encoding_size).
+        :returns: the decoded actions, `None` for any invalid encoding.
+        """
+        assert encoded_actions.shape == (self._num_envs, self._encoding_plan.action_encoding_size)
+        return [
+            PlayerAction.decoding(encoded_action, self._encoding_plan)
+            for encoded_action in encoded_actions.tolist()
+        ]
+
+    def step(
+            self,
+            actions: np.ndarray | Sequence[list[int] | PlayerAction],
+    ) -> tuple[list[GameState], np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        :param actions: one action for each game. Either an array of encoded
+                        actions of shape (num_envs, action_encoding_size), or a
+                        sequence of encoded actions or `PlayerAction` objects.
+
+        :returns: the same as `view()`, see the class documentation for the
+                  behaviour on game ends.
+        """
+        step_actions: Sequence[list[int] | PlayerAction]
+        if isinstance(actions, np.ndarray):
+            # invalid encodings are passed as they are, so that LinearEnv penalises them
+            step_actions = [
+                encoded_action if action is None else action
+                for action, encoded_action in zip(
+                    self.decode_actions(actions),
+                    actions.tolist(),
+                )
+            ]
+        else:
+            step_actions = actions
+        assert len(step_actions) == self._num_envs
+
+        for i, (env, action) in enumerate(zip(self._envs, step_actions)):
+            with self._rng_context(i):
+                state, encoded_state, reward, turn, done = env.step(action)
+                self._final_states[i] = None
+                if done:
+                    self._final_states[i] = state
+                    env.reset()
+                    state, encoded_state, _, turn, _ = env.view()
+            self._write(i, state, encoded_state, turn)
+            self._rewards[i] = reward
+            self._dones[i] = done
+        return self.view()
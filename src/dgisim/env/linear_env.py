@@ -46,6 +46,7 @@ class LinearEnv:
         self._last_deck1: None | Deck = None
         self._last_deck2: None | Deck = None
         self._curr_state: GameState
+        self._static_encodings: dict[Pid, list[int]] = {}
         self._last_reset: Callable[[], None] = self._reset_random
         self._fix_perspective = fix_perspective
         self.reset()
@@ -58,6 +59,7 @@ class LinearEnv:
         Repeats the last reset method.
         """
         self._last_reset()
+        self._static_encodings = {}
         while self._curr_state.waiting_for() is None and not self._curr_state.game_end():
             self._curr_state = self._curr_state.step()
 
@@ -85,6 +87,20 @@ class LinearEnv:
         assert self._last_deck2 is not None
         self._curr_state = GameState.from_decks(self._mode, self._last_deck1, self._last_deck2)
 
+    def static_encoding(self, perspective: Pid = Pid.P1) -> list[int]:
+        """
+        :returns: the encoded mode and decks of the current game in the
+                  perspective of `perspective`, which are left out of the
+                  encoded states if the encoding plan has `split_static`.
+
+        The encoding is computed once per game.
+        """
+        encoding = self._static_encodings.get(perspective)
+        if encoding is None:
+            encoding = self._encoding_plan.encode_static(self._curr_state, perspective)
+            self._static_encodings[perspective] = encoding
+        return encoding.copy()
+
     def full_view(self) -> GameState:
         """
         :returns: the game state without any perspective (all cards & dice visible).
@@ -213,5 +229,6 @@ class LinearEnv:
         new_self._last_deck1 = self._last_deck1
         new_self._last_deck2 = self._last_deck2
         new_self._curr_state = self._curr_state
+        new_self._static_encodings = dict(self._static_encodings)
         new_self._last_reset = self._last_reset
         return new_self
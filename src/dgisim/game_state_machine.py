@@ -1,5 +1,6 @@
 import random
-from typing import Callable, Optional
+from bisect import bisect_right
+from typing import Callable, Iterator, Optional, cast
 
 from .action.action import PlayerAction
 from .helper.level_print import GamePrinter
@@ -25,6 +26,12 @@ class GameStateMachine:
 
     (A linear game is the game where once decisions are made, other branches
     of possibilities are no longer available to explore (via this class).)
+
+    With `compact_history`, only the game states at which players are asked for
+    actions are stored, together with the seed of each transition. Any other
+    game state of the history is rebuilt on demand by replaying the transitions
+    from the nearest stored one. Agents then get the history of their own
+    decision points only (in their perspectives) instead of the complete history.
     """
 
     def __init__(
@@ -33,19 +40,45 @@ class GameStateMachine:
             agent1: PlayerAgent,
             agent2: PlayerAgent,
             seed: int | float | None = None,
+            compact_history: bool = False,
     ):
+        """
+        :param game_state: the initial game state.
+        :param agent1: the agent of player 1.
+        :param agent2: the agent of player 2.
+        :param seed: the seed of the random transitions, a random one if `None`.
+        :param compact_history: set to `True` to store the game states at the
+                                decision points only. (see class documentation)
+        """
+        self._compact_history = compact_history
+        # all game states, or the ones at the indices of _checkpoint_indices
+        # if the history is compact
         self._history = [game_state]
+        self._checkpoint_indices: list[int] = [0]
+        self._num_states = 1
+        # the seed of each (successful) transition, to replay a compact history
+        self._transition_seeds: list[int | float] = []
         self._seeds: list[int | float] = []
+        # perspective views are only computed when agents ask for them
         self._perspective_history: dict[Pid, list[GameState]] = {
-            Pid.P1: [game_state.perspective_view(Pid.P1)],
-            Pid.P2: [game_state.perspective_view(Pid.P2)],
+            Pid.P1: [],
+            Pid.P2: [],
+        }
+        self._perspective_indices: dict[Pid, int] = {
+            Pid.P1: -1,
+            Pid.P2: -1,
         }
         self._action_history: list[int] = []
         self._actions: dict[int, PlayerAction] = {}
+        # the number of illegal actions made at each index, each consumed a seed
+        self._failed_attempts: dict[int, int] = {}
         self._game_state = game_state
         self._player_agent1 = agent1
         self._player_agent2 = agent2
-        self._seed = seed if seed is not None else random.random()
+        # a private seed stream, so that a seeded machine is fully reproducible
+        # without disturbing (or being disturbed by) the global random module
+        self._seed_stream = random.Random(seed)
+        self._seed = seed if seed is not None else self._seed_stream.random()
 
     @classmethod
     def from_default(cls, agent1: PlayerAgent, agent2: PlayerAgent):
@@ -55,7 +88,9 @@ class GameStateMachine:
         """
         :returns: the complete history of past game states in chronological order.
         """
-        return tuple(self._history)
+        if not self._compact_history:
+            return tuple(self._history)
+        return tuple(self._replay(0, self.latest_index()))
 
     def get_seeds(self) -> tuple[int | float, ...]:
         return tuple(self._seeds)
@@ -68,7 +103,17 @@ class GameStateMachine:
         :returns: the history of past game states that are just before action making
                   in chronological order.
         """
-        return tuple([self._history[i] for i in self._action_history])
+        return tuple([self.get_game_state_at(i) for i in self._action_history])
+
+    def get_actions(self) -> tuple[tuple[Pid, PlayerAction], ...]:
+        """
+        :returns: all actions made so far in chronological order, each paired with
+                  the `Pid` of the player who made it.
+        """
+        return tuple(
+            (cast(Pid, self.get_game_state_at(i).waiting_for()), self._actions[i])
+            for i in self._action_history
+        )
 
     def get_last_action(self) -> Optional[PlayerAction]:
         if self._action_history:
@@ -87,13 +132,13 @@ class GameStateMachine:
         return self._game_state
 
     def curr_index(self) -> int:
-        return len(self._history) - 1
+        return self._num_states - 1
 
     def is_latest_index(self, index: int) -> bool:
         return index == self.latest_index()
 
     def latest_index(self) -> int:
-        return len(self._history) - 1
+        return self._num_states - 1
 
     def prev_action_index(self, index: int) -> int:
         if not self._action_history:
@@ -118,6 +163,13 @@ class GameStateMachine:
     def action_at(self, index: int) -> Optional[PlayerAction]:
         return self._actions.get(index, None)
 
+    def failed_attempts_at(self, index: int) -> int:
+        """
+        :returns: the number of illegal actions made at `index`, each of which
+                  consumed a seed. (see `get_seeds()`)
+        """
+        return self._failed_attempts.get(index, 0)
+
     def prev_index(self, index: int) -> int:
         return max(0, index - 1)
 
@@ -125,38 +177,106 @@ class GameStateMachine:
         return min(self.latest_index(), index + 1)
 
     def get_game_state_at(self, index: int) -> GameState:
-        return self._history[index]
+        if not self._compact_history:
+            return self._history[index]
+        if index < 0:
+            index += self._num_states
+        if not 0 <= index < self._num_states:
+            raise IndexError(f"game state index {index} out of range")
+        if index == self.latest_index():
+            return self._game_state
+        return next(self._replay(index, index))
+
+    def _replay(self, start: int, stop: int) -> Iterator[GameState]:
+        """
+        :returns: the game states from index `start` to `stop` (inclusive) of a
+                  compact history, replayed from the nearest stored game state.
+        """
+        pos = bisect_right(self._checkpoint_indices, start) - 1
+        index = self._checkpoint_indices[pos]
+        game_state = self._history[pos]
+        while True:
+            if index >= start:
+                yield game_state
+            if index == stop:
+                return
+            if pos + 1 < len(self._checkpoint_indices) \
+                    and self._checkpoint_indices[pos + 1] == index + 1:
+                pos += 1
+                game_state = self._history[pos]
+            elif index + 1 == self.latest_index():
+                game_state = self._game_state
+            else:
+                seed = self._transition_seeds[index]
+                action = self._actions.get(index)
+                if action is None:
+                    game_state = game_state.step(seed=seed)
+                else:
+                    next_state = game_state.action_step(
+                        cast(Pid, game_state.waiting_for()), action, seed=seed
+                    )
+                    assert next_state is not None
+                    game_state = next_state
+            index += 1
+
+    def _append_history(self, game_state: GameState, seed: int | float) -> None:
+        self._num_states += 1
+        if self._compact_history:
+            self._transition_seeds.append(seed)
+        else:
+            self._history.append(game_state)
 
-    def _append_history(self, game_state: GameState) -> None:
-        self._history.append(self._game_state)
-        self._perspective_history[Pid.P1].append(self._game_state.perspective_view(Pid.P1))
-        self._perspective_history[Pid.P2].append(self._game_state.perspective_view(Pid.P2))
+    def _add_checkpoint(self) -> None:
+        """ Stores the latest game state in a compact history. """
+        index = self.latest_index()
+        if self._compact_history and self._checkpoint_indices[-1] != index:
+            self._checkpoint_indices.append(index)
+            self._history.append(self._game_state)
+
+    def _perspective_history_of(self, pid: Pid) -> list[GameState]:
+        """
+        :returns: the history in the perspective of `pid` given to its agent,
+                  which only has the decision points of `pid` if the history
+                  is compact.
+        """
+        views = self._perspective_history[pid]
+        if self._compact_history:
+            index = self.latest_index()
+            if self._perspective_indices[pid] != index:
+                self._perspective_indices[pid] = index
+                views.append(self._game_state.perspective_view(pid))
+        else:
+            for game_state in self._history[len(views):]:
+                views.append(game_state.perspective_view(pid))
+        return views
 
     def _step(self, observe=False) -> None:
-        self._game_state = self._game_state.step(seed=self._seed)
-        self._seeds.append(self._seed)
-        random.seed()
-        self._seed = random.random()
+        seed = self._seed
+        self._game_state = self._game_state.step(seed=seed)
+        self._seeds.append(seed)
+        self._seed = self._seed_stream.random()
         if observe:
             print(GamePrinter.dict_game_printer(self._game_state.dict_str()))
             input(":> ")
-        self._append_history(self._game_state)
+        self._append_history(self._game_state, seed)
 
     def _action_step(self, pid: Pid, action: PlayerAction, observe=False) -> bool:
-        next_state = self._game_state.action_step(pid, action, seed=self._seed)
-        self._seeds.append(self._seed)
-        random.seed()
-        self._seed = random.random()
+        seed = self._seed
+        next_state = self._game_state.action_step(pid, action, seed=seed)
+        self._seeds.append(seed)
+        self._seed = self._seed_stream.random()
         if next_state is None:
+            index = self.latest_index()
+            self._failed_attempts[index] = self._failed_attempts.get(index, 0) + 1
             return False
-        action_idx = len(self._history) - 1
+        action_idx = self.latest_index()
         self._action_history.append(action_idx)
         self._actions[action_idx] = action
         self._game_state = next_state
         if observe:
             print(GamePrinter.dict_game_printer(self._game_state.dict_str()))
             input(":> ")
-        self._append_history(self._game_state)
+        self._append_history(self._game_state, seed)
         return True
 
     def step_until_phase(self, phase: type[Phase] | Phase, observe=False) -> None:
@@ -207,11 +327,15 @@ class GameStateMachine:
         if pid is None:
             self._step(observe=observe)
         else:
+            self._add_checkpoint()
             patience = 5
             while patience > 0 \
                     and not self._action_step(
                         pid,
-                        self.player_agent(pid).choose_action(self._perspective_history[pid], pid),
+                        self.player_agent(pid).choose_action(
+                            self._perspective_history_of(pid),
+                            pid,
+                        ),
                         observe=observe,
                     ):
                 patience -= 1
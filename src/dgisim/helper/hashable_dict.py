@@ -1,4 +1,5 @@
 from __future__ import annotations
+from itertools import chain
 from typing import Any, Mapping, TypeVar
 
 from typing_extensions import Self
@@ -84,14 +85,15 @@ class HashableDict(dict, Mapping[_T, _U]):
 
     def __add__(self, other: dict[_T, int]):
         """ should only be used if the value is int, otherwise good luck """
-        keys = set(self.keys()).union(other.keys())
+        # keys are kept in a deterministic order, as the order affects random picks
+        keys = dict.fromkeys(chain(self.keys(), other.keys()))
         return HashableDict(
             ((key, self.get(key, 0) + other.get(key, 0)) for key in keys)
         )
 
     def __sub__(self, other: dict[_T, int]):
         """ should only be used if the value is int, otherwise good luck """
-        keys = set(self.keys()).union(other.keys())
+        keys = dict.fromkeys(chain(self.keys(), other.keys()))
         return HashableDict(
             ((key, self.get(key, 0) - other.get(key, 0)) for key in keys)
         )
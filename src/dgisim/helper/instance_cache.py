@@ -0,0 +1,106 @@
+"""
+This file contains the per-instance caches of values derived from immutable
+objects, e.g. hashes and encodings.
+"""
+from functools import wraps
+from typing import Any, Callable, TypeVar
+
+__all__ = [
+    "InstanceCache",
+    "cached_hash",
+    "cached_method",
+    "instance_cache",
+    "known_hashes_differ",
+]
+
+
+_CACHE_ATTR = "_instance_cache"
+
+_HASH_KEY = "__hash__"
+
+
+class InstanceCache(dict):
+    """
+    The values derived from an immutable object, stored on the object itself.
+
+    The cache is emptied when its owner is pickled or deep-copied, as its values
+    may not be valid in another process. (e.g. hashes of classes and enums)
+
+    Classes with `__slots__` must declare an `_instance_cache` slot to be cached.
+    """
+
+    def __reduce__(self):
+        return (InstanceCache, ())
+
+
+def instance_cache(obj: Any) -> InstanceCache:
+    """
+    :returns: the cache of `obj`, which is created if `obj` doesn't have one yet.
+    """
+    cache = getattr(obj, _CACHE_ATTR, None)
+    if cache is None:
+        cache = InstanceCache()
+        # bypasses __setattr__() of frozen dataclasses
+        object.__setattr__(obj, _CACHE_ATTR, cache)
+    return cache
+
+
+def cached_hash(hash_method: Callable[[Any], int]) -> Callable[[Any], int]:
+    """
+    Decorates the `__hash__()` method of an immutable class, so that the hash
+    of each instance is only computed once.
+    """
+    @wraps(hash_method)
+    def __hash__(self) -> int:
+        cache = getattr(self, _CACHE_ATTR, None)
+        if cache is None:
+            cache = instance_cache(self)
+        else:
+            hash_val = cache.get(_HASH_KEY)
+            if hash_val is not None:
+                return hash_val
+        hash_val = hash_method(self)
+        cache[_HASH_KEY] = hash_val
+        return hash_val
+    return __hash__
+
+
+_Method = TypeVar("_Method", bound=Callable[..., Any])
+
+
+def cached_method(method: _Method) -> _Method:
+    """
+    Decorates a method of an immutable class taking hashable positional
+    arguments, so that it is only computed once per instance and arguments.
+
+    The returned value is shared, so it should be immutable as well.
+    """
+    name = method.__name__
+
+    @wraps(method)
+    def cached(self, *args):
+        cache = instance_cache(self)
+        key = (name, *args)
+        try:
+            return cache[key]
+        except KeyError:
+            ret_val = method(self, *args)
+            cache[key] = ret_val
+            return ret_val
+    return cached  # type: ignore
+
+
+def known_hashes_differ(obj1: Any, obj2: Any) -> bool:
+    """
+    :returns: True if the hashes of both objects are cached and are different,
+              in which case the objects cannot be equal.
+    """
+    cache1 = getattr(obj1, _CACHE_ATTR, None)
+    if cache1 is None:
+        return False
+    cache2 = getattr(obj2, _CACHE_ATTR, None)
+    if cache2 is None:
+        return False
+    hash1 = cache1.get(_HASH_KEY)
+    hash2 = cache2.get(_HASH_KEY)
+    return hash1 is not None and hash2 is not None and hash1 != hash2
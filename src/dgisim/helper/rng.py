@@ -0,0 +1,45 @@
+from __future__ import annotations
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+__all__ = [
+    "current_rng",
+    "using_rng",
+]
+
+# the instance behind the module level functions of `random`
+_GLOBAL_RNG: random.Random = random._inst  # type: ignore
+
+_CURRENT_RNG: ContextVar[None | random.Random] = ContextVar("_CURRENT_RNG", default=None)
+
+
+def current_rng() -> random.Random:
+    """
+    :returns: the random number generator of the game being simulated in the
+              current context. If there isn't one, the generator behind the
+              global `random` module is returned.
+
+    All random values drawn by the game (dice rolling, card drawing, random
+    effects...) come from this generator.
+    """
+    rng = _CURRENT_RNG.get()
+    if rng is None:
+        return _GLOBAL_RNG
+    return rng
+
+
+@contextmanager
+def using_rng(rng: random.Random) -> Iterator[random.Random]:
+    """
+    Makes `rng` the generator returned by `current_rng()` within the with-block.
+
+    The generator is stored in a context variable, so games simulated side by
+    side in different threads or asyncio tasks never share a generator.
+    """
+    token = _CURRENT_RNG.set(rng)
+    try:
+        yield rng
+    finally:
+        _CURRENT_RNG.reset(token)
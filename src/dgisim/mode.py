@@ -70,25 +70,29 @@ class Mode(ABC):
 
     def partially_valid_deck(self, deck: Deck) -> bool:
         from collections import Counter
+        all_chars = self.all_chars()
+        all_cards = self.all_cards()
         return (
             len(deck.chars) <= self.deck_chars_requirement()
             and sum(deck.cards.values()) <= self.deck_cards_requirement()
             and Counter(deck.chars).most_common(1)[0][1] <= self.deck_char_limit_per_kind()
             and max(deck.cards.values()) <= self.deck_card_limit_per_kind()
-            and all(char in self.all_chars() for char in deck.chars)
-            and all(card in self.all_cards() for card in deck.cards)
+            and all(char in all_chars for char in deck.chars)
+            and all(card in all_cards for card in deck.cards)
             and all(card.valid_in_deck(deck) for card in deck.cards)
         )
 
     def valid_deck(self, deck: Deck) -> bool:
         from collections import Counter
+        all_chars = self.all_chars()
+        all_cards = self.all_cards()
         return (
             len(deck.chars) == self.deck_chars_requirement()
             and sum(deck.cards.values()) == self.deck_cards_requirement()
             and Counter(deck.chars).most_common(1)[0][1] <= self.deck_char_limit_per_kind()
             and max(deck.cards.values()) <= self.deck_card_limit_per_kind()
-            and all(char in self.all_chars() for char in deck.chars)
-            and all(card in self.all_cards() for card in deck.cards)
+            and all(char in all_chars for char in deck.chars)
+            and all(card in all_cards for card in deck.cards)
             and all(card.valid_in_deck(deck) for card in deck.cards)
         )
 
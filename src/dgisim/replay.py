@@ -0,0 +1,352 @@
+"""
+This file contains a compact binary format of games, which only stores what is
+needed to re-simulate a game: the mode, the decks, the seeds and the actions.
+"""
+import random
+import struct
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Sequence
+
+from .action.action import PlayerAction
+from .deck import FrozenDeck
+from .encoding.encoding_plan import EncodingPlan, encoding_plan
+from .game_state_machine import GameStateMachine
+from .mode import Mode
+from .state.game_state import GameState
+
+__all__ = [
+    "Replay",
+    "ReplayReader",
+    "ReplayWriter",
+]
+
+
+_VERSION = 1
+
+# flags
+_DERIVED_SEEDS = 1
+
+# seed tags
+_INT_SEED = 0
+_FLOAT_SEED = 1
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _write_uint(buf: bytearray, n: int) -> None:
+    """ Appends `n` as a LEB128 varint. """
+    assert n >= 0
+    while n >= 0x80:
+        buf.append((n & 0x7F) | 0x80)
+        n >>= 7
+    buf.append(n)
+
+
+def _read_uint(data: memoryview, pos: int) -> tuple[int, int]:
+    """ :returns: the varint at `pos`, and the position after it. """
+    n = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _write_int(buf: bytearray, n: int) -> None:
+    """ Appends `n` as a zigzag varint. """
+    _write_uint(buf, (n << 1) if n >= 0 else ((-n << 1) - 1))
+
+
+def _read_int(data: memoryview, pos: int) -> tuple[int, int]:
+    n, pos = _read_uint(data, pos)
+    return (n >> 1) if not n & 1 else -((n + 1) >> 1), pos
+
+
+def _write_ints(buf: bytearray, ints: Sequence[int]) -> None:
+    """ Appends the mostly zero `ints` as pairs of (gap, value) of the non-zeros. """
+    non_zeros = [(i, n) for i, n in enumerate(ints) if n != 0]
+    _write_uint(buf, len(non_zeros))
+    last = -1
+    for i, n in non_zeros:
+        _write_uint(buf, i - last - 1)
+        _write_int(buf, n)
+        last = i
+
+
+def _read_ints(data: memoryview, pos: int, size: int) -> tuple[list[int], int]:
+    ints = [0] * size
+    num_non_zeros, pos = _read_uint(data, pos)
+    i = -1
+    for _ in range(num_non_zeros):
+        gap, pos = _read_uint(data, pos)
+        i += gap + 1
+        ints[i], pos = _read_int(data, pos)
+    return ints, pos
+
+
+def _write_seed(buf: bytearray, seed: int | float) -> None:
+    if isinstance(seed, int):
+        buf.append(_INT_SEED)
+        _write_int(buf, seed)
+    else:
+        buf.append(_FLOAT_SEED)
+        buf += _DOUBLE.pack(seed)
+
+
+def _read_seed(data: memoryview, pos: int) -> tuple[int | float, int]:
+    tag = data[pos]
+    pos += 1
+    if tag == _INT_SEED:
+        return _read_int(data, pos)
+    elif tag == _FLOAT_SEED:
+        return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+    raise ValueError(f"unknown seed tag {tag}")
+
+
+def _derived_seeds(seed: int | float, num: int) -> list[int | float]:
+    """
+    :returns: the first `num` seeds a `GameStateMachine` seeded with `seed`
+              uses.
+    """
+    seed_stream = random.Random(seed)
+    seeds: list[int | float] = [seed]
+    seeds.extend(seed_stream.random() for _ in range(num - 1))
+    return seeds[:num]
+
+
+@dataclass(frozen=True)
+class Replay:
+    """
+    The record of a game started from `GameState.from_decks()`, any game state
+    of which can be rebuilt by deterministic re-simulation.
+
+    `seeds` are all seeds consumed by the game in order, including the ones of
+    illegal actions. (see `GameStateMachine.get_seeds()`) `failed_attempts`
+    are the numbers of illegal actions made before each of the `actions`.
+    """
+    mode: Mode
+    decks: tuple[FrozenDeck, FrozenDeck]
+    seeds: tuple[int | float, ...]
+    actions: tuple[PlayerAction, ...]
+    failed_attempts: tuple[int, ...]
+    num_transitions: int
+
+    @classmethod
+    def from_state_machine(cls, state_machine: GameStateMachine) -> "Replay":
+        """
+        :returns: the replay of the game run so far by `state_machine`.
+
+        :raises ValueError: if the game didn't start from `GameState.from_decks()`.
+        """
+        initial_state = state_machine.get_game_state_at(0)
+        deck1, deck2 = initial_state.get_decks()
+        decks = (deck1.to_frozen(), deck2.to_frozen())
+        if GameState.from_decks(initial_state.mode, *decks) != initial_state:
+            raise ValueError("only games started from GameState.from_decks() can be replayed")
+        action_indices = [
+            index
+            for index in range(state_machine.latest_index())
+            if state_machine.action_at(index) is not None
+        ]
+        return cls(
+            mode=initial_state.mode,
+            decks=decks,
+            seeds=state_machine.get_seeds(),
+            actions=tuple(
+                state_machine.action_at(index)  # type: ignore
+                for index in action_indices
+            ),
+            failed_attempts=tuple(
+                state_machine.failed_attempts_at(index)
+                for index in action_indices
+            ),
+            num_transitions=state_machine.latest_index(),
+        )
+
+    def initial_state(self) -> GameState:
+        return GameState.from_decks(self.mode, *self.decks)
+
+    def game_states(self) -> Iterator[GameState]:
+        """
+        :returns: all game states of the game in chronological order, rebuilt
+                  by re-simulation.
+        """
+        game_state = self.initial_state()
+        yield game_state
+        seed_idx = 0
+        action_idx = 0
+        for _ in range(self.num_transitions):
+            pid = game_state.waiting_for()
+            if pid is None:
+                game_state = game_state.step(seed=self.seeds[seed_idx])
+            else:
+                seed_idx += self.failed_attempts[action_idx]
+                next_state = game_state.action_step(
+                    pid,
+                    self.actions[action_idx],
+                    seed=self.seeds[seed_idx],
+                )
+                if next_state is None:
+                    raise ValueError(f"illegal action {self.actions[action_idx]} in replay")
+                game_state = next_state
+                action_idx += 1
+            seed_idx += 1
+            yield game_state
+
+    def game_state_at(self, index: int) -> GameState:
+        """ :returns: the game state at `index` of the history of the game. """
+        if not 0 <= index <= self.num_transitions:
+            raise IndexError(f"game state index {index} out of range")
+        for i, game_state in enumerate(self.game_states()):
+            if i == index:
+                return game_state
+        raise Exception("Not Reached")  # pragma: no cover
+
+    def final_state(self) -> GameState:
+        return self.game_state_at(self.num_transitions)
+
+    def to_bytes(self, encoding_plan: EncodingPlan = encoding_plan) -> bytes:
+        """
+        :returns: the binary form of the replay, the codes of the mode, decks and
+                  actions are those of `encoding_plan`.
+
+        If the seeds are the ones a `GameStateMachine` draws from its own seed,
+        only that seed is stored.
+        """
+        buf = bytearray([_VERSION])
+        _write_uint(buf, encoding_plan.encode_item(self.mode))
+        for deck in self.decks:
+            _write_ints(buf, deck.encoding(encoding_plan))
+        seeds = list(self.seeds)
+        derived = bool(seeds) and _derived_seeds(seeds[0], len(seeds)) == seeds
+        buf.append(_DERIVED_SEEDS if derived else 0)
+        _write_uint(buf, len(seeds))
+        for seed in (seeds[:1] if derived else seeds):
+            _write_seed(buf, seed)
+        _write_uint(buf, self.num_transitions)
+        _write_uint(buf, len(self.actions))
+        for action, failed_attempts in zip(self.actions, self.failed_attempts):
+            _write_uint(buf, failed_attempts)
+            _write_ints(buf, action.encoding(encoding_plan))
+        return bytes(buf)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, encoding_plan: EncodingPlan = encoding_plan) -> "Replay":
+        """
+        :returns: the replay of the binary form `data` made by `to_bytes()` with
+                  the same `encoding_plan`.
+
+        :raises ValueError: if `data` isn't a valid replay.
+        """
+        view = memoryview(data)
+        if not view or view[0] != _VERSION:
+            raise ValueError("unsupported replay version")
+        try:
+            mode_code, pos = _read_uint(view, 1)
+            mode_type = encoding_plan.type_for(mode_code)
+            if mode_type is None or not issubclass(mode_type, Mode):
+                raise ValueError(f"unknown mode code {mode_code}")
+            decks: list[FrozenDeck] = []
+            for _ in range(2):
+                deck_encoding, pos = _read_ints(view, pos, 3 + encoding_plan.CARDS_FIXED_LEN)
+                deck = FrozenDeck.decoding(deck_encoding, encoding_plan)
+                if deck is None:
+                    raise ValueError("invalid deck")
+                decks.append(deck)
+            flags = view[pos]
+            num_seeds, pos = _read_uint(view, pos + 1)
+            seeds: list[int | float] = []
+            for _ in range(min(num_seeds, 1) if flags & _DERIVED_SEEDS else num_seeds):
+                seed, pos = _read_seed(view, pos)
+                seeds.append(seed)
+            if flags & _DERIVED_SEEDS:
+                seeds = _derived_seeds(seeds[0], num_seeds)
+            num_transitions, pos = _read_uint(view, pos)
+            num_actions, pos = _read_uint(view, pos)
+            actions: list[PlayerAction] = []
+            failed_attempts: list[int] = []
+            for _ in range(num_actions):
+                num_failed, pos = _read_uint(view, pos)
+                action_encoding, pos = _read_ints(
+                    view, pos, encoding_plan.action_encoding_size
+                )
+                action = PlayerAction.decoding(action_encoding, encoding_plan)
+                if action is None:
+                    raise ValueError(f"invalid action {action_encoding}")
+                actions.append(action)
+                failed_attempts.append(num_failed)
+        except IndexError as e:
+            raise ValueError("truncated replay") from e
+        return cls(
+            mode=mode_type(),
+            decks=(decks[0], decks[1]),
+            seeds=tuple(seeds),
+            actions=tuple(actions),
+            failed_attempts=tuple(failed_attempts),
+            num_transitions=num_transitions,
+        )
+
+
+class ReplayWriter:
+    """
+    Writes replays to a binary stream, each prefixed with its size, so that
+    any number of games can be appended to a single file.
+    """
+
+    def __init__(self, stream: BinaryIO, encoding_plan: EncodingPlan = encoding_plan):
+        self._stream = stream
+        self._encoding_plan = encoding_plan
+
+    def write(self, game: GameStateMachine | Replay) -> int:
+        """
+        :param game: a replay, or a state machine whose game is written so far.
+        :returns: the number of bytes written.
+        """
+        if isinstance(game, GameStateMachine):
+            game = Replay.from_state_machine(game)
+        data = game.to_bytes(self._encoding_plan)
+        buf = bytearray()
+        _write_uint(buf, len(data))
+        buf += data
+        self._stream.write(buf)
+        return len(buf)
+
+
+class ReplayReader:
+    """
+    Reads the replays written by `ReplayWriter` from a binary stream.
+
+    .. code-block:: python3
+
+        with open("games.dgr", "rb") as f:
+            for replay in ReplayReader(f):
+                print(replay.final_state().get_winner())
+    """
+
+    def __init__(self, stream: BinaryIO, encoding_plan: EncodingPlan = encoding_plan):
+        self._stream = stream
+        self._encoding_plan = encoding_plan
+
+    def _read_size(self) -> None | int:
+        n = 0
+        shift = 0
+        while True:
+            byte = self._stream.read(1)
+            if not byte:
+                if shift == 0:
+                    return None
+                raise ValueError("truncated replay stream")
+            n |= (byte[0] & 0x7F) << shift
+            if byte[0] < 0x80:
+                return n
+            shift += 7
+
+    def __iter__(self) -> Iterator[Replay]:
+        while (size := self._read_size()) is not None:
+            data = self._stream.read(size)
+            if len(data) != size:
+                raise ValueError("truncated replay stream")
+            yield Replay.from_bytes(data, self._encoding_plan)
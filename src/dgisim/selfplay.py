@@ -0,0 +1,167 @@
+"""
+This file contains a batch self-play runner built on top of GameStateMachine.
+"""
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import chain
+from typing import Callable, Iterator, Sequence
+
+from .action.action import PlayerAction
+from .deck import Deck
+from .game_state_machine import GameStateMachine
+from .helper.rng import using_rng
+from .mode import DefaultMode, Mode
+from .player_agent import PlayerAgent
+from .state.enums import Pid
+from .state.game_state import GameState
+
+__all__ = [
+    "AgentFactory",
+    "GameResult",
+    "game_seeds",
+    "run_game",
+    "run_games",
+]
+
+
+AgentFactory = Callable[[], PlayerAgent]
+
+
+@dataclass(frozen=True)
+class GameResult:
+    """
+    The compact result of a single self-play game.
+    """
+    game_id: int
+    seed: int
+    winner: None | Pid
+    rounds: int
+    actions: None | tuple[tuple[Pid, PlayerAction], ...] = None
+
+
+def game_seeds(n: int, seed: None | int = None) -> list[int]:
+    """
+    :param n: the number of games.
+    :param seed: the base seed of the batch, a random one is used if `None`.
+
+    :returns: the deterministic per-game seeds of a batch of `n` games.
+    """
+    seed_stream = random.Random(seed)
+    return [seed_stream.getrandbits(32) for _ in range(n)]
+
+
+def run_game(
+        game_id: int,
+        seed: int,
+        agent_factories: tuple[AgentFactory, AgentFactory],
+        mode: Mode = DefaultMode(),
+        decks: None | tuple[Deck, Deck] = None,
+        record_actions: bool = False,
+) -> GameResult:
+    """
+    :param game_id: the index of the game in its batch.
+    :param seed: the seed of the game.
+    :param agent_factories: the factories creating the agents of player 1 and 2.
+    :param mode: the mode of the game.
+    :param decks: the decks of player 1 and 2, random decks are used if `None`.
+    :param record_actions: set to `True` to keep all actions made in the result.
+
+    :returns: the result of a single game played until the end.
+
+    Random decks and agents without their own generators draw from a generator
+    seeded with `seed`, so the whole game is reproducible.
+    """
+    with using_rng(random.Random(seed)):
+        if decks is None:
+            game_state = GameState.from_default(mode)
+        else:
+            game_state = GameState.from_decks(mode, decks[0], decks[1])
+        state_machine = GameStateMachine(
+            game_state,
+            agent_factories[0](),
+            agent_factories[1](),
+            seed=seed,
+            compact_history=True,
+        )
+        winner = state_machine.run()
+    return GameResult(
+        game_id=game_id,
+        seed=seed,
+        winner=winner,
+        rounds=state_machine.get_game_state().round,
+        actions=state_machine.get_actions() if record_actions else None,
+    )
+
+
+def _run_shard(
+        shard: Sequence[tuple[int, int]],
+        agent_factories: tuple[AgentFactory, AgentFactory],
+        mode: Mode,
+        decks: None | tuple[Deck, Deck],
+        record_actions: bool,
+) -> list[GameResult]:
+    return [
+        run_game(game_id, seed, agent_factories, mode, decks, record_actions)
+        for game_id, seed in shard
+    ]
+
+
+def run_games(
+        n: int,
+        agent_factories: tuple[AgentFactory, AgentFactory],
+        mode: Mode = DefaultMode(),
+        decks: None | tuple[Deck, Deck] = None,
+        workers: None | int = None,
+        seed: None | int = None,
+        record_actions: bool = False,
+        shard_size: None | int = None,
+) -> Iterator[GameResult]:
+    """
+    :param n: the number of games to play.
+    :param agent_factories: the factories creating the agents of player 1 and 2,
+                            e.g. `(RandomAgent, RandomAgent)`.
+    :param mode: the mode of the games.
+    :param decks: the decks of player 1 and 2, random decks are used if `None`.
+    :param workers: the number of worker processes, defaults to the number of
+                    cores. If it is 1 or less, games are played in the current
+                    process.
+    :param seed: the base seed of the batch, the per-game seeds are derived from
+                 it, see `game_seeds()`.
+    :param record_actions: set to `True` to keep all actions made in the results.
+    :param shard_size: the number of games sent to a worker at a time.
+
+    :returns: an iterator of the game results in the order of `game_id`, results
+              are yielded as soon as they are available.
+
+    Games are sharded across a process pool, so `agent_factories`, `mode` and
+    `decks` must be picklable. (e.g. classes or module level functions)
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    games = list(enumerate(game_seeds(n, seed)))
+    if workers <= 1:
+        for game_id, game_seed in games:
+            yield run_game(game_id, game_seed, agent_factories, mode, decks, record_actions)
+        return
+
+    if shard_size is None:
+        # a few shards per worker keeps all workers busy until the end
+        shard_size = max(1, n // (workers * 4))
+    shards = [
+        games[i:i + shard_size]
+        for i in range(0, n, shard_size)
+    ]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from chain.from_iterable(executor.map(
+            partial(
+                _run_shard,
+                agent_factories=agent_factories,
+                mode=mode,
+                decks=decks,
+                record_actions=record_actions,
+            ),
+            shards,
+        ))
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from itertools import chain
+from random import Random
 from typing import Callable, Optional, TYPE_CHECKING, cast
 
 from typing_extensions import Self
@@ -23,7 +24,9 @@ from ..effect.enums import Zone
 from ..effect.structs import StaticTarget
 from ..element import Element
 from ..event import *
+from ..helper.instance_cache import cached_hash, instance_cache, known_hashes_differ
 from ..helper.quality_of_life import case_val
+from ..helper.rng import using_rng
 from ..status.status_processing import StatusProcessing
 from ..status.enums import Preprocessables
 from ..summon.summon import Summon
@@ -51,6 +54,30 @@ class GameState:
     To tell if a player action is required, run waiting_for().
     """
 
+    __slots__ = (
+        "_mode",
+        "_phase",
+        "_round",
+        "_active_player_id",
+        "_player1",
+        "_player2",
+        "_effect_stack",
+        "_common_effect_stack",
+        "_dmg_effect_stack",
+        "_leathal_dmg_effect_stack",
+        # checkers are created on first use, most game states never need them
+        "_card_checker",
+        "_swap_checker",
+        "_skill_checker",
+        "_elem_tuning_checker",
+        "_instance_cache",
+    )
+    # the types of the checkers created on first use
+    _card_checker: CardChecker
+    _swap_checker: SwapChecker
+    _skill_checker: SkillChecker
+    _elem_tuning_checker: ElementalTuningChecker
+
     def __init__(
         self,
         mode: md.Mode,
@@ -89,12 +116,6 @@ class GameState:
         self._dmg_effect_stack = dmg_effect_stack
         self._leathal_dmg_effect_stack = lethal_dmg_effect_stack
 
-        # checkers
-        self._card_checker = CardChecker(self)
-        self._swap_checker = SwapChecker(self)
-        self._skill_checker = SkillChecker(self)
-        self._elem_tuning_checker = ElementalTuningChecker(self)
-
     @classmethod
     def from_default(cls, mode: md.Mode = md.DefaultMode()) -> Self:
         """
@@ -258,22 +279,38 @@ class GameState:
     @property
     def card_checker(self) -> CardChecker:
         """ :returns: a validity checker for playing cards.  """
-        return self._card_checker
+        try:
+            return self._card_checker
+        except AttributeError:
+            self._card_checker = CardChecker(self)
+            return self._card_checker
 
     @property
     def swap_checker(self) -> SwapChecker:
         """ :returns: a validity checker for performing character swaps.  """
-        return self._swap_checker
+        try:
+            return self._swap_checker
+        except AttributeError:
+            self._swap_checker = SwapChecker(self)
+            return self._swap_checker
 
     @property
     def skill_checker(self) -> SkillChecker:
         """ :returns: a validity checker for casting character skills.  """
-        return self._skill_checker
+        try:
+            return self._skill_checker
+        except AttributeError:
+            self._skill_checker = SkillChecker(self)
+            return self._skill_checker
 
     @property
     def elem_tuning_checker(self) -> ElementalTuningChecker:
         """ :returns: a validity checker for performing elemental tuning. """
-        return self._elem_tuning_checker
+        try:
+            return self._elem_tuning_checker
+        except AttributeError:
+            self._elem_tuning_checker = ElementalTuningChecker(self)
+            return self._elem_tuning_checker
 
     def belongs_to(self, object: Character | Support) -> None | Pid:
         """ :returns: which player the `object` belongs to. """
@@ -312,26 +349,42 @@ class GameState:
         """
         return self._phase.waiting_for(self)
 
-    def step(self, seed: int | float | None = None) -> GameState:
+    @staticmethod
+    def _rng_for(seed: int | float | None, rng: None | Random) -> None | Random:
+        if rng is not None:
+            return rng
+        if seed is not None:
+            return Random(seed)
+        return None
+
+    def step(self, seed: int | float | None = None, rng: None | Random = None) -> GameState:
         """
         :param seed: the seed for internal random number generation.
                      Applying the same seed to the same game state will always
                      result in the same next state.
+        :param rng: the random number generator to draw from, takes precedence
+                    over `seed`. If neither is provided, the generator of the
+                    current context is used. (see `current_rng()`)
         :returns: the next state of a state-transition from the current one without
                   any player action.
         """
-        if seed is not None:
-            import random
-            random.seed(seed)
-        return self._phase.step(self)
+        rng = self._rng_for(seed, rng)
+        if rng is None:
+            return self._phase.step(self)
+        with using_rng(rng):
+            return self._phase.step(self)
 
-    def auto_step(self, seed: int | float | None = None) -> GameState:
+    def auto_step(self, seed: int | float | None = None, rng: None | Random = None) -> GameState:
         """
         Same as step, but automatically step until a player action is required.
         """
-        if seed is not None:
-            import random
-            random.seed(seed)
+        rng = self._rng_for(seed, rng)
+        if rng is None:
+            return self._auto_step()
+        with using_rng(rng):
+            return self._auto_step()
+
+    def _auto_step(self) -> GameState:
         gs = self
         while gs.waiting_for() is None and not gs.game_end():
             gs = gs._phase.step(gs)
@@ -342,16 +395,21 @@ class GameState:
             pid: Pid,
             action: PlayerAction,
             seed: int | float | None = None,
+            rng: None | Random = None,
     ) -> None | GameState:
         """
+        :param seed: the seed for internal random number generation.
+        :param rng: the random number generator to draw from, takes precedence
+                    over `seed`.
         :returns: the next state of a state-transition from the current one with
                   a player action from `pid`. None is returned if the `action` is
                   illegal in the context.
         """
-        if seed is not None:
-            import random
-            random.seed(seed)
-        return self._phase.step_action(self, pid, action)
+        rng = self._rng_for(seed, rng)
+        if rng is None:
+            return self._phase.step_action(self, pid, action)
+        with using_rng(rng):
+            return self._phase.step_action(self, pid, action)
 
     def action_generator(self, pid: Pid) -> None | acg.ActionGenerator:
         """
@@ -361,6 +419,35 @@ class GameState:
         """
         return self._phase.action_generator(self, pid)
 
+    def legal_actions(self, pid: Pid) -> tuple[PlayerAction, ...]:
+        """
+        :returns: all legal actions of player `pid` under this game state, with
+                  the dice and cards to choose filled in canonically. (see
+                  `ActionGenerator.canonical_actions()`) An empty tuple is
+                  returned if the player cannot take any action at the moment.
+
+        The result is computed once per game state.
+        """
+        cache = instance_cache(self)
+        key = ("legal_actions", pid)
+        actions = cache.get(key)
+        if actions is None:
+            action_generator = self.action_generator(pid)
+            actions = () if action_generator is None else action_generator.canonical_actions()
+            cache[key] = actions
+        return actions
+
+    def action_mask(self, pid: Pid, encoding_plan: EncodingPlan) -> list[bool]:
+        """
+        :returns: a mask of size `encoding_plan.action_mask_size`, where slot
+                  `encoding_plan.action_slot(action)` is `True` for every action
+                  in `legal_actions(pid)`.
+        """
+        mask = [False] * encoding_plan.action_mask_size
+        for action in self.legal_actions(pid):
+            mask[encoding_plan.action_slot(action)] = True
+        return mask
+
     def get_winner(self) -> Optional[Pid]:  # pragma: no cover
         """
         :returns: the winner's `Pid` or `None` if the game is a drawn.
@@ -407,11 +494,12 @@ class GameState:
         """
         encoding_plan = encoding_plan.perspective_version(perspective)
         basics = [
-            encoding_plan.encode_item(self._mode),
             encoding_plan.PHASE_BASE + self._mode.phase_code(self._phase),
             self._round,
             encoding_plan.encode_item(self._active_player_id),
         ]
+        if not encoding_plan.SPLIT_STATIC:
+            basics.insert(0, encoding_plan.encode_item(self._mode))
         if perspective is Pid.P1:
             return list(chain(
                 basics,
@@ -427,6 +515,28 @@ class GameState:
                 self._effect_stack.encoding(encoding_plan),
             ))
 
+    def static_encoding(
+            self,
+            encoding_plan: EncodingPlan,
+            perspective: Pid = Pid.P1,
+    ) -> list[int]:
+        """
+        :returns: the encoding of the mode and the initial decks of both players,
+                  which never change in a game. They are only needed once per
+                  game if the game states are encoded by a plan with
+                  `split_static`, which leaves them out.
+        """
+        encoding_plan = encoding_plan.perspective_version(perspective)
+        if perspective is Pid.P1:
+            self_player, other_player = self._player1, self._player2
+        else:
+            self_player, other_player = self._player2, self._player1
+        return list(chain(
+            [encoding_plan.encode_item(self._mode)],
+            self_player.initial_deck.encoding(encoding_plan),
+            other_player.initial_deck.encoding(encoding_plan),
+        ))
+
     def get_decks(self) -> tuple[Deck, Deck]:
         """
         :returns: the decks used by both player 1 and 2 if known.
@@ -454,10 +564,15 @@ class GameState:
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, GameState):
             return False
-        return self is other or self._all_unique_data() == other._all_unique_data()
+        if known_hashes_differ(self, other):
+            return False
+        return self._all_unique_data() == other._all_unique_data()
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._all_unique_data())
 
@@ -478,6 +593,20 @@ class GameState:
 
 
 class GameStateFactory:
+    __slots__ = (
+        "_mode",
+        "_phase",
+        "_round",
+        "_active_player",
+        "_player1",
+        "_player2",
+        "_effect_stack",
+        "_common_effect_stack",
+        "_dmg_effect_stack",
+        "_leathal_dmg_effect_stack",
+        "_staged_characters",
+    )
+
     def __init__(self, game_state: GameState):
         self._mode = game_state.mode
         self._phase = game_state.phase
@@ -489,6 +618,7 @@ class GameStateFactory:
         self._common_effect_stack = game_state.common_effect_stack
         self._dmg_effect_stack = game_state.dmg_effect_stack
         self._leathal_dmg_effect_stack = game_state.lethal_dmg_effect_stack
+        self._staged_characters: None | dict[Pid, list[Character]] = None
 
     def mode(self, new_mode: md.Mode) -> GameStateFactory:
         self._mode = new_mode
@@ -541,17 +671,25 @@ class GameStateFactory:
         return self
 
     def player1(self, new_player: ps.PlayerState) -> GameStateFactory:
+        if self._staged_characters:
+            self._staged_characters.pop(Pid.P1, None)
         self._player1 = new_player
         return self
 
     def f_player1(self, f: Callable[[ps.PlayerState], ps.PlayerState]) -> GameStateFactory:
+        if self._staged_characters:
+            self._write_staged(Pid.P1)
         return self.player1(f(self._player1))
 
     def player2(self, new_player: ps.PlayerState) -> GameStateFactory:
+        if self._staged_characters:
+            self._staged_characters.pop(Pid.P2, None)
         self._player2 = new_player
         return self
 
     def f_player2(self, f: Callable[[ps.PlayerState], ps.PlayerState]) -> GameStateFactory:
+        if self._staged_characters:
+            self._write_staged(Pid.P2)
         return self.player2(f(self._player2))
 
     def player(self, pid: Pid, new_player: ps.PlayerState) -> GameStateFactory:
@@ -563,6 +701,8 @@ class GameStateFactory:
             raise Exception("player_id unknown")
 
     def f_player(self, pid: Pid, f: Callable[[ps.PlayerState], ps.PlayerState]) -> GameStateFactory:
+        if self._staged_characters:
+            self._write_staged(pid)
         if pid is Pid.P1:
             return self.player1(f(self._player1))
         elif pid is Pid.P2:
@@ -579,6 +719,8 @@ class GameStateFactory:
             raise Exception("player_id unknown")
 
     def f_other_player(self, pid: Pid, f: Callable[[ps.PlayerState], ps.PlayerState]) -> GameStateFactory:
+        if self._staged_characters:
+            self._write_staged(pid.other)
         if pid is Pid.P1:
             return self.player2(f(self._player2))
         elif pid is Pid.P2:
@@ -586,7 +728,73 @@ class GameStateFactory:
         else:  # pragma: no cover
             raise Exception("player_id unknown")
 
+    def character(self, pid: Pid, char: Character) -> GameStateFactory:
+        """
+        Stages `char` to replace the character of the same id of player `pid`.
+
+        Staged characters are written into the player in one rebuild, when the
+        player is next edited by `f_player()` (or `f_player1()`, etc.) or on
+        `build()`, so several character edits cost a single rebuild of the
+        player.
+
+        Replacing the player by `player()` (or `player1()`, etc.) discards the
+        edits staged for it, as the new player replaces the old one as a whole.
+        """
+        chars = self._staged_chars(pid)
+        for i, c in enumerate(chars):
+            if c.id == char.id:
+                chars[i] = char
+                break
+        return self
+
+    def f_character(
+            self,
+            pid: Pid,
+            char_id: int,
+            f: Callable[[Character], Character],
+    ) -> GameStateFactory:
+        """
+        Stages `f` applied to the character of `char_id` of player `pid`.
+        Like `character()`, staged edits are discarded if the player is then
+        replaced by `player()` (or `player1()`, etc.).
+        """
+        chars = self._staged_chars(pid)
+        for i, c in enumerate(chars):
+            if c.id == char_id:
+                chars[i] = f(c)
+                break
+        return self
+
+    def _staged_chars(self, pid: Pid) -> list[Character]:
+        """ :returns: the mutable staged characters of player `pid`. """
+        if self._staged_characters is None:
+            self._staged_characters = {}
+        chars = self._staged_characters.get(pid)
+        if chars is None:
+            player = self._player1 if pid is Pid.P1 else self._player2
+            chars = self._staged_characters[pid] = list(player.characters.get_characters())
+        return chars
+
+    def _write_staged(self, pid: Pid) -> None:
+        """ Writes the staged characters of player `pid` (if any) into the player. """
+        assert self._staged_characters is not None
+        staged = self._staged_characters.pop(pid, None)
+        if staged is None:
+            return
+        chars = tuple(staged)
+        player = self._player1 if pid is Pid.P1 else self._player2
+        player = player.factory().characters(
+            player.characters.factory().characters(chars).build()
+        ).build()
+        if pid is Pid.P1:
+            self._player1 = player
+        else:
+            self._player2 = player
+
     def build(self) -> GameState:
+        if self._staged_characters:
+            for pid in tuple(self._staged_characters):
+                self._write_staged(pid)
         return GameState(
             mode=self._mode,
             phase=self._phase,
@@ -602,6 +810,8 @@ class GameStateFactory:
 
 
 class CardChecker:
+    __slots__ = ("_game_state",)
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
 
@@ -617,6 +827,8 @@ class CardChecker:
 
 
 class SwapChecker:
+    __slots__ = ("_game_state",)
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
 
@@ -742,6 +954,8 @@ class SwapChecker:
 
 
 class SkillChecker:
+    __slots__ = ("_game_state",)
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
 
@@ -833,6 +1047,8 @@ class SkillChecker:
 
 
 class ElementalTuningChecker:
+    __slots__ = ("_game_state",)
+
     def __init__(self, game_state: GameState) -> None:
         self._game_state = game_state
 
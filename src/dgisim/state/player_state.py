@@ -1,7 +1,6 @@
 from __future__ import annotations
-from collections import Counter
 from itertools import chain
-from typing import Callable, Optional, Union, TYPE_CHECKING
+from typing import Callable, Iterable, Optional, Union, TYPE_CHECKING
 from typing_extensions import Self
 
 from ..character import character as chr
@@ -11,16 +10,23 @@ from ..support import support as sp
 from ..card.cards import Cards
 from ..character.characters import Characters
 from ..dice import ActualDice
+from ..effect.enums import TriggeringSignal, Zone
+from ..effect.structs import StaticTarget
+from ..encoding.encoding_cache import cached_encoding
+from ..status.enums import Preprocessables
 from ..helper.hashable_dict import HashableDict
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
 from ..summon.summons import Summons
 from ..support.supports import Supports
 
-from .enums import Act
+from .enums import Act, Pid
 
 if TYPE_CHECKING:
     from ..deck import Deck, FrozenDeck
     from ..encoding.encoding_plan import EncodingPlan
     from ..mode import Mode
+    from ..status.status import Status
+    from ..summon.summon import Summon
 
 __all__ = [
     "PlayerState",
@@ -32,6 +38,25 @@ class PlayerState:
     A class that holds all immutable data of a player.
     """
 
+    __slots__ = (
+        "_phase",
+        "_consec_action",
+        "_card_redraw_chances",
+        "_dice_reroll_chances",
+        "_characters",
+        "_hidden_statuses",
+        "_combat_statuses",
+        "_summons",
+        "_supports",
+        "_dice",
+        "_hand_cards",
+        "_deck_cards",
+        "_publicly_used_cards",
+        "_publicly_gained_cards",
+        "_initial_deck",
+        "_instance_cache",
+    )
+
     def __init__(
         self,
         phase: Act,
@@ -238,6 +263,87 @@ class PlayerState:
             hide_support
         ).build()
 
+    def _ordered_statuses(
+            self,
+            pid: Pid,
+            select_of_char: Callable[[chr.Character], tuple[Status, ...]],
+            hidden_statuses: tuple[Status, ...],
+            combat_statuses: tuple[Status, ...],
+            summons: tuple[Summon, ...],
+            supports: tuple[sp.Support, ...],
+    ) -> tuple[tuple[Status, StaticTarget], ...]:
+        """
+        :returns: the statuses selected from each character by `select_of_char`,
+                  and the given ones selected from the other containers, paired
+                  with where they are, in the order statuses are processed.
+                  (the active character's statuses, hidden statuses, combat
+                  statuses, other characters' statuses, summons, then supports)
+        """
+        ordered_characters = self._characters.get_character_in_activity_order()
+
+        def character_statuses(char: chr.Character) -> Iterable[tuple[Status, StaticTarget]]:
+            target = StaticTarget(pid, Zone.CHARACTERS, char.id)
+            return ((status, target) for status in select_of_char(char))
+
+        hidden_target = StaticTarget(pid, Zone.HIDDEN_STATUSES, -1)
+        combat_target = StaticTarget(pid, Zone.COMBAT_STATUSES, -1)
+        return tuple(chain(
+            character_statuses(ordered_characters[0]),
+            ((status, hidden_target) for status in hidden_statuses),
+            ((status, combat_target) for status in combat_statuses),
+            chain.from_iterable(character_statuses(char) for char in ordered_characters[1:]),
+            ((summon, StaticTarget(pid, Zone.SUMMONS, type(summon))) for summon in summons),
+            ((support, StaticTarget(pid, Zone.SUPPORTS, support.sid)) for support in supports),
+        ))
+
+    @cached_method
+    def statuses_reacting_to(
+            self,
+            pid: Pid,
+            signal: TriggeringSignal,
+    ) -> tuple[tuple[Status, StaticTarget], ...]:
+        """
+        :param pid: the pid of this player.
+        :returns: the statuses, summons and supports of this player that react
+                  to `signal`, paired with where they are, in the order statuses
+                  are triggered.
+
+        Only the containers changed since the last player state are filtered
+        again, as the result of each container is cached by itself.
+        """
+        return self._ordered_statuses(
+            pid,
+            lambda char: char.statuses_reacting_to(signal),
+            self._hidden_statuses.reacting_to(signal),
+            self._combat_statuses.reacting_to(signal),
+            self._summons.reacting_to(signal),
+            self._supports.reacting_to(signal),
+        )
+
+    @cached_method
+    def statuses_preprocessing(
+            self,
+            pid: Pid,
+            pp_type: Preprocessables,
+    ) -> tuple[tuple[Status, StaticTarget], ...]:
+        """
+        :param pid: the pid of this player.
+        :returns: the statuses, summons and supports of this player that
+                  preprocess `pp_type`, paired with where they are, in the order
+                  statuses preprocess.
+
+        Cached the same way as `statuses_reacting_to()`.
+        """
+        return self._ordered_statuses(
+            pid,
+            lambda char: char.statuses_preprocessing(pp_type),
+            self._hidden_statuses.preprocessing(pp_type),
+            self._combat_statuses.preprocessing(pp_type),
+            self._summons.preprocessing(pp_type),
+            self._supports.preprocessing(pp_type),
+        )
+
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         Encode the player state into a list of integers.
@@ -255,7 +361,7 @@ class PlayerState:
             self._deck_cards.encoding(encoding_plan),
             self._publicly_used_cards.encoding(encoding_plan),
             self._publicly_gained_cards.encoding(encoding_plan),
-            self._initial_deck.encoding(encoding_plan),
+            () if encoding_plan.SPLIT_STATIC else self._initial_deck.encoding(encoding_plan),
             self._characters.encoding(encoding_plan),
             self._hidden_statuses.encoding(encoding_plan, encoding_plan.PLAYER_HIDDEN_FIXED_LEN),
             self._combat_statuses.encoding(encoding_plan, encoding_plan.PLAYER_COMBAT_FIXED_LEN),
@@ -268,31 +374,15 @@ class PlayerState:
         """
         :returns: a random initial player state under the `mode`.
         """
-        from ..card.card import ArcaneLegendCard, Card
-        from ..deck import MutableDeck
-        from ..helper.hashable_dict import HashableDict
-        cards = mode.all_cards()
-        chars = mode.all_chars()
-        import random
-        selected_chars = random.sample(list(chars), k=3)
-        deck = MutableDeck(chars=selected_chars, cards={})
-        cards_pool: list[type[Card]] = []
-        for card in cards:
-            if not card.valid_in_deck(deck):
-                continue
-            if issubclass(card, ArcaneLegendCard):
-                cards_pool.append(card)
-            else:
-                cards_pool.extend([card] * 2)
-        selected_cards = random.sample(cards_pool, k=mode.deck_cards_requirement())
-        deck.cards = Counter(selected_cards)
+        from ..deck import DeckSampler
+        deck = DeckSampler(mode).sample_deck()
         return cls(
             phase=Act.PASSIVE_WAIT_PHASE,
             consec_action=False,
             card_redraw_chances=0,
             dice_reroll_chances=0,
             characters=Characters.from_default(
-                tuple(char.from_default(i + 1) for i, char in enumerate(selected_chars))
+                tuple(char.from_default(i + 1) for i, char in enumerate(deck.chars))
             ),
             hidden_statuses=mode.player_default_hidden_statuses(),
             combat_statuses=sts.Statuses(()),
@@ -300,7 +390,7 @@ class PlayerState:
             supports=Supports((), mode.supports_limit()),
             dice=ActualDice({}),
             hand_cards=Cards({}),
-            deck_cards=Cards(Counter(selected_cards)),
+            deck_cards=Cards(deck.cards),
             publicly_used_cards=Cards({}),
             publicly_gained_cards=Cards({}),
             initial_deck=deck,
@@ -382,10 +472,15 @@ class PlayerState:
         )
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, PlayerState):
             return False
+        if known_hashes_differ(self, other):
+            return False
         return self._all_unique_data() == other._all_unique_data()
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._all_unique_data())
 
@@ -414,6 +509,24 @@ class PlayerState:
 
 
 class PlayerStateFactory:
+    __slots__ = (
+        "_phase",
+        "_consec_action",
+        "_card_redraw_chances",
+        "_dice_reroll_chances",
+        "_characters",
+        "_hidden_statuses",
+        "_combat_statuses",
+        "_summons",
+        "_supports",
+        "_dice",
+        "_hand_cards",
+        "_deck_cards",
+        "_publicly_used_cards",
+        "_publicly_gained_cards",
+        "_initial_deck",
+    )
+
     def __init__(self, player_state: PlayerState) -> None:
         self._phase = player_state.phase
         self._consec_action = player_state.get_consec_action()
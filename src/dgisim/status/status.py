@@ -28,6 +28,7 @@ from ..effect.effects_template import budget_post_effect, standard_post_effects
 from ..effect.enums import Zone, TriggeringSignal, DynamicCharacterTarget
 from ..effect.structs import StaticTarget, DamageType
 from ..element import Element, Reaction
+from ..encoding.encoding_cache import cached_encoding
 from ..event import *
 from ..helper.hashable_dict import HashableDict
 from ..helper.quality_of_life import BIG_INT, case_val, classproperty
@@ -349,6 +350,21 @@ class Status:
     This is used to improve the performance.
     """
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset()
+    """
+    The set of preprocessables the status may preprocess.
+    This is used to improve the performance, statuses are only asked to
+    preprocess the types declared.
+
+    A subclass overriding `_preprocess()` without declaring it is assumed to
+    preprocess all types.
+    """
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        if "_preprocess" in cls.__dict__ and "PREPROCESSABLES" not in cls.__dict__:
+            cls.PREPROCESSABLES = frozenset(Preprocessables)
+
     def __init__(self) -> None:
         if type(self) is Status:  # pragma: no cover
             raise Exception("class Status is not instantiable")
@@ -676,6 +692,7 @@ class Status:
         """
         return cls.perspective_view is not Status.perspective_view
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of the content of the status. (excluding the type of status)
@@ -761,6 +778,10 @@ class WeaponEquipmentStatus(EquipmentStatus):
 
     BASE_DAMAGE_BOOST: ClassVar[int] = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -945,6 +966,10 @@ class FixedShieldStatus(_ShieldStatus, _UsageStatus):
     ) -> bool:
         return True
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_MINUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -982,6 +1007,10 @@ class StackedShieldStatus(_ShieldStatus, _UsageStatus):
     MAX_USAGES: ClassVar[int] = BIG_INT
     SHIELD_AMOUNT: ClassVar[int] = 1  # shield amount per usage
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_MINUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1035,6 +1064,11 @@ class _InfusionStatus(_UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1102,6 +1136,10 @@ class _SkillCostReductionStatus(Status):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1458,6 +1496,11 @@ class AThousandFloatingDreamsStatus(WeaponEquipmentStatus, _UsageLivingStatus):
         from ..card.card import AThousandFloatingDreams
         return AThousandFloatingDreams
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *WeaponEquipmentStatus.PREPROCESSABLES,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1885,6 +1928,11 @@ class _ElementalDiscountStatus(ArtifactEquipmentStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -1930,6 +1978,11 @@ class _ElementalDiscountStatus(ArtifactEquipmentStatus):
 
 
 class _ElementalDiscountSupplyStatus(_ElementalDiscountStatus):
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *_ElementalDiscountStatus.PREPROCESSABLES,
+        Preprocessables.ROLL_DICE_INIT,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -1998,6 +2051,10 @@ class CrownOfWatatsumiStatus(ArtifactEquipmentStatus, _UsageLivingStatus):
         from ..card.card import CrownOfWatatsumi
         return CrownOfWatatsumi
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -2477,6 +2534,10 @@ class AncientCourtyardStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2512,6 +2573,10 @@ class CatalyzingFieldStatus(CombatStatus):
     damage_boost: ClassVar[int] = 1
     usages: int = 2
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2546,6 +2611,10 @@ class CatalyzingFieldStatus(CombatStatus):
 class ChangingShiftsStatus(CombatStatus):
     COST_DEDUCTION: ClassVar[int] = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2582,6 +2651,10 @@ class DendroCoreStatus(CombatStatus):
     damage_boost: ClassVar[int] = 2
     usages: int = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2680,6 +2753,10 @@ class ElementalResonanceFerventFlamesStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2717,6 +2794,10 @@ class ElementalResonanceShatteringIceStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2752,6 +2833,10 @@ class ElementalResonanceSprawlingGreeneryStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2800,6 +2885,10 @@ class IHaventLostYetOnCooldownStatus(CombatStatus):
 
 @dataclass(frozen=True, kw_only=True)
 class LeaveItToMeStatus(CombatStatus):
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2823,6 +2912,10 @@ class LyresongStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2860,6 +2953,10 @@ class MillennialMovementFarewellSongStatus(CombatStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2895,6 +2992,10 @@ class PassingOfJudgmentStatus(CombatStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -2970,6 +3071,10 @@ class FreshWindOfFreedomStatus(CombatStatus):
 
 @dataclass(frozen=True, kw_only=True)
 class SandAndDreamsStatus(CombatStatus):
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -3018,6 +3123,10 @@ class SunyataFlowerStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3147,6 +3256,10 @@ class WhereIsTheUnseenRazorStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3221,6 +3334,10 @@ class AdeptusTemptationStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3276,6 +3393,10 @@ class FrozenStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3312,6 +3433,10 @@ class HeavyStrikeStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3350,6 +3475,10 @@ class JueyunGuobaStatus(CharacterStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3418,6 +3547,10 @@ class MintyMeatRollsStatus(CharacterStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3494,6 +3627,10 @@ class NorthernSmokedChickenStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3547,6 +3684,10 @@ class TandooriRoastChickenStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3731,6 +3872,11 @@ class SuperlativeSuperstrengthStatus(CharacterStatus, _UsageStatus):
     TALENT_DAMAGE_BOOST: ClassVar[int] = 1
     COST_DEDUCTION: ClassVar[int] = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -3822,6 +3968,10 @@ class _InspirationFieldStatus(CombatStatus, _UsageStatus):
                 return replace(self, activated=True, target_char_id=information.source.id)
         return self
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4280,6 +4430,10 @@ class GrimheartStatus(CharacterStatus):
         TriggeringSignal.POST_SKILL,
     })
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4371,6 +4525,12 @@ class StealthStatus(CharacterStatus, FixedShieldStatus):
     DAMAGE_BOOST: ClassVar[int] = 1
     INFUSION_ELEMENT: ClassVar[Element] = Element.PYRO
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *FixedShieldStatus.PREPROCESSABLES,
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4494,6 +4654,10 @@ class SanguineRougeStatus(TalentEquipmentStatus):
         from ..card.card import SanguineRouge
         return SanguineRouge
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4587,6 +4751,10 @@ class RadicalVitalityStatus(CharacterStatus, _UsageLivingStatus):
                 return replace(self, activated=True)
         return self
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4703,6 +4871,11 @@ class MidareRanzanStatus(CharacterStatus):
                 return replace(self, _needs_removal=True)
         return self
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -4787,6 +4960,10 @@ class _PoeticsOfFuubutsuElementStatus(CombatStatus, _UsageStatus):
     _DMG_BOOST: ClassVar[int] = 1
     _BOOSTABLE_ELEMS: ClassVar[frozenset[Element]] = Reaction.SWIRL.value.reaction_elems[0]
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5008,6 +5185,10 @@ class KantenSenmyouBlessingStatus(TalentEquipmentStatus, _UsageStatus):
         from ..card.card import KantenSenmyouBlessing
         return KantenSenmyouBlessing
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5094,6 +5275,11 @@ class ExplosiveSparkStatus(CharacterStatus, _UsageStatus):
     DAMAGE_BOOST: ClassVar[int] = 1
     COST_DEDUCTION: ClassVar[int] = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5203,6 +5389,10 @@ class CrowfeatherCoverStatus(CharacterStatus, _UsageStatus):
     usages: int = 2
     MAX_USAGES: ClassVar[int] = 2
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5389,6 +5579,10 @@ class ConclusiveOvationStatus(TalentEquipmentStatus, _UsageLivingStatus):
         from ..card.card import ConclusiveOvation
         return ConclusiveOvation
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -5433,6 +5627,10 @@ class PropSurplusStatus(CharacterStatus, _UsageLivingStatus):
         TriggeringSignal.POST_SKILL,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -5480,6 +5678,10 @@ class TranscendentAutomatonStatus(TalentEquipmentStatus):
 
 @dataclass(frozen=True, kw_only=True)
 class IllusoryBubbleStatus(CombatStatus):
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_MUL,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -5502,6 +5704,10 @@ class IllusoryTorrentStatus(CharacterHiddenStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5544,6 +5750,10 @@ class ProphecyOfSubmersionStatus(TalentEquipmentStatus):
         from ..card.card import ProphecyOfSubmersion
         return ProphecyOfSubmersion
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5656,6 +5866,10 @@ class ShrineOfMayaStatus(CombatStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5713,6 +5927,11 @@ class JadeScreenStatus(CombatStatus, FixedShieldStatus):
     ) -> bool:
         return damage.damage >= self.DAMAGE_THRESHOLD
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *FixedShieldStatus.PREPROCESSABLES,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5757,6 +5976,11 @@ class FullPlateStatus(CombatStatus, StackedShieldStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *StackedShieldStatus.PREPROCESSABLES,
+        Preprocessables.DMG_AMOUNT_MUL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5833,6 +6057,11 @@ class SweepingTimeStatus(CharacterStatus, _InfusionStatus):
             and item.damage_type.direct_normal_attack()
         )
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        *_InfusionStatus.PREPROCESSABLES,
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -5997,6 +6226,10 @@ class ChakraDesiderataStatus(CharacterStatus, _UsageLivingStatus):
                 return replace(self, usages=self.usages + 1)
         return self
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6054,6 +6287,10 @@ class CeremonialGarmentStatus(CharacterStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6115,6 +6352,10 @@ class IcyQuillStatus(CombatStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6189,6 +6430,10 @@ class InfusedStonehideStatus(CharacterStatus, FixedShieldStatus):
     REACTABLE_SIGNALS: ClassVar[frozenset[TriggeringSignal]] = frozenset((
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6233,6 +6478,11 @@ class MeleeStanceStatus(CharacterStatus, _UsageStatus):
         TriggeringSignal.ROUND_END,
     })
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6414,6 +6664,10 @@ class KeenSightStatus(TalentEquipmentStatus):
         from ..card.card import KeenSight
         return KeenSight
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6471,6 +6725,10 @@ class VijnanaSuffusionStatus(CharacterStatus, _UsageStatus):
 
         return replace(self, activated=True)
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6545,6 +6803,10 @@ class StormzoneStatus(CombatStatus, _UsageStatus):
         TriggeringSignal.SELF_SWAP,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6592,6 +6854,10 @@ class WindsOfHarmonyStatus(CombatStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6631,6 +6897,10 @@ class DescentStatus(CharacterStatus):
         TriggeringSignal.SELF_SWAP,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6679,6 +6949,11 @@ class WindfavoredStatus(CharacterStatus, _UsageStatus):
     usages: int = 2
     MAX_USAGES: ClassVar[int] = 2
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6813,6 +7088,10 @@ class RiteOfDispatchStatus(CharacterStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -6949,6 +7228,10 @@ class BreakthroughStatus(CharacterStatus, _UsageLivingStatus):
                 return replace(self, should_stack=True)
         return self
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -7034,6 +7317,10 @@ class TurnControlStatus(TalentEquipmentStatus):
         from ..card.card import TurnControl
         return TurnControl
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.ROLL_DICE_INIT,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
@@ -7154,6 +7441,11 @@ class NiwabiEnshouStatus(CharacterStatus, _UsageStatus):
         TriggeringSignal.POST_SKILL,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_ELEMENT,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self, game_state: GameState, status_source: StaticTarget, item: PreprocessableEvent,
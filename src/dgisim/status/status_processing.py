@@ -1,4 +1,5 @@
 from __future__ import annotations
+from itertools import chain
 from typing import Callable, TYPE_CHECKING
 
 from ..effect import effect as eft
@@ -168,6 +169,33 @@ class StatusProcessing:
         )
         return game_state
 
+    @staticmethod
+    def _trigger_effect(
+            status: stt.Status,
+            target: StaticTarget,
+            signal: TriggeringSignal,
+            detail: None | InformableEvent,
+    ) -> eft.TriggerrbleEffect:
+        """ :returns: the effect that triggers `status` at `target` on `signal`. """
+        if isinstance(status, stt.PersonalStatus):
+            return eft.TriggerStatusEffect(target, type(status), signal, detail)
+
+        elif isinstance(status, stt.PlayerHiddenStatus):
+            return eft.TriggerHiddenStatusEffect(target.pid, type(status), signal, detail)
+
+        elif isinstance(status, stt.CombatStatus):
+            return eft.TriggerCombatStatusEffect(target.pid, type(status), signal, detail)
+
+        elif isinstance(status, sm.Summon):
+            return eft.TriggerSummonEffect(target.pid, type(status), signal, detail)
+
+        elif isinstance(status, sp.Support):
+            return eft.TriggerSupportEffect(
+                target.pid, type(status), status.sid, signal, detail
+            )
+
+        raise NotImplementedError(f"{status} cannot be triggered")  # pragma: no cover
+
     @staticmethod
     def trigger_all_statuses_effects(
             game_state: GameState, pid: Pid, signal: TriggeringSignal,
@@ -177,39 +205,32 @@ class StatusProcessing:
         """
         Takes the current game_state, trigger all statuses in order of player pid
         Returns the triggering effects in order (first to last)
-        """
-        effects: list[eft.TriggerrbleEffect] = []
-
-        def f(game_state: GameState, status: stt.Status, target: StaticTarget) -> GameState:
-            nonlocal effects
-            if signal not in status.REACTABLE_SIGNALS:
-                return game_state
-
-            if isinstance(status, stt.PersonalStatus):
-                effects.append(eft.TriggerStatusEffect(target, type(status), signal, detail))
-
-            elif isinstance(status, stt.PlayerHiddenStatus):
-                effects.append(eft.TriggerHiddenStatusEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, stt.CombatStatus):
-                effects.append(eft.TriggerCombatStatusEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, sm.Summon):
-                effects.append(eft.TriggerSummonEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, sp.Support):
-                effects.append(eft.TriggerSupportEffect(
-                    target.pid, type(status), status.sid, signal, detail
-                ))
 
-            return game_state
-
-        if not is_lethal_dmg:
-            StatusProcessing.loop_all_statuses(game_state, pid, f)
-        else:
+        Only statuses that react to `signal` are visited, see
+        `PlayerState.statuses_reacting_to()`.
+        """
+        reacting_statuses = chain(
+            game_state.get_player(pid).statuses_reacting_to(pid, signal),
+            game_state.get_player(pid.other).statuses_reacting_to(pid.other, signal),
+        )
+        if is_lethal_dmg:
+            # the target's statuses are triggered first, and not again
             assert isinstance(detail, DmgIEvent)
-            StatusProcessing.loop_all_statuses_but_target_first(game_state, pid, detail.dmg.target, f)
-        return effects
+            dmg_target = detail.dmg.target
+            char = game_state.get_character_target(dmg_target)
+            assert char is not None
+            reacting_statuses = chain(
+                ((status, dmg_target) for status in char.statuses_reacting_to(signal)),
+                (
+                    (status, target)
+                    for status, target in reacting_statuses
+                    if target != dmg_target
+                ),
+            )
+        return [
+            StatusProcessing._trigger_effect(status, target, signal, detail)
+            for status, target in reacting_statuses
+        ]
 
     @staticmethod
     def trigger_player_statuses_effects(
@@ -219,34 +240,10 @@ class StatusProcessing:
         Takes the current game_state, trigger all statuses in order of player pid
         Returns the triggering effects in order (first to last)
         """
-        effects: list[eft.Effect] = []
-
-        def f(game_state: GameState, status: stt.Status, target: StaticTarget) -> GameState:
-            nonlocal effects
-            if signal not in status.REACTABLE_SIGNALS:
-                return game_state
-
-            if isinstance(status, stt.PersonalStatus):
-                effects.append(eft.TriggerStatusEffect(target, type(status), signal, detail))
-
-            elif isinstance(status, stt.PlayerHiddenStatus):
-                effects.append(eft.TriggerHiddenStatusEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, stt.CombatStatus):
-                effects.append(eft.TriggerCombatStatusEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, sm.Summon):
-                effects.append(eft.TriggerSummonEffect(target.pid, type(status), signal, detail))
-
-            elif isinstance(status, sp.Support):
-                effects.append(eft.TriggerSupportEffect(
-                    target.pid, type(status), status.sid, signal, detail
-                ))
-
-            return game_state
-
-        StatusProcessing.loop_one_player_all_statuses(game_state, pid, f)
-        return effects
+        return [
+            StatusProcessing._trigger_effect(status, target, signal, detail)
+            for status, target in game_state.get_player(pid).statuses_reacting_to(pid, signal)
+        ]
 
     @staticmethod
     def trigger_personal_statuses_effect(
@@ -256,20 +253,12 @@ class StatusProcessing:
         Takes the current game_state, trigger all statuses of a particular character
         Returns the triggering effects in order (first to last)
         """
-        effects: list[eft.Effect] = []
-
-        def f(game_state: GameState, status: stt.Status, target: StaticTarget) -> GameState:
-            nonlocal effects
-            if signal not in status.REACTABLE_SIGNALS:
-                return game_state
-
-            assert isinstance(status, stt.PersonalStatus)
-            effects.append(eft.TriggerStatusEffect(target, type(status), signal, detail))
-
-            return game_state
-
-        StatusProcessing.loop_character_personal_statuses(game_state, target, f)
-        return effects
+        character = game_state.get_character_target(target)
+        assert character is not None
+        return [
+            StatusProcessing._trigger_effect(status, target, signal, detail)
+            for status in character.statuses_reacting_to(signal)
+        ]
 
     @staticmethod
     def preprocess_by_all_statuses(
@@ -353,7 +342,12 @@ class StatusProcessing:
 
             return game_state
 
-        game_state = StatusProcessing.loop_all_statuses(game_state, pid, f)
+        # only statuses declaring pp_type are visited (see Status.PREPROCESSABLES),
+        # the opponent's are looked up after this player's statuses are done
+        for status_pid in (pid, pid.other):
+            statuses = game_state.get_player(status_pid).statuses_preprocessing(status_pid, pp_type)
+            for status, status_source in statuses:
+                game_state = f(game_state, status, status_source)
         return game_state, item
 
     @staticmethod
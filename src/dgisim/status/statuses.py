@@ -6,9 +6,13 @@ from typing_extensions import override, Self
 
 from ..status import status as stt
 
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
 from ..helper.quality_of_life import just, is_instance_or_subclass
 
 if TYPE_CHECKING:
+    from ..effect.enums import TriggeringSignal
+    from .enums import Preprocessables
     from ..encoding.encoding_plan import EncodingPlan
 
 __all__ = [
@@ -179,6 +183,25 @@ class Statuses:
         """ :returns: tuple of statuses. """
         return self._statuses
 
+    @cached_method
+    def reacting_to(self, signal: TriggeringSignal) -> tuple[stt.Status, ...]:
+        """ :returns: the statuses that react to `signal`, in order. """
+        return tuple(
+            status
+            for status in self._statuses
+            if signal in status.REACTABLE_SIGNALS
+        )
+
+    @cached_method
+    def preprocessing(self, pp_type: Preprocessables) -> tuple[stt.Status, ...]:
+        """ :returns: the statuses that preprocess `pp_type`, in order. """
+        return tuple(
+            status
+            for status in self._statuses
+            if pp_type in status.PREPROCESSABLES
+        )
+
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan, fixed_len: None | int = None) -> list[int]:
         """
         :returns: the encoding of this `Statuses` object.
@@ -200,10 +223,15 @@ class Statuses:
         return len(self._statuses)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, Statuses):  # pragma: no cover
             return False
-        return self is other or self._statuses == other._statuses
+        if known_hashes_differ(self, other):
+            return False
+        return self._statuses == other._statuses
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash(self._statuses)
 
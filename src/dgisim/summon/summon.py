@@ -426,6 +426,10 @@ class ChainsOfWardingThunderSummon(_DmgPerRoundSummon):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SWAP,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -583,6 +587,10 @@ class DandelionFieldSummon(_DestroyOnNumSummon):
         TriggeringSignal.END_ROUND_CHECK_OUT,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -671,6 +679,10 @@ class EyeOfStormyJudgmentSummon(_DmgPerRoundSummon):
     DMG: ClassVar[int] = 1
     ELEMENT: ClassVar[Element] = Element.ELECTRO
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -704,6 +716,10 @@ class FierySanctumFieldSummon(_DmgPerRoundSummon, stt._ShieldStatus):
         TriggeringSignal.POST_DMG,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_MINUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1193,6 +1209,11 @@ class SolarIsotomaSummon(_DmgPerRoundSummon):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1279,6 +1300,10 @@ class TalismanSpiritSummon(_DmgPerRoundSummon):
     ELEMENT: ClassVar[Element] = Element.CRYO
     DMG_BOOST: ClassVar[int] = 1
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.DMG_AMOUNT_PLUS,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -2,9 +2,13 @@ from __future__ import annotations
 from itertools import chain
 from typing import Iterator, Optional, TYPE_CHECKING, TypeVar, Union
 
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
 from ..helper.quality_of_life import just
 
 if TYPE_CHECKING:
+    from ..effect.enums import TriggeringSignal
+    from ..status.enums import Preprocessables
     from ..encoding.encoding_plan import EncodingPlan
     from .summon import Summon
 
@@ -26,6 +30,24 @@ class Summons:
     def get_summons(self) -> tuple[Summon, ...]:
         return self._summons
 
+    @cached_method
+    def reacting_to(self, signal: TriggeringSignal) -> tuple[Summon, ...]:
+        """ :returns: the summons that react to `signal`, in order. """
+        return tuple(
+            summon
+            for summon in self._summons
+            if signal in summon.REACTABLE_SIGNALS
+        )
+
+    @cached_method
+    def preprocessing(self, pp_type: Preprocessables) -> tuple[Summon, ...]:
+        """ :returns: the summons that preprocess `pp_type`, in order. """
+        return tuple(
+            summon
+            for summon in self._summons
+            if pp_type in summon.PREPROCESSABLES
+        )
+
     def find(self, summon_type: type[__InputSummon]) -> None | __InputSummon:
         return next((s for s in self._summons if type(s) is summon_type), None)
 
@@ -77,6 +99,7 @@ class Summons:
     def full(self) -> bool:
         return len(self) == self._max_num
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this `Summons` object.
@@ -112,13 +135,18 @@ class Summons:
         return len(self._summons)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
-        return self is other or (
+        if known_hashes_differ(self, other):
+            return False
+        return (
             self._summons == other._summons
             and self._max_num == other._max_num
         )
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash((
             self._summons,
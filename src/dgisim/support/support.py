@@ -18,8 +18,6 @@ from itertools import chain
 from typing import ClassVar, TYPE_CHECKING
 from typing_extensions import Self, override
 
-import random
-
 from ..dice import AbstractDice, ActualDice
 from ..effect import effect as eft
 from ..event import *
@@ -28,8 +26,10 @@ from ..status import status as stt
 from ..character.enums import CharacterSkillType
 from ..effect.enums import TriggeringSignal, Zone
 from ..effect.structs import StaticTarget
-from ..element import Element, PURE_ELEMENTS
+from ..element import Element, PURE_ELEMENTS_ORDERED
+from ..encoding.encoding_cache import cached_encoding
 from ..helper.quality_of_life import BIG_INT, classproperty
+from ..helper.rng import current_rng
 from ..status.enums import Informables, Preprocessables
 
 if TYPE_CHECKING:
@@ -173,6 +173,10 @@ class ChefMaoSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -203,7 +207,7 @@ class ChefMaoSupport(Support, stt._UsageLivingStatus):
             effects: list[eft.Effect] = [
                 eft.AddDiceEffect(
                     pid=source.pid,
-                    element=random.choice(tuple(PURE_ELEMENTS)),
+                    element=current_rng().choice(PURE_ELEMENTS_ORDERED),
                     num=1,
                 ),
             ]
@@ -231,6 +235,10 @@ class DunyarzadSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -426,6 +434,10 @@ class MamereSupport(Support, stt._UsageStatus):
             ItemCard,
         )
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -451,18 +463,17 @@ class MamereSupport(Support, stt._UsageStatus):
             detail: None | InformableEvent
     ) -> tuple[list[eft.Effect], None | Self]:
         if signal is TriggeringSignal.POST_CARD and self.triggered:
-            from random import choice
             from ..card.card import Mamere
             assert self.activated
-            card_pool = [
+            card_pool = sorted((
                 card
                 for card in game_state.mode.all_cards()
                 if issubclass(card, self._card_categories) and card is not Mamere
-            ]
+            ), key=lambda c: c.__name__)
             return [
                 eft.PrivateAddCardEffect(
                     pid=source.pid,
-                    card=choice(card_pool),
+                    card=current_rng().choice(card_pool),
                 )
             ], replace(self, usages=-1, triggered=False, activated=False)
         elif signal is TriggeringSignal.ROUND_END and not self.activated:
@@ -480,6 +491,10 @@ class MasterZhangSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -631,6 +646,10 @@ class TimaeusSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD2,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -682,6 +701,10 @@ class WagnerSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD2,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -732,6 +755,10 @@ class XudongSupport(Support):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -778,6 +805,10 @@ class YayoiNanatsukiSupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -836,6 +867,10 @@ class NRESupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -975,6 +1010,10 @@ class TreasureSeekingSeelieSupport(Support, stt._UsageLivingStatus):
 
 @dataclass(frozen=True, kw_only=True)
 class KnightsOfFavoniusLibrarySupport(Support):
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.ROLL_CHANCES,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1029,6 +1068,11 @@ class SumeruCitySupport(Support, stt._UsageLivingStatus):
         TriggeringSignal.ROUND_END,
     ))
 
+    PREPROCESSABLES: ClassVar[frozenset[Preprocessables]] = frozenset((
+        Preprocessables.SKILL,
+        Preprocessables.CARD1,
+    ))
+
     @override
     def _preprocess(
             self,
@@ -1170,6 +1214,7 @@ class VanaranaSupport(Support):
         )
 
     @override
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of the content of the status. (excluding the type of status)
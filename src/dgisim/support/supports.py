@@ -2,10 +2,14 @@ from __future__ import annotations
 from itertools import chain
 from typing import Iterator, TYPE_CHECKING
 
+from ..encoding.encoding_cache import cached_encoding
+from ..helper.instance_cache import cached_hash, cached_method, known_hashes_differ
 from ..helper.quality_of_life import just
 from .support import Support
 
 if TYPE_CHECKING:
+    from ..effect.enums import TriggeringSignal
+    from ..status.enums import Preprocessables
     from ..encoding.encoding_plan import EncodingPlan
 
 __all__ = [
@@ -24,6 +28,24 @@ class Supports:
     def get_supports(self) -> tuple[Support, ...]:
         return self._supports
 
+    @cached_method
+    def reacting_to(self, signal: TriggeringSignal) -> tuple[Support, ...]:
+        """ :returns: the supports that react to `signal`, in order. """
+        return tuple(
+            support
+            for support in self._supports
+            if signal in support.REACTABLE_SIGNALS
+        )
+
+    @cached_method
+    def preprocessing(self, pp_type: Preprocessables) -> tuple[Support, ...]:
+        """ :returns: the supports that preprocess `pp_type`, in order. """
+        return tuple(
+            support
+            for support in self._supports
+            if pp_type in support.PREPROCESSABLES
+        )
+
     def find(self, support_type: type[Support], sid: int) -> None | Support:
         return next((
             s
@@ -113,6 +135,7 @@ class Supports:
     def __contains__(self, support_type: type[Support]) -> bool:
         return self.contains(support_type)
 
+    @cached_encoding
     def encoding(self, encoding_plan: EncodingPlan) -> list[int]:
         """
         :returns: the encoding of this `Summons` object.
@@ -139,13 +162,18 @@ class Supports:
         return len(self._supports)
 
     def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
         if not isinstance(other, type(self)):
             return False
-        return self is other or (
+        if known_hashes_differ(self, other):
+            return False
+        return (
             self._supports == other._supports
             and self._max_num == other._max_num
         )
 
+    @cached_hash
     def __hash__(self) -> int:
         return hash((
             self._supports,
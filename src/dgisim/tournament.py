@@ -0,0 +1,540 @@
+"""
+This file contains a tournament harness ranking decks by playing them against
+each other, built on top of `selfplay.run_game()`.
+"""
+import json
+import math
+import os
+import random
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from enum import Enum
+from statistics import NormalDist
+from typing import Any, Sequence
+
+from .agents import RandomAgent
+from .deck import FrozenDeck
+from .mode import DefaultMode, Mode
+from .selfplay import AgentFactory, run_game
+from .state.enums import Pid
+
+__all__ = [
+    "EntrantStats",
+    "PairingStats",
+    "Tournament",
+    "TournamentFormat",
+    "TournamentResult",
+    "wilson_interval",
+]
+
+
+class TournamentFormat(Enum):
+    #: every deck plays every other deck
+    ROUND_ROBIN = "round-robin"
+    #: each round pairs decks of similar points that haven't met yet
+    SWISS = "swiss"
+
+
+def wilson_interval(successes: float, n: int, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    :param successes: the number of successes, draws may count as half ones.
+    :param n: the number of trials.
+    :param confidence: the confidence level of the interval.
+    :returns: the Wilson score interval of the success rate, `(0.0, 1.0)` if
+              there is no trial.
+    """
+    if n == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+    denominator = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+@dataclass(frozen=True)
+class PairingStats:
+    """
+    The results of the games between the decks `a` and `b` in a round.
+    (there's only round 0 in round-robin tournaments)
+    """
+    round: int
+    a: int
+    b: int
+    wins_a: int
+    wins_b: int
+    draws: int
+
+    @property
+    def games(self) -> int:
+        return self.wins_a + self.wins_b + self.draws
+
+    def win_rate(self) -> float:
+        """ :returns: the win rate of `a`, where draws count as half wins. """
+        if self.games == 0:
+            return 0.5
+        return (self.wins_a + self.draws / 2) / self.games
+
+    def confidence_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """ :returns: the Wilson score interval of the win rate of `a`. """
+        return wilson_interval(self.wins_a + self.draws / 2, self.games, confidence)
+
+    def decided(self, confidence: float) -> bool:
+        """
+        :returns: `True` if the confidence interval of the win rate excludes
+                  0.5, meaning the better deck of the two is known.
+        """
+        low, high = self.confidence_interval(confidence)
+        return low > 0.5 or high < 0.5
+
+
+@dataclass(frozen=True)
+class EntrantStats:
+    """
+    The results of all games of a deck in a tournament.
+    """
+    index: int
+    deck: FrozenDeck
+    wins: int
+    losses: int
+    draws: int
+    #: pairings won (1 each) and tied (0.5 each), including byes of Swiss rounds
+    points: float
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses + self.draws
+
+    def win_rate(self) -> float:
+        """ :returns: the win rate of the deck, where draws count as half wins. """
+        if self.games == 0:
+            return 0.5
+        return (self.wins + self.draws / 2) / self.games
+
+    def confidence_interval(self, confidence: float = 0.95) -> tuple[float, float]:
+        """
+        :returns: the Wilson score interval of the win rate, which treats all
+                  games as if they were against the same opponent.
+        """
+        return wilson_interval(self.wins + self.draws / 2, self.games, confidence)
+
+
+@dataclass(frozen=True)
+class TournamentResult:
+    decks: tuple[FrozenDeck, ...]
+    pairings: tuple[PairingStats, ...]
+    byes: tuple[int, ...]
+    confidence: float
+
+    def standings(self) -> list[EntrantStats]:
+        """ :returns: the stats of all decks, from the highest win rate to the lowest. """
+        wins = [0] * len(self.decks)
+        losses = [0] * len(self.decks)
+        draws = [0] * len(self.decks)
+        points = _points(self.pairings, self.byes, len(self.decks))
+        for pairing in self.pairings:
+            wins[pairing.a] += pairing.wins_a
+            losses[pairing.a] += pairing.wins_b
+            wins[pairing.b] += pairing.wins_b
+            losses[pairing.b] += pairing.wins_a
+            draws[pairing.a] += pairing.draws
+            draws[pairing.b] += pairing.draws
+        stats = [
+            EntrantStats(i, deck, wins[i], losses[i], draws[i], points[i])
+            for i, deck in enumerate(self.decks)
+        ]
+        stats.sort(key=lambda s: (-s.win_rate(), s.index))
+        return stats
+
+    def __str__(self) -> str:
+        pct = f"{self.confidence:.0%}"
+        lines = [f"{'rank':>4} {'deck':>4} {'games':>7} {'win rate':>8}  {pct} CI"]
+        for rank, stats in enumerate(self.standings(), start=1):
+            low, high = stats.confidence_interval(self.confidence)
+            lines.append(
+                f"{rank:>4} {stats.index:>4} {stats.games:>7} {stats.win_rate():>8.3f}"
+                f"  [{low:.3f}, {high:.3f}]"
+            )
+        return "\n".join(lines)
+
+
+def _points(
+        pairings: Sequence[PairingStats], byes: Sequence[int], num_decks: int
+) -> list[float]:
+    points = [0.0] * num_decks
+    for pairing in pairings:
+        win_rate = pairing.win_rate()
+        if win_rate > 0.5:
+            points[pairing.a] += 1
+        elif win_rate < 0.5:
+            points[pairing.b] += 1
+        else:
+            points[pairing.a] += 0.5
+            points[pairing.b] += 0.5
+    for index in byes:
+        points[index] += 1
+    return points
+
+
+# the decks, agent factories and mode of the tournament run by a worker process
+_worker_setup: None | tuple[Sequence[FrozenDeck], Sequence[AgentFactory], Mode] = None
+
+
+def _init_worker(
+        decks: Sequence[FrozenDeck], agent_factories: Sequence[AgentFactory], mode: Mode
+) -> None:
+    global _worker_setup
+    _worker_setup = (decks, agent_factories, mode)
+
+
+def _play_batch(a: int, b: int, games: Sequence[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    :param games: (index, seed) of the games to play, `a` is player 1 in games
+                  of even indices and player 2 otherwise.
+    :returns: (index, outcome) of the games, where the outcome is 0 if `a` won,
+              1 if `b` won and -1 for a draw.
+    """
+    assert _worker_setup is not None
+    decks, agent_factories, mode = _worker_setup
+    outcomes = []
+    for index, seed in games:
+        p1, p2 = (a, b) if index % 2 == 0 else (b, a)
+        winner = run_game(
+            index,
+            seed,
+            (agent_factories[p1], agent_factories[p2]),
+            mode,
+            (decks[p1], decks[p2]),
+        ).winner
+        if winner is None:
+            outcomes.append((index, -1))
+        else:
+            outcomes.append((index, 0 if (winner is Pid.P1) == (p1 == a) else 1))
+    return outcomes
+
+
+@dataclass
+class _Tally:
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+    #: the index of the next new game to play
+    next_game: int = 0
+    #: games below `next_game` missing from a checkpoint, played before new ones
+    missing: list[int] = field(default_factory=list)
+    #: batches sent to the process pool and not recorded yet
+    in_flight: int = 0
+
+    def add(self, outcome: int) -> None:
+        if outcome == 0:
+            self.wins_a += 1
+        elif outcome == 1:
+            self.wins_b += 1
+        else:
+            self.draws += 1
+
+
+class Tournament:
+    """
+    Ranks decks by playing them against each other.
+
+    Games are played in batches across a process pool. A pairing stops early
+    once the better of its two decks is statistically known, see
+    `PairingStats.decided()`. Results can be checkpointed to a file, so an
+    interrupted tournament continues from where it stopped.
+
+    Every game has a seed derived from the tournament seed, the pairing and the
+    index of the game, and the decks swap sides every game, so a tournament
+    with a fixed seed is reproducible. Once a pairing has played `min_games`,
+    it only has one batch in the process pool at a time, so it stops early
+    after the same games whether played in a pool or not.
+    """
+
+    def __init__(
+            self,
+            decks: Sequence[FrozenDeck],
+            agent_factories: AgentFactory | Sequence[AgentFactory] = RandomAgent,
+            mode: Mode = DefaultMode(),
+            tournament_format: TournamentFormat = TournamentFormat.ROUND_ROBIN,
+            games_per_pairing: int = 100,
+            swiss_rounds: None | int = None,
+            batch_size: int = 10,
+            min_games: int = 20,
+            stop_confidence: None | float = 0.99,
+            confidence: float = 0.95,
+            workers: None | int = None,
+            seed: None | int = None,
+            checkpoint: None | str | os.PathLike = None,
+    ) -> None:
+        """
+        :param decks: the decks in the tournament.
+        :param agent_factories: the factory creating the agent playing each deck,
+                                or one factory for all decks.
+        :param mode: the mode of the games.
+        :param tournament_format: round-robin or Swiss.
+        :param games_per_pairing: the maximum number of games of a pairing.
+        :param swiss_rounds: the number of rounds of a Swiss tournament, defaults
+                             to log2 of the number of decks rounded up.
+        :param batch_size: the number of games sent to a worker at a time.
+        :param min_games: the number of games a pairing plays before it can stop
+                          early.
+        :param stop_confidence: the confidence level at which a pairing stops
+                                early, None to play all games of all pairings.
+                                It is stricter than `confidence` by default, as
+                                a pairing is tested after every batch.
+        :param confidence: the confidence level of the reported intervals.
+        :param workers: the number of worker processes, defaults to the number of
+                        cores. If it is 1 or less, games are played in the
+                        current process.
+        :param seed: the seed of the tournament. If `None`, the seed of the
+                     checkpoint is used, or a random one if there's none.
+        :param checkpoint: the file results are appended to as games finish. If
+                           it exists, the tournament continues from its results,
+                           and ValueError is raised if it is of other decks,
+                           mode, format or seed.
+
+        `agent_factories` and `mode` must be picklable to use a process pool.
+        """
+        if len(decks) < 2:
+            raise ValueError("a tournament needs at least 2 decks")
+        self._decks = tuple(decks)
+        if callable(agent_factories):
+            self._agent_factories: tuple[AgentFactory, ...] = (agent_factories,) * len(decks)
+        else:
+            self._agent_factories = tuple(agent_factories)
+            if len(self._agent_factories) != len(decks):
+                raise ValueError("agent_factories must be one factory or one per deck")
+        self._mode = mode
+        self._format = tournament_format
+        self._games_per_pairing = games_per_pairing
+        if swiss_rounds is None:
+            swiss_rounds = max(1, math.ceil(math.log2(len(decks))))
+        self._swiss_rounds = swiss_rounds
+        self._batch_size = batch_size
+        self._min_games = min_games
+        self._stop_confidence = stop_confidence
+        self._confidence = confidence
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self._workers = workers
+        self._seed_given = seed is not None
+        self._seed = random.getrandbits(32) if seed is None else seed
+        self._checkpoint = checkpoint
+        self._tallies: dict[tuple[int, int, int], _Tally] = defaultdict(_Tally)
+
+    def run(self) -> TournamentResult:
+        """ :returns: the result of the whole tournament. """
+        log = self._open_checkpoint()
+        executor: None | Executor = None
+        if self._workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                initializer=_init_worker,
+                initargs=(self._decks, self._agent_factories, self._mode),
+            )
+        else:
+            _init_worker(self._decks, self._agent_factories, self._mode)
+        try:
+            byes: list[int] = []
+            if self._format is TournamentFormat.ROUND_ROBIN:
+                pairings = [
+                    (a, b)
+                    for a in range(len(self._decks))
+                    for b in range(a + 1, len(self._decks))
+                ]
+                self._play_round(0, pairings, executor, log)
+            else:
+                for round in range(self._swiss_rounds):
+                    pairings, bye = self._swiss_pairings(round, byes)
+                    if bye is not None:
+                        byes.append(bye)
+                    self._play_round(round, pairings, executor, log)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if log is not None:
+                log.close()
+        return TournamentResult(
+            decks=self._decks,
+            pairings=self._pairing_stats(),
+            byes=tuple(byes),
+            confidence=self._confidence,
+        )
+
+    def _pairing_stats(self, rounds: None | int = None) -> tuple[PairingStats, ...]:
+        return tuple(
+            PairingStats(round, a, b, tally.wins_a, tally.wins_b, tally.draws)
+            for (round, a, b), tally in sorted(self._tallies.items())
+            if rounds is None or round < rounds
+        )
+
+    def _swiss_pairings(
+            self, round: int, byes: Sequence[int]
+    ) -> tuple[list[tuple[int, int]], None | int]:
+        """
+        :returns: the pairings of `round` and the deck with a bye if any.
+
+        Decks are paired from the highest points down, each with the next deck
+        it hasn't played yet if possible.
+        """
+        previous = self._pairing_stats(round)
+        points = _points(previous, byes, len(self._decks))
+        met = {(p.a, p.b) for p in previous} | {(p.b, p.a) for p in previous}
+        order = sorted(range(len(self._decks)), key=lambda i: (-points[i], i))
+        bye = None
+        if len(order) % 2 == 1:
+            # the lowest ranked deck that hasn't had a bye yet
+            bye = next((i for i in reversed(order) if i not in byes), order[-1])
+            order.remove(bye)
+        pairings = []
+        while order:
+            a = order.pop(0)
+            b = next((i for i in order if (a, i) not in met), order[0])
+            order.remove(b)
+            pairings.append((min(a, b), max(a, b)))
+        return pairings, bye
+
+    def _finished(self, tally: _Tally) -> bool:
+        if tally.missing:
+            # games an uninterrupted run would have played, whatever their results
+            return False
+        if tally.next_game >= self._games_per_pairing:
+            return True
+        games = tally.wins_a + tally.wins_b + tally.draws
+        if self._stop_confidence is None or games < self._min_games:
+            return False
+        return PairingStats(0, 0, 1, tally.wins_a, tally.wins_b, tally.draws).decided(
+            self._stop_confidence
+        )
+
+    def _can_send(self, tally: _Tally) -> bool:
+        """
+        :returns: `True` if another batch of the pairing can be sent to the pool
+                  while others are in flight, which is only when the games are
+                  played whatever the results of the batches in flight are.
+                  Otherwise the pairing waits, so that it can stop early.
+        """
+        return (
+            tally.in_flight == 0
+            or self._stop_confidence is None
+            or len(tally.missing) > 0
+            or tally.next_game < self._min_games
+        )
+
+    def _game_seed(self, round: int, a: int, b: int, index: int) -> int:
+        # str seeds are hashed with sha512, which is the same in all processes
+        return random.Random(f"{self._seed}:{round}:{a}:{b}:{index}").getrandbits(32)
+
+    def _play_round(
+            self,
+            round: int,
+            pairings: Sequence[tuple[int, int]],
+            executor: None | Executor,
+            log: Any,
+    ) -> None:
+        active = list(pairings)
+        in_flight: dict[Future, tuple[int, int]] = {}
+        # a few batches per worker keeps all workers busy
+        max_in_flight = 2 * self._workers
+        next_pairing = 0
+        while active or in_flight:
+            # pairings passed over in a row, as they are waiting for results
+            waiting = 0
+            while active and len(in_flight) < max_in_flight and waiting < len(active):
+                next_pairing %= len(active)
+                a, b = active[next_pairing]
+                tally = self._tallies[(round, a, b)]
+                if self._finished(tally):
+                    active.pop(next_pairing)
+                    continue
+                next_pairing += 1
+                if not self._can_send(tally):
+                    waiting += 1
+                    continue
+                waiting = 0
+                indices = tally.missing[:self._batch_size]
+                del tally.missing[:self._batch_size]
+                end = min(
+                    tally.next_game + self._batch_size - len(indices),
+                    self._games_per_pairing,
+                )
+                indices.extend(range(tally.next_game, end))
+                tally.next_game = max(tally.next_game, end)
+                games = [(index, self._game_seed(round, a, b, index)) for index in indices]
+                if executor is None:
+                    self._record(round, a, b, _play_batch(a, b, games), log)
+                else:
+                    in_flight[executor.submit(_play_batch, a, b, games)] = (a, b)
+                    tally.in_flight += 1
+            if in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    a, b = in_flight.pop(future)
+                    self._tallies[(round, a, b)].in_flight -= 1
+                    self._record(round, a, b, future.result(), log)
+
+    def _record(
+            self, round: int, a: int, b: int, outcomes: Sequence[tuple[int, int]], log: Any
+    ) -> None:
+        tally = self._tallies[(round, a, b)]
+        for _, outcome in outcomes:
+            tally.add(outcome)
+        if log is not None:
+            log.write("".join(
+                json.dumps([round, a, b, index, outcome]) + "\n"
+                for index, outcome in outcomes
+            ))
+            log.flush()
+
+    def _header(self) -> dict[str, Any]:
+        return {
+            "seed": self._seed,
+            "mode": type(self._mode).__name__,
+            "format": self._format.value,
+            "decks": [deck.to_json() for deck in self._decks],
+        }
+
+    def _open_checkpoint(self) -> Any:
+        """
+        :returns: the checkpoint file to append results to, after loading the
+                  results already in it.
+        """
+        if self._checkpoint is None:
+            return None
+        if not os.path.exists(self._checkpoint) or os.path.getsize(self._checkpoint) == 0:
+            log = open(self._checkpoint, "wt")
+            log.write(json.dumps(self._header()) + "\n")
+            log.flush()
+            return log
+
+        with open(self._checkpoint, "rt") as fin:
+            lines = fin.read().split("\n")
+        header = json.loads(lines[0])
+        if not self._seed_given:
+            self._seed = header["seed"]
+        if header != self._header():
+            raise ValueError(f"checkpoint {self._checkpoint} is of another tournament")
+        recorded: dict[tuple[int, int, int], set[int]] = defaultdict(set)
+        for line in lines[1:]:
+            try:
+                round, a, b, index, outcome = json.loads(line)
+            except ValueError:
+                # an empty or partially written last line
+                continue
+            if index in recorded[(round, a, b)]:
+                continue
+            recorded[(round, a, b)].add(index)
+            tally = self._tallies[(round, a, b)]
+            tally.add(outcome)
+            tally.next_game = max(tally.next_game, index + 1)
+        # batches of a pairing played in a pool may finish out of order, so the
+        # interruption may leave gaps
+        for key, indices in recorded.items():
+            tally = self._tallies[key]
+            tally.missing = [i for i in range(tally.next_game) if i not in indices]
+        log = open(self._checkpoint, "at")
+        if lines[-1] != "":
+            log.write("\n")
+        return log
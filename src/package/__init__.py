@@ -2,56 +2,208 @@ __version__ = "0.6.0"
 
 from ._env_check import *
 
-from ..dgisim.cli import *
-from ..dgisim.deck import *
-from ..dgisim.dice import *
-from ..dgisim.element import *
-from ..dgisim.event import *
-from ..dgisim.game_state_machine import *
-from ..dgisim.mode import *
-from ..dgisim.player_agent import *
-
-from ..dgisim.action.action import *
-from ..dgisim.action.action_generator import *
-from ..dgisim.action.action_generator_generator import *
-from ..dgisim.action.enums import *
-from ..dgisim.action.types import *
-
-from ..dgisim.card.card import Card
-from ..dgisim.card.cards import *
-from ..dgisim.card.cards_set import *
-
-from ..dgisim.character.character import Character
-from ..dgisim.character.characters import *
-from ..dgisim.character.characters_set import *
-from ..dgisim.character.enums import *
-
-from ..dgisim.effect.effect import Effect
-from ..dgisim.effect.effect_stack import *
-from ..dgisim.effect.effects_template import *
-from ..dgisim.effect.enums import *
-from ..dgisim.effect.structs import *
-
-from ..dgisim.encoding.encoding_plan import *
-
-from ..dgisim.env.linear_env import *
-
-from ..dgisim.helper.hashable_dict import *
-
-from ..dgisim.phase.phase import *
-from ..dgisim.phase.default import *
-
-from ..dgisim.state.enums import *
-from ..dgisim.state.game_state import *
-from ..dgisim.state.player_state import *
-
-from ..dgisim.status.enums import *
-from ..dgisim.status.status_processing import *
-from ..dgisim.status.status import Status
-from ..dgisim.status.statuses import *
-
-from ..dgisim.summon.summon import Summon
-from ..dgisim.summon.summons import *
-
-from ..dgisim.support.support import Support
-from ..dgisim.support.supports import *
+from typing import TYPE_CHECKING, Any
+
+from ._lazy_index import LAZY_INDEX as _LAZY_INDEX
+
+# The modules of the package are only imported on first access to their
+# names, which keeps `import dgisim` fast. (the catalogues of cards,
+# characters and statuses take most of the import time)
+#
+# After changing the imports below, regenerate the index with
+# `python scripts/py/lazy_index.py`.
+if TYPE_CHECKING:
+    from ..dgisim.cli import *
+    from ..dgisim.deck import *
+    from ..dgisim.dice import *
+    from ..dgisim.element import *
+    from ..dgisim.event import *
+    from ..dgisim.game_state_machine import *
+    from ..dgisim.mode import *
+    from ..dgisim.player_agent import *
+
+    from ..dgisim.action.action import *
+    from ..dgisim.action.action_generator import *
+    from ..dgisim.action.action_generator_generator import *
+    from ..dgisim.action.enums import *
+    from ..dgisim.action.types import *
+
+    from ..dgisim.card.card import Card
+    from ..dgisim.card.cards import *
+    from ..dgisim.card.cards_set import *
+
+    from ..dgisim.character.character import Character
+    from ..dgisim.character.characters import *
+    from ..dgisim.character.characters_set import *
+    from ..dgisim.character.enums import *
+
+    from ..dgisim.effect.effect import Effect
+    from ..dgisim.effect.effect_stack import *
+    from ..dgisim.effect.effects_template import *
+    from ..dgisim.effect.enums import *
+    from ..dgisim.effect.structs import *
+
+    from ..dgisim.encoding.encoding_plan import *
+
+    from ..dgisim.env.linear_env import *
+
+    from ..dgisim.helper.hashable_dict import *
+    from ..dgisim.helper.rng import *
+
+    from ..dgisim.phase.phase import *
+    from ..dgisim.phase.default import *
+
+    from ..dgisim.state.enums import *
+    from ..dgisim.state.game_state import *
+    from ..dgisim.state.player_state import *
+
+    from ..dgisim.status.enums import *
+    from ..dgisim.status.status_processing import *
+    from ..dgisim.status.status import Status
+    from ..dgisim.status.statuses import *
+
+    from ..dgisim.summon.summon import Summon
+    from ..dgisim.summon.summons import *
+
+    from ..dgisim.support.support import Support
+    from ..dgisim.support.supports import *
+
+# generated with the index, a literal list so that type checkers can read it
+__all__ = [
+    "AURA_ELEMENTS",
+    "AURA_ELEMENTS_ORDERED",
+    "AbstractDice",
+    "Act",
+    "ActionGenerator",
+    "ActionPEvent",
+    "ActionPhase",
+    "ActionType",
+    "ActualDice",
+    "AllOmniMode",
+    "CLISession",
+    "Card",
+    "CardActGenGenerator",
+    "CardAction",
+    "CardPEvent",
+    "CardSelectPhase",
+    "Cards",
+    "CardsSelectAction",
+    "CardsSelectionActGenGenerator",
+    "Character",
+    "CharacterDeathIEvent",
+    "CharacterSelectAction",
+    "CharacterSkill",
+    "CharacterSkillType",
+    "Characters",
+    "DamageType",
+    "DeathSwapAction",
+    "DecidedChoiceType",
+    "Deck",
+    "DeckSampler",
+    "DefaultMode",
+    "Dice",
+    "DiceOnlyInstruction",
+    "DiceRollInitPEvent",
+    "DiceSelectAction",
+    "DiceSelectionActGenGenerator",
+    "DmgIEvent",
+    "DmgPEvent",
+    "DynamicCharacterTarget",
+    "Effect",
+    "EffectStack",
+    "ElemTuningActGenGenerator",
+    "Element",
+    "ElementalAura",
+    "ElementalTuningAction",
+    "EncodingPlan",
+    "EndPhase",
+    "EndRoundAction",
+    "EquipmentDiscardIEvent",
+    "EventSpeed",
+    "EventSubType",
+    "EventType",
+    "Faction",
+    "FrozenDeck",
+    "GameAction",
+    "GameEndPhase",
+    "GameItem",
+    "GameItemType",
+    "GameState",
+    "GameStateMachine",
+    "GivenChoiceType",
+    "HashableDict",
+    "HealingIEvent",
+    "InformableEvent",
+    "Informables",
+    "Instruction",
+    "LazyEncodingPlan",
+    "LinearEnv",
+    "Mode",
+    "MutableDeck",
+    "PURE_ELEMENTS_ORDERED",
+    "Phase",
+    "Pid",
+    "PlayerAction",
+    "PlayerAgent",
+    "PlayerState",
+    "PreprocessableEvent",
+    "Preprocessables",
+    "Reaction",
+    "ReactionDetail",
+    "ReactionIEvent",
+    "RollChancePEvent",
+    "RollPhase",
+    "SkillActGenGenerator",
+    "SkillAction",
+    "SkillIEvent",
+    "SourceTargetInstruction",
+    "StartingHandSelectPhase",
+    "StaticTarget",
+    "StaticTargetInstruction",
+    "Status",
+    "StatusProcessing",
+    "Statuses",
+    "Summon",
+    "Summons",
+    "Support",
+    "SupportRemovelIEvent",
+    "Supports",
+    "SwapActGenGenerator",
+    "SwapAction",
+    "SwapIEvent",
+    "TriggeringSignal",
+    "WeaponType",
+    "Zone",
+    "budget_post_effect",
+    "card_pool",
+    "current_rng",
+    "default_cards",
+    "default_characters",
+    "encoding_plan",
+    "normal_attack_template",
+    "standard_post_effects",
+    "using_rng",
+]
+
+# modules that can only be imported after `effect.effect`, due to the import
+# cycles between effects and statuses
+_AFTER_EFFECTS = (
+    "..dgisim.effect.effects_template",
+    "..dgisim.status.",
+)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_INDEX.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    if module_name.startswith(_AFTER_EFFECTS):
+        import_module("..dgisim.effect.effect", __name__)
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_INDEX})
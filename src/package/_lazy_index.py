@@ -0,0 +1,119 @@
+# This file is generated by `python scripts/py/lazy_index.py`, do not edit.
+# Run the script again after changing the exports of `__init__.py`.
+
+#: the module (relative to this package) of each name exported by the package
+LAZY_INDEX: dict[str, str] = {
+    "AURA_ELEMENTS": "..dgisim.element",
+    "AURA_ELEMENTS_ORDERED": "..dgisim.element",
+    "AbstractDice": "..dgisim.dice",
+    "Act": "..dgisim.state.enums",
+    "ActionGenerator": "..dgisim.action.action_generator",
+    "ActionPEvent": "..dgisim.event",
+    "ActionPhase": "..dgisim.phase.default",
+    "ActionType": "..dgisim.action.enums",
+    "ActualDice": "..dgisim.dice",
+    "AllOmniMode": "..dgisim.mode",
+    "CLISession": "..dgisim.cli",
+    "Card": "..dgisim.card.card",
+    "CardActGenGenerator": "..dgisim.action.action_generator_generator",
+    "CardAction": "..dgisim.action.action",
+    "CardPEvent": "..dgisim.event",
+    "CardSelectPhase": "..dgisim.phase.default",
+    "Cards": "..dgisim.card.cards",
+    "CardsSelectAction": "..dgisim.action.action",
+    "CardsSelectionActGenGenerator": "..dgisim.action.action_generator_generator",
+    "Character": "..dgisim.character.character",
+    "CharacterDeathIEvent": "..dgisim.event",
+    "CharacterSelectAction": "..dgisim.action.action",
+    "CharacterSkill": "..dgisim.character.enums",
+    "CharacterSkillType": "..dgisim.character.enums",
+    "Characters": "..dgisim.character.characters",
+    "DamageType": "..dgisim.effect.structs",
+    "DeathSwapAction": "..dgisim.action.action",
+    "DecidedChoiceType": "..dgisim.action.types",
+    "Deck": "..dgisim.deck",
+    "DeckSampler": "..dgisim.deck",
+    "DefaultMode": "..dgisim.mode",
+    "Dice": "..dgisim.dice",
+    "DiceOnlyInstruction": "..dgisim.action.action",
+    "DiceRollInitPEvent": "..dgisim.event",
+    "DiceSelectAction": "..dgisim.action.action",
+    "DiceSelectionActGenGenerator": "..dgisim.action.action_generator_generator",
+    "DmgIEvent": "..dgisim.event",
+    "DmgPEvent": "..dgisim.event",
+    "DynamicCharacterTarget": "..dgisim.effect.enums",
+    "Effect": "..dgisim.effect.effect",
+    "EffectStack": "..dgisim.effect.effect_stack",
+    "ElemTuningActGenGenerator": "..dgisim.action.action_generator_generator",
+    "Element": "..dgisim.element",
+    "ElementalAura": "..dgisim.element",
+    "ElementalTuningAction": "..dgisim.action.action",
+    "EncodingPlan": "..dgisim.encoding.encoding_plan",
+    "EndPhase": "..dgisim.phase.default",
+    "EndRoundAction": "..dgisim.action.action",
+    "EquipmentDiscardIEvent": "..dgisim.event",
+    "EventSpeed": "..dgisim.event",
+    "EventSubType": "..dgisim.event",
+    "EventType": "..dgisim.event",
+    "Faction": "..dgisim.character.enums",
+    "FrozenDeck": "..dgisim.deck",
+    "GameAction": "..dgisim.action.action",
+    "GameEndPhase": "..dgisim.phase.default",
+    "GameItem": "..dgisim.encoding.encoding_plan",
+    "GameItemType": "..dgisim.encoding.encoding_plan",
+    "GameState": "..dgisim.state.game_state",
+    "GameStateMachine": "..dgisim.game_state_machine",
+    "GivenChoiceType": "..dgisim.action.types",
+    "HashableDict": "..dgisim.helper.hashable_dict",
+    "HealingIEvent": "..dgisim.event",
+    "InformableEvent": "..dgisim.event",
+    "Informables": "..dgisim.status.enums",
+    "Instruction": "..dgisim.action.action",
+    "LazyEncodingPlan": "..dgisim.encoding.encoding_plan",
+    "LinearEnv": "..dgisim.env.linear_env",
+    "Mode": "..dgisim.mode",
+    "MutableDeck": "..dgisim.deck",
+    "PURE_ELEMENTS_ORDERED": "..dgisim.element",
+    "Phase": "..dgisim.phase.phase",
+    "Pid": "..dgisim.state.enums",
+    "PlayerAction": "..dgisim.action.action",
+    "PlayerAgent": "..dgisim.player_agent",
+    "PlayerState": "..dgisim.state.player_state",
+    "PreprocessableEvent": "..dgisim.event",
+    "Preprocessables": "..dgisim.status.enums",
+    "Reaction": "..dgisim.element",
+    "ReactionDetail": "..dgisim.element",
+    "ReactionIEvent": "..dgisim.event",
+    "RollChancePEvent": "..dgisim.event",
+    "RollPhase": "..dgisim.phase.default",
+    "SkillActGenGenerator": "..dgisim.action.action_generator_generator",
+    "SkillAction": "..dgisim.action.action",
+    "SkillIEvent": "..dgisim.event",
+    "SourceTargetInstruction": "..dgisim.action.action",
+    "StartingHandSelectPhase": "..dgisim.phase.default",
+    "StaticTarget": "..dgisim.effect.structs",
+    "StaticTargetInstruction": "..dgisim.action.action",
+    "Status": "..dgisim.status.status",
+    "StatusProcessing": "..dgisim.status.status_processing",
+    "Statuses": "..dgisim.status.statuses",
+    "Summon": "..dgisim.summon.summon",
+    "Summons": "..dgisim.summon.summons",
+    "Support": "..dgisim.support.support",
+    "SupportRemovelIEvent": "..dgisim.event",
+    "Supports": "..dgisim.support.supports",
+    "SwapActGenGenerator": "..dgisim.action.action_generator_generator",
+    "SwapAction": "..dgisim.action.action",
+    "SwapIEvent": "..dgisim.event",
+    "TriggeringSignal": "..dgisim.effect.enums",
+    "WeaponType": "..dgisim.character.enums",
+    "Zone": "..dgisim.effect.enums",
+    "budget_post_effect": "..dgisim.effect.effects_template",
+    "card_pool": "..dgisim.deck",
+    "current_rng": "..dgisim.helper.rng",
+    "default_cards": "..dgisim.card.cards_set",
+    "default_characters": "..dgisim.character.characters_set",
+    "encoding_plan": "..dgisim.encoding.encoding_plan",
+    "normal_attack_template": "..dgisim.effect.effects_template",
+    "standard_post_effects": "..dgisim.effect.effects_template",
+    "using_rng": "..dgisim.helper.rng",
+}
@@ -0,0 +1,3 @@
+from ..dgisim.env.linear_env import *
+from ..dgisim.env.batch_linear_env import *
+from ..dgisim.env.async_batch_linear_env import *
\ No newline at end of file
@@ -0,0 +1 @@
+from ..dgisim.replay import *
@@ -0,0 +1 @@
+from ..dgisim.selfplay import *
\ No newline at end of file
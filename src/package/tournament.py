@@ -0,0 +1 @@
+from ..dgisim.tournament import *
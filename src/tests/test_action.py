@@ -64,6 +64,17 @@ class TestActionEncoding(unittest.TestCase):
             action,
             CardAction.decoding(action.encoding(encoding_plan), encoding_plan),
         )
+        action = CardAction(
+            card=NorthernSmokedChicken,
+            instruction=StaticTargetInstruction(
+                dice=ActualDice.from_empty(),
+                target=StaticTarget.from_char_id(Pid.P2, 2),
+            ),
+        )
+        self.assertEqual(
+            action,
+            CardAction.decoding(action.encoding(encoding_plan), encoding_plan),
+        )
 
     def test_skill_action(self):
         action = SkillAction(
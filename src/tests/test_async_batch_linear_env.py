@@ -0,0 +1,68 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.encoding.encoding_plan import encoding_plan
+from src.dgisim.state.enums import Pid
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestAsyncBatchLinearEnv(unittest.TestCase):
+    def test_same_as_batch_linear_env(self):
+        from src.dgisim.env.async_batch_linear_env import AsyncBatchLinearEnv
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        batch_env = BatchLinearEnv(num_envs=3, seed=7)
+        with AsyncBatchLinearEnv(
+                num_envs=3,
+                num_workers=2,
+                seed=7,
+                return_states=True,
+        ) as async_env:
+            self.assertEqual(async_env.num_workers, 2)
+            agent = RandomAgent(seed=1)
+            states, encoded_states, _, turns, _ = async_env.view()
+            self.assertEqual(states, batch_env.view()[0])
+            for _ in range(30):
+                self.assertTrue((encoded_states == batch_env.view()[1]).all())
+                assert states is not None
+                encoded_actions = np.array([
+                    agent.choose_action([state], Pid(int(turn))).encoding(encoding_plan)
+                    for state, turn in zip(states, turns)
+                ], dtype=np.int32)
+                expected = batch_env.step(encoded_actions)
+                async_env.step_async(encoded_actions)
+                states, encoded_states, rewards, turns, dones = async_env.step_wait()
+                self.assertEqual(states, expected[0])
+                self.assertTrue((rewards == expected[2]).all())
+                self.assertTrue((turns == expected[3]).all())
+                self.assertTrue((dones == expected[4]).all())
+            for pid in Pid:
+                self.assertTrue(
+                    (async_env.static_encodings(pid) == batch_env.static_encodings(pid)).all()
+                )
+
+    def test_shared_buffers_and_reset(self):
+        from src.dgisim.env.async_batch_linear_env import AsyncBatchLinearEnv
+        env = AsyncBatchLinearEnv(num_envs=2, num_workers=2, seed=0)
+        try:
+            states, encoded_states, rewards, turns, dones = env.view()
+            self.assertIsNone(states)
+            self.assertEqual(encoded_states.shape, (2, encoding_plan.game_encoding_size))
+            self.assertFalse(dones.any())
+            # cards select actions with unknown cards
+            invalid_actions = np.full((2, encoding_plan.action_encoding_size), 10_000, dtype=np.int32)
+            invalid_actions[:, 0] = 1
+            _, encoded_states_again, rewards, _, _ = env.step(invalid_actions)
+            self.assertIs(encoded_states, encoded_states_again)
+            self.assertTrue(np.allclose(rewards, -0.1))
+            self.assertEqual(env.final_states(), [None, None])
+            _, _, rewards, _, dones = env.reset()
+            self.assertFalse(rewards.any())
+            self.assertFalse(dones.any())
+        finally:
+            env.close()
+        env.close()  # closing twice is fine
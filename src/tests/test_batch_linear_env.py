@@ -0,0 +1,90 @@
+import unittest
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.encoding.encoding_plan import encoding_plan
+from src.dgisim.state.enums import Pid
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestBatchLinearEnv(unittest.TestCase):
+    def test_buffers(self):
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        env = BatchLinearEnv(num_envs=3)
+        states, encoded_states, rewards, turns, dones = env.view()
+        self.assertEqual(len(states), 3)
+        self.assertEqual(encoded_states.shape, (3, encoding_plan.game_encoding_size))
+        self.assertEqual(encoded_states.dtype, np.int32)
+        self.assertEqual(rewards.shape, (3,))
+        self.assertEqual(turns.shape, (3,))
+        self.assertEqual(dones.shape, (3,))
+        self.assertFalse(dones.any())
+        for state, encoded_state, turn in zip(states, encoded_states, turns):
+            self.assertEqual(
+                encoded_state.tolist(),
+                encoding_plan.encode(state, Pid.P1),
+            )
+            self.assertIn(turn, (1, 2))
+
+        # buffers are reused
+        _, encoded_states_again, _, _, _ = env.view()
+        self.assertIs(encoded_states, encoded_states_again)
+
+    def test_step_with_encoded_actions_and_auto_reset(self):
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        env = BatchLinearEnv(num_envs=2, seed=0)
+        agent = RandomAgent()
+        states, _, _, turns, _ = env.view()
+        games_ended = 0
+        while games_ended == 0:
+            encoded_actions = np.array([
+                agent.choose_action([state], Pid(int(turn))).encoding(encoding_plan)
+                for state, turn in zip(states, turns)
+            ], dtype=np.int32)
+            states, _, rewards, turns, dones = env.step(encoded_actions)
+            self.assertTrue(all(
+                (final_state is not None) == done
+                for final_state, done in zip(env.final_states(), dones)
+            ))
+            games_ended += int(dones.sum())
+            # reset games are ready for the next action
+            self.assertTrue(all(turn in (1, 2) for turn in turns))
+            self.assertTrue(all(not state.game_end() for state in states))
+
+    def test_invalid_action_penalty(self):
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        env = BatchLinearEnv(num_envs=2, invalid_action_penalty=-0.5)
+        states_before, encoded_before, _, _, _ = env.view()
+        encoded_before = encoded_before.copy()
+        # cards select actions with unknown cards
+        invalid_actions = np.full((2, encoding_plan.action_encoding_size), 10_000, dtype=np.int32)
+        invalid_actions[:, 0] = 1
+        self.assertEqual(env.decode_actions(invalid_actions), [None, None])
+        states, encoded_states, rewards, _, dones = env.step(invalid_actions)
+        self.assertEqual(states, states_before)
+        self.assertTrue((encoded_states == encoded_before).all())
+        self.assertTrue(np.allclose(np.abs(rewards), 0.5))
+        self.assertFalse(dones.any())
+
+    def test_seeded_batches_are_reproducible(self):
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        env1 = BatchLinearEnv(num_envs=2, seed=3)
+        env2 = BatchLinearEnv(num_envs=2, seed=3)
+        self.assertEqual(env1.view()[0], env2.view()[0])
+        self.assertTrue((env1.view()[1] == env2.view()[1]).all())
+
+    def test_static_encodings(self):
+        from src.dgisim.env.batch_linear_env import BatchLinearEnv
+        split_plan = encoding_plan.split_static_version()
+        env = BatchLinearEnv(num_envs=2, encoding_plan=split_plan, seed=1)
+        states, encoded_states, _, _, _ = env.view()
+        self.assertEqual(encoded_states.shape, (2, split_plan.game_encoding_size))
+        static_encodings = env.static_encodings()
+        self.assertEqual(static_encodings.shape, (2, split_plan.static_encoding_size))
+        self.assertEqual(static_encodings.dtype, np.int32)
+        for state, static_encoding in zip(states, static_encodings):
+            self.assertEqual(static_encoding.tolist(), split_plan.encode_static(state, Pid.P1))
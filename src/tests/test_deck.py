@@ -1,12 +1,15 @@
+import random
 import unittest
 
 from src.dgisim.card.card import *
 from src.dgisim.character.character import *
-from src.dgisim.deck import Deck, FrozenDeck, MutableDeck
+from src.dgisim.deck import Deck, DeckSampler, FrozenDeck, MutableDeck, card_pool
 from src.dgisim.encoding.encoding_plan import encoding_plan
 from src.dgisim.helper.hashable_dict import HashableDict
+from src.dgisim.helper.rng import using_rng
 from src.dgisim.mode import DefaultMode
 from src.dgisim.state.game_state import GameState
+from src.dgisim.state.player_state import PlayerState
 
 
 class TestDeck(unittest.TestCase):
@@ -207,3 +210,32 @@ class TestDeck(unittest.TestCase):
         )
         self.assertEqual(hash(deck1), hash(deck2))
         self.assertNotEqual(hash(deck2), hash(deck3))
+
+    def test_card_pool(self):
+        mode = DefaultMode()
+        pool = card_pool(mode, (Keqing, Kaeya, AratakiItto))
+        self.assertIs(pool, card_pool(mode, (AratakiItto, Keqing, Kaeya)))
+        self.assertEqual(pool.count(ThunderingPenance), 2)
+        self.assertEqual(pool.count(AncientCourtyard), 1)
+        self.assertNotIn(StreamingSurge, pool)
+        self.assertNotIn(ElementalResonanceWovenFlames, pool)
+        self.assertIn(ElementalResonanceWovenFlames, card_pool(mode, (Klee, Bennett, Keqing)))
+
+    def test_deck_sampler(self):
+        mode = DefaultMode()
+        decks = DeckSampler(mode).sample(50, random.Random(0))
+        self.assertEqual(len(decks), 50)
+        self.assertTrue(all(mode.valid_deck(deck) for deck in decks))
+        self.assertEqual(decks, DeckSampler(mode).sample(50, random.Random(0)))
+        with using_rng(random.Random(1)):
+            initial_deck = PlayerState.example_player(mode).initial_deck
+        self.assertEqual(initial_deck, DeckSampler(mode).sample_deck(random.Random(1)))
+
+        sampler = DeckSampler(mode, required_chars=(Keqing,), banned_cards=(ThunderingPenance,))
+        for deck in sampler.sample(50, random.Random(0)):
+            self.assertIs(deck.chars[0], Keqing)
+            self.assertNotIn(ThunderingPenance, deck.cards)
+
+        self.assertRaises(ValueError, DeckSampler, mode, (Keqing, Kaeya, Klee, Bennett))
+        sampler = DeckSampler(mode, banned_cards=mode.all_cards())
+        self.assertRaises(ValueError, sampler.sample, 1)
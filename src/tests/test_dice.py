@@ -34,7 +34,7 @@ class TestDice(unittest.TestCase):
 
     def test_to_dict(self):
         random_actual_dice = ActualDice.from_random(8)
-        _dice = random_actual_dice._dice
+        _dice = random_actual_dice.get_dices()
         to_dict = random_actual_dice.to_dict()
         dice1 = Dice(_dice)
         dice2 = Dice(to_dict)
@@ -45,7 +45,7 @@ class TestDice(unittest.TestCase):
         dice = Dice({Element.PYRO: 6, Element.OMNI: 2})
         actual_dice = ActualDice.from_dice(dice)
         assert actual_dice is not None
-        self.assertEqual(dice._dice, actual_dice._dice)
+        self.assertEqual(dice.get_dices(), actual_dice.get_dices())
 
         dice = Dice({Element.PYRO: 6, Element.ANY: 2})
         actual_dice = ActualDice.from_dice(dice)
@@ -54,7 +54,7 @@ class TestDice(unittest.TestCase):
         dice = Dice({Element.PYRO: 6, Element.OMNI: 2, Element.ANY: 2})
         abstract_dice = AbstractDice.from_dice(dice)
         assert abstract_dice is not None
-        self.assertEqual(dice._dice, abstract_dice._dice)
+        self.assertEqual(dice.get_dices(), abstract_dice.get_dices())
 
         dice = Dice({Element.PYRO: 6, Element.OMNI: 2, Element.ANY: -2})
         abstract_dice = AbstractDice.from_dice(dice)
@@ -691,6 +691,46 @@ class TestDice(unittest.TestCase):
         assert selected_dice is not None
         self.assertEqual(selected_dice, ActualDice({Element.OMNI: 3}))
 
+    def test_smart_selections(self):
+        characters = Characters((
+            Ganyu.from_default(1),
+            Kaeya.from_default(2),
+            Klee.from_default(3),
+        ), active_character_id=2)
+        self.assertEqual(characters.dice_precedence(), (
+            frozenset({Element.CRYO}),
+            frozenset({Element.PYRO}),
+            frozenset(PURE_ELEMENTS_ORDERED) - {Element.CRYO, Element.PYRO},
+        ))
+        dice = ActualDice({Element.OMNI: 2, Element.CRYO: 1, Element.ANEMO: 1, Element.GEO: 2})
+        requirements = [
+            AbstractDice({Element.OMNI: 3}),
+            AbstractDice({Element.ANY: 2}),
+            AbstractDice({Element.PYRO: 3}),
+            AbstractDice({Element.CRYO: 1, Element.ANY: 2}),
+            AbstractDice({Element.ANY: 7}),
+        ]
+        selections = dice.smart_selections(requirements, characters)
+        self.assertEqual(
+            selections,
+            tuple(dice.smart_selection(requirement, characters) for requirement in requirements),
+        )
+        self.assertIsNone(selections[-1])
+        self.assertEqual(
+            selections,
+            dice.smart_selections(requirements, local_precedence=[
+                {Element.CRYO},
+                {Element.PYRO},
+                set(PURE_ELEMENTS_ORDERED) - {Element.CRYO, Element.PYRO},
+            ]),
+        )
+        # memoized
+        self.assertIs(dice.smart_selection(requirements[0], characters), selections[0])
+        self.assertIs(
+            ActualDice(dice.to_dict()).smart_selection(requirements[0], characters),
+            selections[0],
+        )
+
     def test_encoding_decoding(self):
         dice = ActualDice({Element.OMNI: 3, Element.CRYO: 1, Element.ANEMO: 1})
         self.assertEqual(
@@ -709,3 +749,32 @@ class TestDice(unittest.TestCase):
             dice,
             ActualDice.decoding(dice.encoding(encoding_plan), encoding_plan),
         )
+
+        # encoding the same dice twice
+        dice = ActualDice({Element.OMNI: 2, Element.PYRO: 1})
+        self.assertEqual(list(dice.ordered_dice), list(dice.ordered_dice))
+        self.assertEqual(dice.encoding(encoding_plan)[:3], [
+            encoding_plan.encode_item(Element.OMNI),
+            encoding_plan.encode_item(Element.OMNI),
+            encoding_plan.encode_item(Element.PYRO),
+        ])
+
+    def test_representation_independence(self):
+        import pickle
+
+        dice_a = ActualDice({Element.CRYO: 2, Element.OMNI: 1, Element.PYRO: 0})
+        dice_b = ActualDice({Element.OMNI: 1, Element.CRYO: 2})
+        self.assertEqual(dice_a, dice_b)
+        self.assertEqual(hash(dice_a), hash(dice_b))
+        self.assertEqual(list(dice_a), [Element.OMNI, Element.CRYO])
+        self.assertEqual(dice_a.to_dict(), {Element.OMNI: 1, Element.CRYO: 2})
+        self.assertEqual(dice_a.encoding(encoding_plan), dice_b.encoding(encoding_plan))
+        self.assertEqual(dice_a + {Element.PYRO: 1} - dice_b, ActualDice({Element.PYRO: 1}))
+        self.assertFalse((dice_a - {Element.GEO: 1}).is_legal())
+        self.assertFalse((dice_a + {Element.ANY: 1}).is_legal())
+        self.assertEqual((dice_a + {Element.ANY: 1}).validify(), dice_a)
+        self.assertTrue(AbstractDice({Element.ANY: 1}).is_legal())
+
+        copied = pickle.loads(pickle.dumps(dice_a))
+        self.assertIs(type(copied), ActualDice)
+        self.assertEqual(copied, dice_a)
@@ -114,3 +114,25 @@ class TestEffectStack(unittest.TestCase):
         effect_stack, effects = effect_stack.pop_all_left()
         self.assertEqual(len(effects), 2)
         self.assertNotIn(GroupEffectBarrierEffect, map(type, effects))
+
+    def test_persistence(self):
+        base = self.BASE_EFFECT_STACK
+        pushed = base.push_one(IdEffect(id=3)).push_many_fl((IdEffect(id=4), IdEffect(id=5)))
+        self.assertEqual(len(pushed), 5)
+        self.assertEqual(pushed._effects, tuple(IdEffect(id=i) for i in (1, 2, 3, 5, 4)))
+        self.assertEqual(len(base), 2)
+        self.assertEqual(pushed, EffectStack(pushed._effects))
+        self.assertEqual(hash(pushed), hash(EffectStack(pushed._effects)))
+
+        popped, effect = pushed.pop()
+        self.assertEqual(effect, IdEffect(id=4))
+        self.assertIs(popped.pop()[0].pop()[0]._top, base._top)
+        self.assertNotEqual(popped, pushed)
+        self.assertEqual(popped.pop()[0].pop()[0], base)
+        self.assertNotEqual(base.push_one(IdEffect(id=6)), base.push_one(IdEffect(id=7)))
+
+        import pickle
+        copied = pickle.loads(pickle.dumps((pushed, popped)))
+        self.assertEqual(copied, (pushed, popped))
+        self.assertEqual(hash(copied[0]), hash(pushed))
+        self.assertIs(copied[0]._top.below, copied[1]._top)
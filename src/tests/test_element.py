@@ -1,3 +1,4 @@
+import pickle
 import unittest
 
 from src.dgisim.element import *
@@ -33,3 +34,37 @@ class TestElement(unittest.TestCase):
         self.assertNotEqual(aura1, aura3)
         self.assertNotEqual(hash(aura1), hash(aura3))
         self.assertNotEqual(aura1, "aura1")
+
+    def test_reaction_table(self):
+        # reference: scan the reactions of the aura elements by priority
+        def reference_react(aura: ElementalAura, incoming: Element):
+            for elem in AURA_ELEMENTS_ORDERED:
+                if elem not in aura:
+                    continue
+                for reaction in Reaction:
+                    e1, e2 = reaction.value.reaction_elems
+                    if (elem in e1 and incoming in e2) or (elem in e2 and incoming in e1):
+                        return ReactionDetail(reaction, elem, incoming), aura.remove(elem)
+            if ElementalAura.aurable(incoming):
+                return None, aura.add(incoming)
+            return None, aura
+
+        auras = [ElementalAura.from_default()]
+        for elem in AURA_ELEMENTS_ORDERED:
+            auras += [aura.add(elem) for aura in auras]
+        self.assertEqual(len(set(auras)), 2 ** len(AURA_ELEMENTS_ORDERED))
+        for aura in auras:
+            for incoming in Element:
+                with self.subTest(aura=str(aura), incoming=incoming):
+                    expected = reference_react(aura, incoming)
+                    self.assertEqual(aura.react(incoming), expected)
+                    self.assertEqual(aura.consult_reaction(incoming), expected[0])
+                    self.assertEqual(
+                        Reaction.consult_reaction_with_aura(aura, incoming), expected[0]
+                    )
+
+        aura = ElementalAura({Element.DENDRO: True, Element.CRYO: True, Element.PYRO: False})
+        self.assertEqual(aura.elem_auras(), (Element.CRYO, Element.DENDRO))
+        shared_aura = ElementalAura.from_default().add(Element.DENDRO).add(Element.CRYO)
+        self.assertEqual(aura, shared_aura)
+        self.assertIs(pickle.loads(pickle.dumps(aura)), shared_aura)
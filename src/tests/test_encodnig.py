@@ -1,7 +1,7 @@
 import unittest
 
 from src.dgisim.agents import RandomAgent
-from src.dgisim.encoding.encoding_plan import encoding_plan
+from src.dgisim.encoding.encoding_plan import EncodingPlan, encoding_plan
 from src.dgisim.game_state_machine import GameStateMachine
 from src.dgisim.state.game_state import GameState
 
@@ -52,3 +52,180 @@ class TestEncoding(unittest.TestCase):
             print(end='\b' * len(prev_progress))
             sys.stdout.flush()
             self.assertEqual(len(encodings), 1, encodings)
+
+    def test_encode_item(self):
+        from src.dgisim.card.card import Card
+        from src.dgisim.character.character import Keqing
+        from src.dgisim.element import Element
+        from src.dgisim.encoding.mappings import CARD_MAPPING, ENUM_MAPPING, STT_MAPPING
+        from src.dgisim.state.enums import Pid
+        from src.dgisim.status.status import SatiatedStatus
+
+        for card_type, code in CARD_MAPPING.items():
+            self.assertEqual(encoding_plan.encode_item(card_type), code)
+        for status_type, code in STT_MAPPING.items():
+            self.assertEqual(encoding_plan.encode_item(status_type), code)
+        self.assertEqual(encoding_plan.encode_item(Element.PYRO), ENUM_MAPPING[Element.PYRO])
+        self.assertEqual(encoding_plan.encode_item(SatiatedStatus()), STT_MAPPING[SatiatedStatus])
+        self.assertEqual(
+            encoding_plan.encode_item(Keqing.from_default(1)),
+            encoding_plan.encode_item(Keqing),
+        )
+        with self.assertRaises(Exception):
+            encoding_plan.encode_item(Card)
+
+        p2_plan = encoding_plan.perspective_version(Pid.P2)
+        self.assertEqual(p2_plan.encode_item(Pid.P1), encoding_plan.encode_item(Pid.P2))
+        self.assertEqual(p2_plan.encode_item(Pid.P2), encoding_plan.encode_item(Pid.P1))
+        self.assertEqual(p2_plan.encode_item(Element.PYRO), encoding_plan.encode_item(Element.PYRO))
+        self.assertIs(p2_plan.perspective_version(Pid.P1), encoding_plan)
+
+    def test_cached_encoding(self):
+        import pickle
+        from src.dgisim.state.enums import Pid
+
+        gsm = GameStateMachine(
+            GameState.from_default(),
+            RandomAgent(seed=2),
+            RandomAgent(seed=3),
+            seed=2,
+        )
+        gsm.step_until_phase(gsm.get_game_state().mode.action_phase)
+        gsm.step_until_phase(gsm.get_game_state().mode.end_phase)
+        game_states = gsm.get_history()
+        encodings = {
+            pid: [game_state.encoding(encoding_plan, pid) for game_state in game_states]
+            for pid in Pid
+        }
+        # pickled states have no cached encodings
+        fresh_game_states = pickle.loads(pickle.dumps(game_states))
+        self.assertFalse(fresh_game_states[-1].player1.characters.__dict__.get("_instance_cache"))
+        for pid in Pid:
+            self.assertEqual(
+                encodings[pid],
+                [game_state.encoding(encoding_plan, pid) for game_state in fresh_game_states],
+            )
+
+        # modifying the returned encoding doesn't affect the cached one
+        game_state = game_states[-1]
+        encoding = game_state.encoding(encoding_plan)
+        encoding[0] = -1
+        self.assertEqual(game_state.encoding(encoding_plan), encodings[Pid.P1][-1])
+
+    def test_split_static_encoding(self):
+        from src.dgisim.state.enums import Pid
+
+        split_plan = encoding_plan.split_static_version()
+        self.assertFalse(encoding_plan.SPLIT_STATIC)
+        self.assertTrue(split_plan.SPLIT_STATIC)
+        self.assertIs(encoding_plan.split_static_version(), split_plan)
+        self.assertTrue(split_plan.perspective_version(Pid.P2).SPLIT_STATIC)
+        # the split version of the P1 plan isn't reused by the P2 plan
+        from src.dgisim.encoding import encoding_plan as plan_module
+        p1_plan = EncodingPlan(
+            enum_mapping=plan_module.ENUM_MAPPING,
+            card_mapping=plan_module.CARD_MAPPING,
+            char_mapping=plan_module.CHAR_MAPPING,
+            effect_mapping=plan_module.EFFECT_MAPPING,
+            mode_mapping=plan_module.MODE_MAPPING,
+            status_mapping=plan_module.STT_MAPPING,
+            summon_mapping=plan_module.SUMM_MAPPING,
+            support_mapping=plan_module.SUPP_MAPPING,
+        )
+        p1_split_plan = p1_plan.split_static_version()
+        p2_plan = p1_plan.perspective_version(Pid.P2)
+        p2_split_plan = p2_plan.split_static_version()
+        self.assertIsNot(p2_split_plan, p1_split_plan)
+        self.assertIs(p2_split_plan.perspective_version(Pid.P2), p2_split_plan)
+        self.assertEqual(p2_split_plan.encode_item(Pid.P1), p2_plan.encode_item(Pid.P1))
+        self.assertNotEqual(p2_split_plan.encode_item(Pid.P1), p1_split_plan.encode_item(Pid.P1))
+        self.assertEqual(
+            split_plan.game_encoding_size + split_plan.static_encoding_size,
+            encoding_plan.game_encoding_size,
+        )
+
+        game_state = GameState.from_default()
+        deck1, deck2 = game_state.get_decks()
+        self.assertEqual(
+            split_plan.encode_static(game_state, Pid.P1),
+            [
+                encoding_plan.encode_item(game_state.mode),
+                *deck1.encoding(encoding_plan),
+                *deck2.encoding(encoding_plan),
+            ],
+        )
+        self.assertEqual(
+            split_plan.encode_static(game_state, Pid.P2)[1:],
+            deck2.encoding(encoding_plan) + deck1.encoding(encoding_plan),
+        )
+        for pid in Pid:
+            encoding = game_state.encoding(split_plan, pid)
+            self.assertEqual(len(encoding), split_plan.game_encoding_size)
+            self.assertNotEqual(encoding, game_state.encoding(encoding_plan, pid))
+
+    def test_measuring_encodings_keeps_rng(self):
+        import random
+
+        from src.dgisim.encoding import structured_encoding
+        from src.dgisim.helper.rng import using_rng
+
+        structured_encoding._all_shapes.cache_clear()
+        measures = (
+            lambda: encoding_plan.structured_buffers(),
+            lambda: encoding_plan.game_encoding_size,
+            lambda: encoding_plan.static_encoding_size,
+        )
+        for measure in measures:
+            rng = random.Random(0)
+            with using_rng(rng):
+                measure()
+            self.assertEqual(rng.getstate(), random.Random(0).getstate())
+
+    def test_encode_structured(self):
+        import numpy as np
+
+        from src.dgisim.state.enums import Pid
+
+        game_states = GameStateMachine(
+            GameState.from_default(),
+            RandomAgent(seed=0),
+            RandomAgent(seed=1),
+            seed=0,
+        )
+        game_states.run()
+
+        shapes = encoding_plan.structured_shapes()
+        self.assertEqual(shapes["characters"][:2], (2, encoding_plan.CHARS_FIXED_LEN))
+        self.assertEqual(
+            sum(int(np.prod(shape)) for shape in shapes.values()),
+            encoding_plan.game_encoding_size,
+        )
+        out = encoding_plan.structured_buffers()
+        game_fields = ("mode", "basics")
+        player_fields = [field for field in shapes if field not in (*game_fields, "effect_stack")]
+        for game_state in game_states.get_history()[::7]:
+            for pid in Pid:
+                self.assertIs(encoding_plan.encode_structured(game_state, pid, out=out), out)
+                flattened = np.concatenate(
+                    [out[field] for field in game_fields]
+                    + [out[field][0].ravel() for field in player_fields]
+                    + [out[field][1].ravel() for field in player_fields]
+                    + [out["effect_stack"].ravel()]
+                )
+                self.assertEqual(flattened.tolist(), game_state.encoding(encoding_plan, pid))
+
+        # only the fields asked for are encoded
+        game_state = game_states.get_game_state()
+        subset = encoding_plan.encode_structured(game_state, Pid.P2, fields=["characters"])
+        self.assertEqual(list(subset), ["characters"])
+        self.assertTrue(np.array_equal(
+            subset["characters"],
+            encoding_plan.encode_structured(game_state, Pid.P2)["characters"],
+        ))
+        batch = encoding_plan.structured_buffers(("dice", "basics"), batch_shape=(3,))
+        self.assertEqual(batch["dice"].shape, (3, 2, encoding_plan.DICE_FIXED_LEN))
+        row = {field: buffer[1] for field, buffer in batch.items()}
+        encoding_plan.encode_structured(game_state, out=row)
+        self.assertFalse(batch["dice"][0].any())
+        self.assertTrue(batch["basics"][1].any())
+        self.assertRaises(ValueError, encoding_plan.structured_shapes, ["no_such_field"])
@@ -1,7 +1,13 @@
-import unittest
+import pickle
 import random
+import unittest
 
+from src.dgisim.action.action import EndRoundAction
+from src.dgisim.agents import RandomAgent
+from src.dgisim.encoding.encoding_plan import encoding_plan
+from src.dgisim.helper.rng import using_rng
 from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import Pid
 from src.dgisim.state.game_state import GameState
 from src.dgisim.state.player_state import PlayerState
 
@@ -31,6 +37,25 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(hash(game_state1), hash(game_state2))
         self.assertNotEqual(game_state1, "game_state1")
 
+    def test_lazy_checkers(self):
+        game_state = GameState.from_default()
+        self.assertFalse(hasattr(game_state, "__dict__"))
+        self.assertFalse(hasattr(game_state.player1, "__dict__"))
+        card_checker = game_state.card_checker
+        self.assertIs(game_state.card_checker, card_checker)
+        self.assertIs(game_state.swap_checker, game_state.swap_checker)
+        self.assertIs(game_state.skill_checker, game_state.skill_checker)
+        self.assertIs(game_state.elem_tuning_checker, game_state.elem_tuning_checker)
+        # rebuilt game states create their own checkers
+        new_game_state = game_state.factory().build()
+        self.assertIsNot(new_game_state.card_checker, card_checker)
+
+        hash(game_state)
+        copied_game_state = pickle.loads(pickle.dumps(game_state))
+        self.assertEqual(copied_game_state, game_state)
+        self.assertEqual(hash(copied_game_state), hash(game_state))
+        self.assertIsNot(copied_game_state.card_checker, card_checker)
+
     def test_deck_extraction(self):
         game_state = GameState.from_default()
         deck1, deck2 = game_state.get_decks()
@@ -38,3 +63,74 @@ class TestGameState(unittest.TestCase):
         self.assertEqual(len(deck2.chars), 3)
         self.assertEqual(sum(deck1.cards.values()), 30)
         self.assertEqual(sum(deck2.cards.values()), 30)
+
+    def test_legal_actions(self):
+        agent = RandomAgent(seed=3)
+        with using_rng(random.Random(3)):
+            game_state = GameState.from_default()
+            for _ in range(1000):
+                if game_state.game_end():
+                    break
+                pid = game_state.waiting_for()
+                if pid is None:
+                    game_state = game_state.step()
+                    continue
+                self.assertEqual(game_state.legal_actions(pid.other), ())
+                actions = game_state.legal_actions(pid)
+                self.assertGreater(len(actions), 0)
+                self.assertEqual(len(set(actions)), len(actions))
+                # memoized
+                self.assertIs(game_state.legal_actions(pid), actions)
+                for action in actions:
+                    self.assertIsNotNone(game_state.action_step(pid, action), action)
+
+                mask = game_state.action_mask(pid, encoding_plan)
+                self.assertEqual(len(mask), encoding_plan.action_mask_size)
+                self.assertEqual(
+                    [i for i, legal in enumerate(mask) if legal],
+                    sorted(set(encoding_plan.action_slot(action) for action in actions)),
+                )
+                next_state = game_state.action_step(
+                    pid, agent.choose_action([game_state], pid)
+                )
+                assert next_state is not None
+                game_state = next_state
+        self.assertEqual(encoding_plan.action_slot(EndRoundAction()), 0)
+
+    def test_staged_character_edits(self):
+        game_state = GameState.from_default()
+        char1, char2, _ = game_state.player2.characters.get_characters()
+        expected = game_state.factory().f_player2(
+            lambda p: p.factory().f_characters(
+                lambda cs: cs.factory().f_character(
+                    char1.id, lambda c: c.factory().hp(3).energy(1).build()
+                ).f_character(
+                    char2.id, lambda c: c.factory().hp(5).build()
+                ).build()
+            ).build()
+        ).build()
+
+        factory = game_state.factory()
+        factory.f_character(Pid.P2, char1.id, lambda c: c.factory().hp(3).build())
+        factory.character(Pid.P2, char2.factory().hp(5).build())
+        factory.f_character(Pid.P2, char1.id, lambda c: c.factory().energy(1).build())
+        self.assertEqual(factory.build(), expected)
+
+        # staged edits are visible to later player edits of the same factory
+        factory = game_state.factory()
+        factory.f_character(Pid.P2, char1.id, lambda c: c.factory().hp(3).energy(1).build())
+        factory.f_player2(lambda p: p.factory().f_characters(
+            lambda cs: cs.factory().f_character(
+                char2.id, lambda c: c.factory().hp(5).build()
+            ).build()
+        ).build())
+        self.assertEqual(factory.build(), expected)
+
+        # but are discarded by replacing the player as a whole
+        factory = game_state.factory()
+        factory.f_character(Pid.P2, char1.id, lambda c: c.factory().hp(3).build())
+        factory.player2(game_state.player2)
+        self.assertEqual(factory.build(), game_state)
+        self.assertIs(game_state.factory().f_character(
+            Pid.P1, char1.id, lambda c: c
+        ).build().player2, game_state.player2)
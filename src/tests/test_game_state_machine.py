@@ -144,6 +144,39 @@ class TestGameStateMachine(unittest.TestCase):
         self.assertTrue(state_machine.game_end())
         self.assertIsNone(state_machine.get_winner())
 
+    def test_compact_history(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                full_machine = GameStateMachine(
+                    self._initial_state,
+                    RandomAgent(seed=seed),
+                    RandomAgent(seed=seed + 1),
+                    seed=seed,
+                )
+                full_machine.run()
+                compact_machine = GameStateMachine(
+                    self._initial_state,
+                    RandomAgent(seed=seed),
+                    RandomAgent(seed=seed + 1),
+                    seed=seed,
+                    compact_history=True,
+                )
+                compact_machine.run()
+
+                history = full_machine.get_history()
+                self.assertEqual(compact_machine.get_history(), history)
+                self.assertEqual(compact_machine.latest_index(), full_machine.latest_index())
+                self.assertEqual(compact_machine.get_actions(), full_machine.get_actions())
+                self.assertEqual(
+                    compact_machine.get_action_history(),
+                    full_machine.get_action_history(),
+                )
+                self.assertEqual(compact_machine.get_seeds(), full_machine.get_seeds())
+                for index in (0, 1, len(history) // 2, len(history) - 2, -1):
+                    self.assertEqual(compact_machine.get_game_state_at(index), history[index])
+                self.assertRaises(IndexError, compact_machine.get_game_state_at, len(history))
+                self.assertEqual(compact_machine.get_winner(), full_machine.get_winner())
+
     def test_random_agents_not_break_game(self):
         from src.dgisim.mode import AllOmniMode
         mode = AllOmniMode()
@@ -0,0 +1,74 @@
+import pickle
+import unittest
+
+from src.dgisim.dice import ActualDice
+from src.dgisim.element import Element
+from src.dgisim.helper.instance_cache import *
+from src.dgisim.state.game_state import GameState
+
+
+class _Counted:
+    def __init__(self, val: int) -> None:
+        self.val = val
+        self.hash_calls = 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _Counted):
+            return False
+        return not known_hashes_differ(self, other) and self.val == other.val
+
+    @cached_hash
+    def __hash__(self) -> int:
+        self.hash_calls += 1
+        return hash(self.val)
+
+    @cached_method
+    def plus(self, other: int) -> tuple[int, ...]:
+        self.plus_calls = getattr(self, "plus_calls", 0) + 1
+        return (self.val + other,)
+
+
+class TestInstanceCache(unittest.TestCase):
+    def test_cached_hash(self):
+        obj = _Counted(3)
+        self.assertEqual(hash(obj), hash(3))
+        self.assertEqual(hash(obj), hash(3))
+        self.assertEqual(obj.hash_calls, 1)
+
+    def test_cached_method(self):
+        obj = _Counted(3)
+        self.assertEqual(obj.plus(1), (4,))
+        self.assertIs(obj.plus(1), obj.plus(1))
+        self.assertEqual(obj.plus(2), (5,))
+        self.assertEqual(obj.plus_calls, 2)
+
+    def test_known_hashes_differ(self):
+        obj1, obj2 = _Counted(1), _Counted(2)
+        self.assertFalse(known_hashes_differ(obj1, obj2))
+        hash(obj1)
+        self.assertFalse(known_hashes_differ(obj1, obj2))
+        hash(obj2)
+        self.assertTrue(known_hashes_differ(obj1, obj2))
+        self.assertFalse(known_hashes_differ(obj1, _Counted(1)))
+
+    def test_cache_is_not_pickled(self):
+        obj = _Counted(3)
+        hash(obj)
+        instance_cache(obj)["other"] = 1
+        unpickled = pickle.loads(pickle.dumps(obj))
+        self.assertEqual(len(instance_cache(unpickled)), 0)
+        self.assertEqual(hash(unpickled), hash(obj))
+
+    def test_game_state_hash(self):
+        game_state = GameState.from_default()
+        hash_val = hash(game_state)
+        self.assertEqual(hash(game_state), hash_val)
+        unpickled = pickle.loads(pickle.dumps(game_state))
+        self.assertEqual(unpickled, game_state)
+        self.assertEqual(hash(unpickled), hash_val)
+
+        dice1 = ActualDice({Element.OMNI: 2})
+        dice2 = ActualDice({Element.OMNI: 1})
+        hash(dice1), hash(dice2)
+        self.assertNotEqual(dice1, dice2)
+        self.assertEqual(dice1, ActualDice({Element.OMNI: 2}))
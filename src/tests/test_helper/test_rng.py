@@ -0,0 +1,44 @@
+import random
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from src.dgisim.helper.rng import *
+from src.dgisim.state.game_state import GameState
+
+
+class TestRng(unittest.TestCase):
+    def test_default_is_global_rng(self):
+        random.seed(42)
+        expected = random.random()
+        random.seed(42)
+        self.assertEqual(current_rng().random(), expected)
+
+    def test_using_rng(self):
+        rng = random.Random(1)
+        with using_rng(rng):
+            self.assertIs(current_rng(), rng)
+            inner = random.Random(2)
+            with using_rng(inner):
+                self.assertIs(current_rng(), inner)
+            self.assertIs(current_rng(), rng)
+        self.assertIsNot(current_rng(), rng)
+
+    def test_step_leaves_global_random_alone(self):
+        base_state = GameState.from_default()
+        random.seed(3)
+        expected = random.random()
+        random.seed(3)
+        base_state.auto_step(seed=5)
+        self.assertEqual(random.random(), expected)
+
+    def test_concurrent_steps_are_reproducible(self):
+        base_state = GameState.from_default()
+
+        def run(seed: int) -> GameState:
+            return base_state.auto_step(seed=seed)
+
+        expected = [run(seed) for seed in range(8)]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(run, range(8)))
+        self.assertEqual(expected, results)
+        self.assertEqual(run(0), base_state.auto_step(rng=random.Random(0)))
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+import unittest
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _run(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=_ROOT_DIR, capture_output=True, text=True, check=True,
+    )
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """
+    :returns: the cumulative import time (in microseconds) of each module
+              imported by `statement` in a fresh interpreter.
+    """
+    times: dict[str, int] = {}
+    for line in _run("-X", "importtime", "-c", statement).stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            times[module.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    # the import time itself is measured by `benchmarks/bench_import.py`
+    def test_lazy_import(self):
+        times = _import_times("import src.package")
+        self.assertIn("src.package", times)
+        self.assertEqual([module for module in times if module.startswith("src.dgisim")], [])
+
+        times = _import_times("from src.package import Element, Pid")
+        self.assertNotIn("src.dgisim.status.status", times)
+        self.assertNotIn("src.dgisim.card.card", times)
+
+    def test_lazy_names(self):
+        # accessed first, names of the modules in the import cycle of effects
+        # and statuses still load
+        for name in ("Status", "StatusProcessing", "Statuses", "standard_post_effects"):
+            with self.subTest(name=name):
+                _run("-c", f"from src.package import {name}")
+        _run("-c", "from src.package import *; GameState.from_default()")
+
+    def test_lazy_index_up_to_date(self):
+        _run(os.path.join("scripts", "py", "lazy_index.py"), "--check")
@@ -59,3 +59,25 @@ class TestLinearEnv(unittest.TestCase):
             env.full_view().get_decks(),
             (deck1, deck2),
         )
+
+    def test_static_encoding(self):
+        split_plan = encoding_plan.split_static_version()
+        env = LinearEnv(encoding_plan=split_plan)
+        game_state, state, _, turn, done = env.view()
+        self.assertEqual(len(state), split_plan.game_encoding_size)
+        static_encoding = env.static_encoding()
+        self.assertEqual(static_encoding, split_plan.encode_static(game_state, Pid.P1))
+        self.assertEqual(len(env.static_encoding(Pid.P2)), split_plan.static_encoding_size)
+
+        agent = RandomAgent()
+        for _ in range(10):
+            action = agent.choose_action([game_state], Pid(turn))
+            game_state, state, _, turn, done = env.step(action)
+            self.assertEqual(len(state), split_plan.game_encoding_size)
+        self.assertEqual(env.static_encoding(), static_encoding)
+
+        env.reset_random()
+        self.assertEqual(
+            env.static_encoding(),
+            split_plan.encode_static(env.full_view(), Pid.P1),
+        )
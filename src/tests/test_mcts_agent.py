@@ -0,0 +1,97 @@
+import gc
+import random
+import unittest
+
+from src.dgisim.agents import MCTSAgent, RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.helper.rng import using_rng
+from src.dgisim.state.enums import Pid
+from src.dgisim.state.game_state import GameState
+
+
+def _action_phase_state(seed: int) -> GameState:
+    """ :returns: a game state where a player is to act in the action phase. """
+    with using_rng(random.Random(seed)):
+        game_state = GameState.from_default()
+        state_machine = GameStateMachine(game_state, RandomAgent(), RandomAgent())
+        state_machine.step_until_phase(game_state.mode.action_phase)
+        state_machine.auto_step()
+        return state_machine.get_game_state()
+
+
+class TestMCTSAgent(unittest.TestCase):
+    def test_chooses_valid_action(self):
+        game_state = _action_phase_state(1)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        agent = MCTSAgent(iterations=30, rollout_depth=10, seed=0)
+        action = agent.choose_action([game_state], pid)
+        self.assertIsNotNone(game_state.action_step(pid, action))
+        self.assertGreater(agent.table_size, 0)
+        # keyed on the states themselves, so colliding hashes don't share nodes
+        self.assertTrue(all(isinstance(key, GameState) for key in agent._table))
+
+    def test_reproducible_with_seed(self):
+        game_state = _action_phase_state(2)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        actions = [
+            MCTSAgent(iterations=20, rollout_depth=10, seed=5).choose_action([game_state], pid)
+            for _ in range(2)
+        ]
+        self.assertEqual(actions[0], actions[1])
+
+    def test_table_is_bounded(self):
+        game_state = _action_phase_state(3)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        agent = MCTSAgent(iterations=40, rollout_depth=5, max_table_size=8, seed=0)
+        agent.choose_action([game_state], pid)
+        self.assertLessEqual(agent.table_size, 8)
+
+    def test_time_limit(self):
+        game_state = _action_phase_state(4)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        agent = MCTSAgent(iterations=None, time_limit=0.2, rollout_depth=5, seed=0)
+        action = agent.choose_action([game_state], pid)
+        self.assertIsNotNone(game_state.action_step(pid, action))
+
+    def test_full_game(self):
+        with using_rng(random.Random(6)):
+            state_machine = GameStateMachine(
+                GameState.from_default(),
+                MCTSAgent(iterations=4, rollout_depth=5, seed=0),
+                RandomAgent(),
+            )
+            state_machine.run()
+        self.assertTrue(state_machine.game_end())
+
+    def test_parallel_rollouts(self):
+        game_state = _action_phase_state(7)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        agent = MCTSAgent(iterations=8, rollout_depth=10, workers=2, seed=0)
+        try:
+            action = agent.choose_action([game_state], pid)
+        finally:
+            agent.close()
+        self.assertIsNotNone(game_state.action_step(pid, action))
+
+    def test_rollout_processes_are_shut_down(self):
+        game_state = _action_phase_state(8)
+        pid = game_state.waiting_for()
+        assert pid is not None
+        with MCTSAgent(iterations=4, rollout_depth=5, workers=2, seed=0) as agent:
+            agent.choose_action([game_state], pid)
+            self.assertIsNotNone(agent._executor)
+        self.assertIsNone(agent._executor)
+
+        # agents dropped without being closed
+        agent = MCTSAgent(iterations=4, rollout_depth=5, workers=2, seed=0)
+        agent.choose_action([game_state], pid)
+        executor = agent._executor
+        assert executor is not None
+        del agent
+        gc.collect()
+        self.assertRaises(RuntimeError, executor.submit, int)
@@ -0,0 +1,99 @@
+import io
+import random
+import unittest
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.helper.rng import using_rng
+from src.dgisim.replay import *
+from src.dgisim.state.game_state import GameState
+
+
+def _run_game(seed: None | int, agent_seed: int) -> GameStateMachine:
+    with using_rng(random.Random(agent_seed)):
+        game_state = GameState.from_default()
+    state_machine = GameStateMachine(
+        game_state,
+        RandomAgent(seed=agent_seed),
+        RandomAgent(seed=agent_seed + 1),
+        seed=seed,
+    )
+    state_machine.run()
+    return state_machine
+
+
+class TestReplay(unittest.TestCase):
+    def test_round_trip(self):
+        for seed in (1, None):
+            with self.subTest(seed=seed):
+                state_machine = _run_game(seed, 5)
+                replay = Replay.from_state_machine(state_machine)
+                data = replay.to_bytes()
+                self.assertEqual(Replay.from_bytes(data), replay)
+                self.assertEqual(
+                    tuple(Replay.from_bytes(data).game_states()),
+                    state_machine.get_history(),
+                )
+                self.assertEqual(replay.final_state(), state_machine.get_game_state())
+                self.assertEqual(replay.game_state_at(3), state_machine.get_game_state_at(3))
+                self.assertRaises(IndexError, replay.game_state_at, -1)
+
+        # seeds drawn from the seed of the machine are not stored
+        seeded = Replay.from_state_machine(_run_game(1, 5))
+        unseeded = Replay.from_state_machine(_run_game(None, 5))
+        self.assertLess(len(seeded.to_bytes()), 4000)
+        self.assertGreater(len(unseeded.to_bytes()), 8 * len(unseeded.seeds))
+
+    def test_failed_attempts(self):
+        state_machine = _run_game(1, 5)
+        replay = Replay.from_state_machine(state_machine)
+        self.assertFalse(any(replay.failed_attempts))
+        # as if an illegal action was made before the first action
+        first_action_index = next(
+            index
+            for index in range(state_machine.latest_index())
+            if state_machine.action_at(index) is not None
+        )
+        seeds = list(replay.seeds)
+        seeds.insert(first_action_index, 0.5)
+        clumsy_replay = Replay(
+            mode=replay.mode,
+            decks=replay.decks,
+            seeds=tuple(seeds),
+            actions=replay.actions,
+            failed_attempts=(1, *replay.failed_attempts[1:]),
+            num_transitions=replay.num_transitions,
+        )
+        clumsy_replay = Replay.from_bytes(clumsy_replay.to_bytes())
+        self.assertEqual(clumsy_replay.failed_attempts[0], 1)
+        self.assertEqual(tuple(clumsy_replay.game_states()), state_machine.get_history())
+
+    def test_unfinished_game(self):
+        with using_rng(random.Random(0)):
+            game_state = GameState.from_default()
+        state_machine = GameStateMachine(
+            game_state, RandomAgent(seed=0), RandomAgent(seed=1), seed=0
+        )
+        for _ in range(100):
+            state_machine.one_step()
+        replay = Replay.from_bytes(Replay.from_state_machine(state_machine).to_bytes())
+        self.assertEqual(replay.num_transitions, state_machine.latest_index())
+        self.assertEqual(replay.final_state(), state_machine.get_game_state())
+
+    def test_writer_and_reader(self):
+        state_machines = [_run_game(seed, seed) for seed in range(3)]
+        stream = io.BytesIO()
+        writer = ReplayWriter(stream)
+        sizes = [writer.write(state_machine) for state_machine in state_machines]
+        self.assertEqual(sum(sizes), len(stream.getvalue()))
+
+        stream.seek(0)
+        replays = list(ReplayReader(stream))
+        self.assertEqual(len(replays), 3)
+        for replay, state_machine in zip(replays, state_machines):
+            self.assertEqual(replay.final_state(), state_machine.get_game_state())
+
+        truncated = io.BytesIO(stream.getvalue()[:-1])
+        self.assertRaises(ValueError, list, ReplayReader(truncated))
+        self.assertRaises(ValueError, Replay.from_bytes, b"")
+        self.assertRaises(ValueError, Replay.from_bytes, replays[0].to_bytes()[:20])
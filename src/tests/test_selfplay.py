@@ -0,0 +1,44 @@
+import unittest
+
+from src.dgisim.agents import RandomAgent
+from src.dgisim.selfplay import *
+from src.dgisim.state.enums import Pid
+from src.dgisim.state.game_state import GameState
+
+
+class TestSelfPlay(unittest.TestCase):
+    def test_game_seeds_are_deterministic(self):
+        self.assertEqual(game_seeds(10, seed=3), game_seeds(10, seed=3))
+        self.assertNotEqual(game_seeds(10, seed=3), game_seeds(10, seed=4))
+        self.assertEqual(len(set(game_seeds(10, seed=3))), 10)
+
+    def test_run_games_inline(self):
+        results = list(run_games(2, (RandomAgent, RandomAgent), workers=1, seed=7))
+        self.assertEqual([result.game_id for result in results], [0, 1])
+        for result in results:
+            self.assertIn(result.winner, (Pid.P1, Pid.P2, None))
+            self.assertGreaterEqual(result.rounds, 1)
+            self.assertIsNone(result.actions)
+
+        # same seed, same games
+        results_again = list(run_games(2, (RandomAgent, RandomAgent), workers=1, seed=7))
+        self.assertEqual(results, results_again)
+
+    def test_run_games_in_pool(self):
+        inline_results = list(run_games(
+            3, (RandomAgent, RandomAgent), workers=1, seed=11, record_actions=True,
+        ))
+        pool_results = list(run_games(
+            3, (RandomAgent, RandomAgent), workers=2, seed=11, record_actions=True,
+            shard_size=1,
+        ))
+        self.assertEqual(inline_results, pool_results)
+        for result in pool_results:
+            assert result.actions is not None
+            self.assertTrue(len(result.actions) > 0)
+
+    def test_run_games_with_decks(self):
+        base_state = GameState.from_default()
+        decks = base_state.get_decks()
+        result = next(run_games(1, (RandomAgent, RandomAgent), decks=decks, workers=1, seed=5))
+        self.assertEqual(result.seed, game_seeds(1, seed=5)[0])
@@ -1,10 +1,19 @@
+import random
 import unittest
 
 from src.dgisim.card.card import *
 from src.dgisim.card.cards import Cards
 from src.dgisim.character.character import *
 from src.dgisim.character.characters import Characters
+from src.dgisim.agents import RandomAgent
+from src.dgisim.effect.enums import TriggeringSignal
+from src.dgisim.game_state_machine import GameStateMachine
+from src.dgisim.helper.rng import using_rng
 from src.dgisim.mode import DefaultMode
+from src.dgisim.state.enums import Pid
+from src.dgisim.state.game_state import GameState
+from src.dgisim.status.enums import Preprocessables
+from src.dgisim.status.status_processing import StatusProcessing
 from src.dgisim.state.player_state import PlayerState
 from src.dgisim.support.support import Support
 
@@ -62,3 +71,39 @@ class TestPlayerState(unittest.TestCase):
         self.assertNotEqual(player_state1, player_state3)
         self.assertNotEqual(hash(player_state1), hash(player_state3))
         self.assertNotEqual(player_state1, "player_state3")
+
+    def test_statuses_reacting_to_and_preprocessing(self):
+        with using_rng(random.Random(5)):
+            state_machine = GameStateMachine(
+                GameState.from_default(),
+                RandomAgent(seed=5),
+                RandomAgent(seed=6),
+            )
+            state_machine.run()
+        for game_state in state_machine.get_history()[::7]:
+            for pid in Pid:
+                all_statuses: list = []
+
+                def collect(gs, status, target):
+                    all_statuses.append((status, target))
+                    return gs
+
+                StatusProcessing.loop_one_player_all_statuses(game_state, pid, collect)
+                for signal in TriggeringSignal:
+                    self.assertEqual(
+                        game_state.get_player(pid).statuses_reacting_to(pid, signal),
+                        tuple(
+                            (status, target)
+                            for status, target in all_statuses
+                            if signal in status.REACTABLE_SIGNALS
+                        ),
+                    )
+                for pp_type in Preprocessables:
+                    self.assertEqual(
+                        game_state.get_player(pid).statuses_preprocessing(pid, pp_type),
+                        tuple(
+                            (status, target)
+                            for status, target in all_statuses
+                            if pp_type in status.PREPROCESSABLES
+                        ),
+                    )
@@ -5,6 +5,7 @@ from src.dgisim.agents import PuppetAgent
 from src.dgisim.card.card import *
 from src.dgisim.game_state_machine import GameStateMachine
 from src.dgisim.status.status import *
+from src.dgisim.status.enums import Preprocessables
 from src.dgisim.status.statuses import *
 from src.tests.helpers.game_state_templates import *
 from src.tests.helpers.quality_of_life import *
@@ -88,3 +89,19 @@ class TestStatus(unittest.TestCase):
         assert isinstance(status, MushroomPizzaStatus)
         self.assertEqual(character.hp, 3)
         self.assertEqual(status.usages, 1)
+
+    def testPreprocessablesDeclarations(self):
+        class UndeclaredStatus(CombatStatus):
+            def _preprocess(self, game_state, status_source, item, signal):
+                return item, self
+
+        class UndeclaredChildStatus(UndeclaredStatus):
+            PREPROCESSABLES = frozenset((Preprocessables.SWAP,))
+
+        self.assertEqual(Status.PREPROCESSABLES, frozenset())
+        self.assertEqual(SatiatedStatus.PREPROCESSABLES, frozenset())
+        self.assertEqual(UndeclaredStatus.PREPROCESSABLES, frozenset(Preprocessables))
+        self.assertEqual(UndeclaredChildStatus.PREPROCESSABLES, frozenset((Preprocessables.SWAP,)))
+        self.assertIn(Preprocessables.SWAP, LeaveItToMeStatus.PREPROCESSABLES)
+        self.assertIn(Preprocessables.DMG_ELEMENT, MeleeStanceStatus.PREPROCESSABLES)
+        self.assertIn(Preprocessables.DMG_AMOUNT_PLUS, MeleeStanceStatus.PREPROCESSABLES)
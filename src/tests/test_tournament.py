@@ -0,0 +1,148 @@
+import json
+import os
+import tempfile
+import unittest
+from random import Random
+from typing import Any
+
+from src.dgisim.action.enums import ActionType
+from src.dgisim.agents import LazyAgent, RandomAgent
+from src.dgisim.deck import DeckSampler
+from src.dgisim.helper.rng import current_rng
+from src.dgisim.mode import DefaultMode
+from src.dgisim.tournament import *
+
+
+class _EagerAgent(RandomAgent):
+    """ A random agent that only ends its round when it has nothing else to do. """
+
+    def _action_phase(self, history, pid):
+        action_generator = history[-1].action_generator(pid)
+        assert action_generator is not None
+        choices = tuple(
+            choice for choice in action_generator.choices()
+            if choice is not ActionType.END_ROUND
+        )
+        if choices:
+            action_generator = action_generator.choose(current_rng().choice(choices))
+        return self._random_action_generator_chooser(action_generator)
+
+
+class TestTournament(unittest.TestCase):
+    DECKS = DeckSampler(DefaultMode()).sample(3, Random(5))
+
+    def test_wilson_interval(self):
+        self.assertEqual(wilson_interval(0, 0), (0.0, 1.0))
+        low, high = wilson_interval(50, 100)
+        self.assertAlmostEqual(low, 0.4038, places=3)
+        self.assertAlmostEqual(high, 0.5962, places=3)
+        low, high = wilson_interval(10, 10)
+        self.assertGreater(low, 0.5)
+        self.assertEqual(high, 1.0)
+
+        pairing = PairingStats(0, 0, 1, wins_a=18, wins_b=2, draws=0)
+        self.assertTrue(pairing.decided(0.95))
+        self.assertFalse(PairingStats(0, 0, 1, 11, 9, 0).decided(0.95))
+
+    def test_round_robin(self):
+        result = Tournament(
+            self.DECKS, games_per_pairing=4, batch_size=3, stop_confidence=None,
+            workers=1, seed=1,
+        ).run()
+        self.assertEqual([(p.a, p.b) for p in result.pairings], [(0, 1), (0, 2), (1, 2)])
+        self.assertTrue(all(p.games == 4 for p in result.pairings))
+        standings = result.standings()
+        self.assertEqual(sorted(s.index for s in standings), [0, 1, 2])
+        self.assertTrue(all(s.games == 8 for s in standings))
+        rates = [s.win_rate() for s in standings]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertIn("95% CI", str(result))
+
+        # same seed, same results, whether played inline or in a pool
+        pool_result = Tournament(
+            self.DECKS, games_per_pairing=4, batch_size=1, stop_confidence=None,
+            workers=2, seed=1,
+        ).run()
+        self.assertEqual(result.pairings, pool_result.pairings)
+
+    def test_early_stopping(self):
+        # random games between random agents are mostly draws
+        result = Tournament(
+            self.DECKS[:2], (_EagerAgent, LazyAgent), games_per_pairing=40, batch_size=2,
+            min_games=4, workers=1, seed=1,
+        ).run()
+        pairing, = result.pairings
+        self.assertLess(pairing.games, 40)
+        self.assertTrue(pairing.decided(0.99))
+        self.assertEqual(result.standings()[0].index, 0)
+
+        # a pool with room for all batches stops after the same games
+        pool_result = Tournament(
+            self.DECKS[:2], (_EagerAgent, LazyAgent), games_per_pairing=40, batch_size=2,
+            min_games=4, workers=20, seed=1,
+        ).run()
+        self.assertEqual(pool_result.pairings, result.pairings)
+
+        # no pairing is decided before `min_games`
+        result = Tournament(
+            self.DECKS[:2], (_EagerAgent, LazyAgent), games_per_pairing=40, batch_size=2,
+            min_games=12, workers=1, seed=1,
+        ).run()
+        self.assertEqual(result.pairings[0].games, 12)
+
+    def test_swiss(self):
+        result = Tournament(
+            self.DECKS, tournament_format=TournamentFormat.SWISS, swiss_rounds=2,
+            games_per_pairing=2, workers=1, seed=2,
+        ).run()
+        self.assertEqual(len(result.byes), 2)
+        self.assertEqual(len(set(result.byes)), 2)
+        self.assertEqual([p.round for p in result.pairings], [0, 1])
+        # decks don't meet again while there are other opponents
+        self.assertNotEqual(
+            (result.pairings[0].a, result.pairings[0].b),
+            (result.pairings[1].a, result.pairings[1].b),
+        )
+        self.assertEqual(sum(s.points for s in result.standings()), 4)
+
+    def test_checkpoint(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "tournament.jsonl")
+            kwargs: dict[str, Any] = dict(
+                games_per_pairing=4, batch_size=2, stop_confidence=None, workers=1,
+            )
+            result = Tournament(self.DECKS, checkpoint=path, seed=3, **kwargs).run()
+            with open(path, "rt") as fin:
+                lines = fin.readlines()
+            self.assertEqual(len(lines), 1 + 3 * 4)
+
+            # interrupted in the middle of writing a line
+            with open(path, "wt") as fout:
+                fout.writelines(lines[:6])
+                fout.write(lines[6][:5])
+            # the seed is restored from the checkpoint
+            resumed = Tournament(self.DECKS, checkpoint=path, **kwargs).run()
+            self.assertEqual(result.pairings, resumed.pairings)
+
+            self.assertRaises(
+                ValueError,
+                Tournament(self.DECKS[::-1], checkpoint=path, seed=3, **kwargs).run,
+            )
+            self.assertRaises(
+                ValueError,
+                Tournament(self.DECKS, checkpoint=path, seed=4, **kwargs).run,
+            )
+
+            # a later batch of a pairing logged before an earlier one, as can
+            # happen in a pool
+            self.assertEqual(
+                [json.loads(line)[1:4] for line in lines[7:9]], [[0, 1, 2], [0, 1, 3]],
+            )
+            with open(path, "wt") as fout:
+                fout.writelines(lines[:1] + lines[7:9])
+            resumed = Tournament(self.DECKS, checkpoint=path, seed=3, **kwargs).run()
+            self.assertEqual(result.pairings, resumed.pairings)
+            with open(path, "rt") as fin:
+                indices = [json.loads(line)[1:4] for line in fin.readlines()[1:]]
+            self.assertEqual(len(indices), 3 * 4)
+            self.assertEqual(len(set(map(tuple, indices))), 3 * 4)